@@ -1,18 +1,73 @@
-from fastapi import FastAPI, Request
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, File, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import numpy as np
+import os
+import time
 from starlette.responses import HTMLResponse
 from uvicorn import run as app_run
 from typing import Optional
 
 from us_visa.constants import APP_HOST, APP_PORT
-from us_visa.pipline.prediction_pipeline import USvisaData, USvisaClassifier
-from us_visa.pipline.training_pipeline import TrainPipeline
+from us_visa.entity.estimator import TargetValueMapping
+from us_visa.logger import logging, hot_path_logger, LazyFrameSummary
+from us_visa.pipline.prediction_pipeline import USvisaData
+from us_visa.entity.config_entity import ModelServingConfig, ServingLauncherConfig
+from us_visa.serving.csv_scoring import stream_csv_predictions
+from us_visa.serving.inference_executor import InferenceTimeoutError
+from us_visa.serving.launcher import ServingLauncher
+from us_visa.serving.model_holder import ModelNotReadyError, model_holder
+from us_visa.serving.prediction_service import PredictionService
+from us_visa.serving.schemas import BatchPrediction, BatchPredictionRequest, BatchPredictionResponse
+from us_visa.serving.training_jobs import TrainingJobManager, TrainingJobNotFoundError
+from us_visa.utils.metrics import metrics
+
+
+model_serving_config = ModelServingConfig()
+prediction_service = PredictionService(model_holder=model_holder, model_serving_config=model_serving_config)
+training_job_manager = TrainingJobManager()
+
+
+async def load_and_warm_up():
+    # Load the model once per process, unless the pre-fork launcher already loaded it in the parent;
+    # a missing artifact leaves /ready failing instead of crashing
+    if not model_holder.is_ready:
+        try:
+            await asyncio.to_thread(model_holder.load)
+        except Exception as e:
+            logging.error(f"Model load failed: {e}")
+
+    await prediction_service.start()
+    if model_holder.is_ready:
+        try:
+            await prediction_service.warm_up()
+        except Exception as e:
+            logging.error(f"Model warm up failed: {e}")
+        # the shadow model loads after readiness so it never delays taking traffic
+        await prediction_service.shadow_scorer.start()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup runs in the background so /ready can answer 503 while the model loads and warms up
+    startup = asyncio.create_task(load_and_warm_up())
+    yield
+    startup.cancel()
+    try:
+        await startup
+    except asyncio.CancelledError:
+        pass
+    await prediction_service.stop()
+    training_job_manager.shutdown()
+    model_holder.unload()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Serve static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -27,6 +82,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency and in-flight middleware
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    metrics.inc_gauge("http_requests_in_flight")
+    start = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        metrics.inc_gauge("http_requests_in_flight", -1)
+        # label by route template, /train/{job_id} not every job id, and fold unknown paths and
+        # methods into one label so clients cannot grow the label set
+        route = request.scope.get("route")
+        methods = getattr(route, "methods", None) or ()
+        label = f"{request.method} {route.path}" if request.method in methods else "unmatched"
+        metrics.observe(label, time.perf_counter() - start, name="http_request_latency_seconds")
+
 # Form data class
 class DataForm:
     def __init__(self, request: Request):
@@ -60,22 +131,69 @@ class DataForm:
 async def index(request: Request):
     return templates.TemplateResponse("usvisa.html", {"request": request, "context": "Rendering"})
 
-# Train route
-@app.get("/train")
+# Readiness route
+@app.get("/ready")
+async def readyRouteClient():
+    status = model_holder.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+# Serving stats route
+@app.get("/stats")
+async def statsRouteClient():
+    return prediction_service.stats()
+
+# Prometheus metrics route
+@app.get("/metrics")
+async def metricsRouteClient():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Train route: queues a run in a separate training process and returns at once
+@app.api_route("/train", methods=["GET", "POST"])
 async def trainRouteClient():
     try:
-        train_pipeline = TrainPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training successful !!")
+        job_id = training_job_manager.submit()
+        return JSONResponse({"job_id": job_id, "status_url": f"/train/{job_id}"}, status_code=202)
     except Exception as e:
-        return Response(f"Error Occurred! {e}")
+        return JSONResponse({"status": False, "error": f"Error Occurred! {e}"}, status_code=500)
+
+# Training job status route
+@app.get("/train/{job_id}")
+async def trainStatusRouteClient(job_id: str):
+    try:
+        return training_job_manager.status(job_id)
+    except TrainingJobNotFoundError as e:
+        return JSONResponse({"status": False, "error": str(e)}, status_code=404)
+
+# Training job logs route
+@app.get("/train/{job_id}/logs")
+async def trainLogsRouteClient(job_id: str, tail: Optional[int] = None):
+    try:
+        return PlainTextResponse(training_job_manager.read_logs(job_id, tail=tail))
+    except TrainingJobNotFoundError as e:
+        return JSONResponse({"status": False, "error": str(e)}, status_code=404)
+
+# Training job artifact route
+@app.get("/train/{job_id}/artifact")
+async def trainArtifactRouteClient(job_id: str):
+    try:
+        artifact_path = training_job_manager.artifact_path(job_id)
+    except TrainingJobNotFoundError as e:
+        return JSONResponse({"status": False, "error": str(e)}, status_code=404)
+    if artifact_path is None or not os.path.exists(artifact_path):
+        status = training_job_manager.status(job_id)
+        error = ("Model evaluation rejected the trained model" if status.get("model_accepted") is False
+                 else "Training job has not produced an accepted model yet")
+        return JSONResponse({"status": False, "error": error, "model_accepted": status.get("model_accepted")},
+                            status_code=409)
+    return FileResponse(artifact_path, filename=os.path.basename(artifact_path))
 
 # Predict route
 @app.post("/")
 async def predictRouteClient(request: Request):
     try:
         form = DataForm(request)
-        await form.get_usvisa_data()
+        with metrics.timer("form_parse"):
+            await form.get_usvisa_data()
 
         usvisa_data = USvisaData(
             continent=form.continent,
@@ -90,12 +208,12 @@ async def predictRouteClient(request: Request):
             full_time_position=form.full_time_position,
         )
 
-        usvisa_df = usvisa_data.get_usvisa_input_data_frame()
-        print("Input DataFrame:\n", usvisa_df)
+        with metrics.timer("dataframe_build"):
+            usvisa_batch = usvisa_data.get_usvisa_input_batch()
+        hot_path_logger.debug("Input batch: %s", LazyFrameSummary(usvisa_batch))
 
-        model_predictor = USvisaClassifier()
-        prediction = model_predictor.predict(dataframe=usvisa_df)
-        print("Model Raw Prediction:", prediction)
+        prediction, _ = await prediction_service.predict_one(usvisa_batch)
+        hot_path_logger.debug("Model Raw Prediction: %s", prediction)
 
         # 🔁 UPDATED: Handle raw string or numeric predictions
         prediction_value = prediction[0] if isinstance(prediction, (np.ndarray, list)) else prediction
@@ -109,20 +227,80 @@ async def predictRouteClient(request: Request):
         else:
             raise ValueError(f"Unexpected prediction value: {prediction_value}")
 
-        print("Visa Prediction Result:", result)
+        hot_path_logger.info("Visa Prediction Result: %s", result)
 
         return templates.TemplateResponse(
             "usvisa.html",
             {"request": request, "context": result},
         )
 
+    except ModelNotReadyError as e:
+        return JSONResponse({"status": False, "error": f"Model not ready: {e}"}, status_code=503)
+
+    except InferenceTimeoutError as e:
+        return JSONResponse({"status": False, "error": str(e)}, status_code=504)
+
     except Exception as e:
-        print(f"Prediction Error: {e}")
+        logging.error(f"Prediction Error: {e}")
         return {"status": False, "error": str(e)}
 
+# Batch predict route
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def batchPredictRouteClient(batch: BatchPredictionRequest):
+    try:
+        if len(batch.records) > model_serving_config.max_batch_size:
+            return JSONResponse({"status": False,
+                                 "error": f"Batch size {len(batch.records)} exceeds {model_serving_config.max_batch_size}"},
+                                status_code=413)
+
+        start = time.perf_counter()
+        with metrics.timer("dataframe_build"):
+            usvisa_batch = batch.to_batch()
+        labels, probabilities = await prediction_service.predict_many(usvisa_batch)
+        elapsed = time.perf_counter() - start
+        hot_path_logger.info("Scored %d rows in %.4fs (%.0f rows/sec)",
+                             len(usvisa_batch), elapsed, len(usvisa_batch) / max(elapsed, 1e-9))
+
+        label_names = TargetValueMapping().reverse_mapping()
+        predictions = [
+            BatchPrediction(prediction=int(label), label=label_names.get(int(label), str(label)),
+                            probability=float(probability))
+            for label, probability in zip(labels, probabilities)
+        ]
+        return BatchPredictionResponse(model_version=model_holder.model_version,
+                                       count=len(predictions), predictions=predictions)
+
+    except ModelNotReadyError as e:
+        return JSONResponse({"status": False, "error": f"Model not ready: {e}"}, status_code=503)
+
+    except InferenceTimeoutError as e:
+        return JSONResponse({"status": False, "error": str(e)}, status_code=504)
+
+    except Exception as e:
+        logging.error(f"Batch Prediction Error: {e}")
+        return JSONResponse({"status": False, "error": str(e)}, status_code=500)
+
+# CSV bulk predict route
+@app.post("/predict/csv")
+async def csvPredictRouteClient(file: UploadFile = File(...)):
+    if not model_holder.is_ready:
+        return JSONResponse({"status": False, "error": f"Model not ready: {model_holder.load_error}"},
+                            status_code=503)
+
+    # chunks skip the prediction cache; bulk files are scored straight on the executor
+    stream = stream_csv_predictions(file.file, chunk_size=model_serving_config.csv_chunk_size,
+                                    predict_fn=prediction_service.inference_executor.predict_batch)
+    return StreamingResponse(stream, media_type="text/csv",
+                             headers={"Content-Disposition": "attachment; filename=predictions.csv"})
+
 # Run app
 if __name__ == "__main__":
-    app_run(app, host=APP_HOST, port=APP_PORT)
+    serving_launcher_config = ServingLauncherConfig()
+    if serving_launcher_config.workers > 1:
+        # USVISA_WORKERS=N: one pre-forked process per core sharing the model loaded here
+        ServingLauncher(app, model_holder, serving_launcher_config).run()
+    else:
+        app_run(app, host=APP_HOST, port=APP_PORT)
 
 
 # from fastapi import FastAPI,Request,Form
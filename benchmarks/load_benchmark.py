@@ -0,0 +1,387 @@
+"""
+HTTP load benchmark for the serving app.
+
+Replays recorded applicant payloads (a JSONL file of records or a CSV such as
+notebook/Visadataset.csv) or synthetic ones against the form route (POST /) and the batch route
+(POST /predict/batch), either closed loop at fixed concurrency levels or open loop at fixed
+request rates. Every run reports throughput, error rate and latency percentiles as JSON, so two
+builds can be compared with --compare.
+
+With --start-app a local uvicorn process is started on a free port and the first run after it
+reports ready is labelled "cold" (right after model load and warm-up), every later run "warm".
+
+    python benchmarks/load_benchmark.py --start-app --routes form,batch --concurrency 1,8,32 --output before.json
+    python benchmarks/load_benchmark.py --url http://127.0.0.1:8080 --rps 50,200 --compare before.json
+
+Open loop latencies are measured from each request's scheduled start, so a stalled server shows
+up as latency instead of being hidden by a slower send rate. Only the standard library is used.
+"""
+import argparse
+import csv
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATASET_PATH = os.path.join(PROJECT_ROOT, "notebook", "Visadataset.csv")
+# same derivation as the training pipeline, company_age = CURRENT_YEAR - yr_of_estab
+CURRENT_YEAR = date.today().year
+
+INPUT_COLUMNS = ("continent", "education_of_employee", "has_job_experience", "requires_job_training",
+                 "no_of_employees", "company_age", "region_of_employment", "prevailing_wage", "unit_of_wage",
+                 "full_time_position")
+SYNTHETIC_CATEGORIES = {
+    "continent": ("Asia", "Europe", "North America", "South America", "Africa", "Oceania"),
+    "education_of_employee": ("High School", "Bachelor's", "Master's", "Doctorate"),
+    "has_job_experience": ("Y", "N"),
+    "requires_job_training": ("Y", "N"),
+    "region_of_employment": ("Northeast", "South", "West", "Midwest", "Island"),
+    "unit_of_wage": ("Year", "Hour", "Month", "Week"),
+    "full_time_position": ("Y", "N"),
+}
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def load_recorded_payloads(path: str, limit: Optional[int] = None) -> List[dict]:
+    """
+    :param path: JSONL with one applicant record per line, or a CSV with the dataset columns
+    """
+    records = []
+    with open(path, newline="") as payload_file:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(payload_file):
+                if "company_age" not in row and row.get("yr_of_estab"):
+                    row["company_age"] = str(CURRENT_YEAR - int(row["yr_of_estab"]))
+                records.append({column: row[column] for column in INPUT_COLUMNS})
+                if limit and len(records) >= limit:
+                    break
+        else:
+            for line in payload_file:
+                if line.strip():
+                    record = json.loads(line)
+                    records.append({column: str(record[column]) for column in INPUT_COLUMNS})
+                    if limit and len(records) >= limit:
+                        break
+    if not records:
+        raise ValueError(f"No payloads found in {path}")
+    return records
+
+
+def synthetic_payloads(count: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        record = {column: rng.choice(values) for column, values in SYNTHETIC_CATEGORIES.items()}
+        record["no_of_employees"] = str(int(rng.lognormvariate(7.5, 1.5)))
+        record["company_age"] = str(rng.randint(1, 150))
+        record["prevailing_wage"] = f"{rng.lognormvariate(11.0, 0.8):.2f}"
+        records.append(record)
+    return records
+
+
+class RequestFactory:
+    """
+    Builds request bodies for one route, cycling through the payloads. With bust_cache every
+    request gets a unique prevailing_wage so the prediction cache never answers it
+    """
+
+    def __init__(self, route: str, payloads: List[dict], batch_size: int, bust_cache: bool):
+        self.route = route
+        self.payloads = payloads
+        self.batch_size = batch_size
+        self.bust_cache = bust_cache
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _take(self, count: int) -> List[dict]:
+        with self._lock:
+            start = self._next
+            self._next += count
+        records = [dict(self.payloads[(start + i) % len(self.payloads)]) for i in range(count)]
+        if self.bust_cache:
+            for i, record in enumerate(records):
+                record["prevailing_wage"] = f"{float(record['prevailing_wage']) + (start + i) * 1e-4:.4f}"
+        return records
+
+    def build(self):
+        """
+        :return: (path, body bytes, headers)
+        """
+        if self.route == "form":
+            body = urllib.parse.urlencode(self._take(1)[0]).encode()
+            return "/", body, {"Content-Type": "application/x-www-form-urlencoded"}
+        body = json.dumps({"records": self._take(self.batch_size)}).encode()
+        return "/predict/batch", body, {"Content-Type": "application/json"}
+
+
+class Client:
+    """
+    One keep-alive connection per thread
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host, self.port, self.timeout = host, port, timeout
+        self._local = threading.local()
+
+    def request(self, path: str, body: bytes, headers: Dict[str, str]):
+        """
+        :return: (status code, True when the app answered with an error payload)
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port,
+                                                                              timeout=self.timeout)
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except Exception:
+            connection.close()
+            self._local.connection = None
+            raise
+        # the form route reports failures as 200 {"status": false, ...}
+        app_error = payload[:64].replace(b" ", b"").startswith(b'{"status":false')
+        return response.status, app_error
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # nearest rank
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], status_codes: Dict[str, int], errors: int, elapsed: float,
+              rows_per_request: int) -> dict:
+    latencies = sorted(latencies)
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": errors / requests if requests else None,
+        "throughput_rps": requests / elapsed if elapsed else None,
+        "throughput_rows_per_second": requests * rows_per_request / elapsed if elapsed else None,
+        "elapsed_seconds": elapsed,
+        "status_codes": status_codes,
+        "latency_ms": {
+            **{f"p{q:g}": None if not latencies else percentile(latencies, q) * 1000 for q in PERCENTILES},
+            "mean": None if not latencies else sum(latencies) / requests * 1000,
+            "max": None if not latencies else latencies[-1] * 1000,
+        },
+    }
+
+
+def run_level(client: Client, factory: RequestFactory, duration: float, concurrency: Optional[int] = None,
+              rps: Optional[float] = None, max_in_flight: int = 256) -> dict:
+    """
+    Closed loop with `concurrency` workers sending back to back, or open loop at `rps`
+    """
+    latencies: List[float] = []
+    status_codes: Dict[str, int] = {}
+    errors = [0]
+    lock = threading.Lock()
+
+    def send(scheduled: float) -> None:
+        path, body, headers = factory.build()
+        status, app_error = 0, True
+        try:
+            status, app_error = client.request(path, body, headers)
+        except Exception:
+            pass
+        latency = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(latency)
+            status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+            if status >= 400 or status == 0 or app_error:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    deadline = start + duration
+    if rps is None:
+        def worker() -> None:
+            while time.perf_counter() < deadline:
+                send(time.perf_counter())
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            sent = 0
+            while True:
+                scheduled = start + sent / rps
+                if scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(send, scheduled)
+                sent += 1
+    elapsed = time.perf_counter() - start
+    rows = factory.batch_size if factory.route == "batch" else 1
+    return summarize(latencies, status_codes, errors[0], elapsed, rows)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(host: str, port: int, timeout: float) -> float:
+    """
+    :return: Seconds until GET /ready answered 200
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=2)
+            connection.request("GET", "/ready")
+            if connection.getresponse().status == 200:
+                return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"App on {host}:{port} was not ready after {timeout}s")
+
+
+def start_app(port: int) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+                             "--port", str(port), "--log-level", "warning"], cwd=PROJECT_ROOT)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_key(run: dict) -> str:
+    level = f"c{run['concurrency']}" if run["concurrency"] is not None else f"rps{run['rps']:g}"
+    return f"{run['phase']}/{run['route']}/{level}"
+
+
+def compare(result: dict, baseline: dict) -> List[dict]:
+    """
+    Relative change of throughput, p99 and error rate per run present in both results
+    """
+    baseline_runs = {run_key(run): run for run in baseline["runs"]}
+    changes = []
+    for run in result["runs"]:
+        before = baseline_runs.get(run_key(run))
+        if before is None:
+            continue
+
+        def change(new, old):
+            return None if new is None or not old else (new - old) / old
+
+        changes.append({
+            "run": run_key(run),
+            "throughput_change": change(run["throughput_rps"], before["throughput_rps"]),
+            "p99_change": change(run["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+            "error_rate": [before["error_rate"], run["error_rate"]],
+        })
+    return changes
+
+
+def parse_levels(value: Optional[str], cast) -> List:
+    return [cast(item) for item in value.split(",") if item.strip()] if value else []
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Drive the serving app with HTTP load and report JSON results")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running app, e.g. http://127.0.0.1:8080")
+    target.add_argument("--start-app", action="store_true", help="Start app:app locally with uvicorn")
+    parser.add_argument("--routes", default="form,batch", help="Comma separated: form, batch")
+    parser.add_argument("--concurrency", help="Comma separated closed loop concurrency levels, e.g. 1,8,32")
+    parser.add_argument("--rps", help="Comma separated open loop request rates, e.g. 50,200")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--cold-duration", type=float, default=3.0,
+                        help="Seconds of the cold run after startup, with --start-app")
+    parser.add_argument("--batch-size", type=int, default=32, help="Records per batch route request")
+    parser.add_argument("--payloads", help=f"JSONL or CSV of recorded payloads, defaults to synthetic ones "
+                                           f"(use {os.path.relpath(DEFAULT_DATASET_PATH, PROJECT_ROOT)} to replay the dataset)")
+    parser.add_argument("--payload-limit", type=int, default=10000, help="Most payloads to load or generate")
+    parser.add_argument("--bust-cache", action="store_true", help="Make every request miss the prediction cache")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Open loop request threads")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per request timeout in seconds")
+    parser.add_argument("--output", help="Also write the JSON result to this file")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    concurrency_levels = parse_levels(args.concurrency, int)
+    rps_levels = parse_levels(args.rps, float)
+    if not concurrency_levels and not rps_levels:
+        concurrency_levels = [1, 8, 32]
+    levels = [(c, None) for c in concurrency_levels] + [(None, r) for r in rps_levels]
+    routes = parse_levels(args.routes, str)
+    for route in routes:
+        if route not in ("form", "batch"):
+            parser.error(f"Unknown route {route}")
+
+    payloads = (load_recorded_payloads(args.payloads, args.payload_limit) if args.payloads
+                else synthetic_payloads(args.payload_limit))
+
+    process = None
+    result = {"revision": git_revision(), "payloads": args.payloads or "synthetic", "bust_cache": args.bust_cache,
+              "batch_size": args.batch_size, "time_to_ready_seconds": None, "runs": []}
+    try:
+        if args.start_app:
+            host, port = "127.0.0.1", free_port()
+            process = start_app(port)
+            result["time_to_ready_seconds"] = wait_ready(host, port, timeout=120.0)
+        else:
+            parsed = urllib.parse.urlparse(args.url)
+            host, port = parsed.hostname, parsed.port or 80
+            wait_ready(host, port, timeout=10.0)
+        client = Client(host, port, args.timeout)
+
+        plan = []
+        if args.start_app:
+            concurrency, rps = levels[0]
+            plan.append(("cold", routes[0], concurrency, rps, args.cold_duration))
+        plan += [("warm", route, concurrency, rps, args.duration) for route in routes for concurrency, rps in levels]
+
+        for phase, route, concurrency, rps, duration in plan:
+            factory = RequestFactory(route, payloads, args.batch_size, args.bust_cache)
+            run = {"phase": phase, "route": route, "concurrency": concurrency, "rps": rps,
+                   **run_level(client, factory, duration, concurrency, rps, args.max_in_flight)}
+            result["runs"].append(run)
+            print(f"{run_key(run)}: {run['throughput_rps']:.1f} req/s, p99 {run['latency_ms']['p99'] or 0:.1f}ms, "
+                  f"errors {run['error_rate'] or 0:.2%}", file=sys.stderr)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            result["comparison"] = compare(result, json.load(baseline_file))
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+In-process microbenchmarks of the prediction path.
+
+Trains a fixture model from notebook/Visadataset.csv the way the training pipeline does
+(schema.yaml columns, the ColumnTransformer of DataTransformation, an estimator from model.yaml,
+without resampling) and times every stage of USvisaModel.predict in isolation at several batch
+sizes:
+
+    input_frame          USvisaData(...).get_usvisa_input_data_frame() once per row
+    input_batch          USvisaBatch.from_records over the same USvisaData rows
+    fillna               the learned MissingValueImputer on a frame with 2% missing cells
+    preprocess_sklearn   preprocessing_object.transform
+    preprocess_fast      fast_preprocessing_object.transform
+    preprocess_batch     fast_preprocessing_object.transform_batch
+    estimator_predict    trained_model_object.predict on the transformed matrix
+    model_predict        USvisaModel.predict on a DataFrame
+    model_predict_batch  USvisaModel.predict on a USvisaBatch
+    bundle_predict       USvisaModel.predict on a DataFrame, the model loaded from a model bundle;
+                         serving prefers the bundle, so it must not be slower than model_predict
+
+Results are written as a baseline file and later runs compare against it, exiting non zero when a
+stage got slower than the tolerance:
+
+    python benchmarks/microbenchmarks.py --save-baseline benchmarks/microbenchmark_baseline.json
+    python benchmarks/microbenchmarks.py --compare benchmarks/microbenchmark_baseline.json --tolerance 0.25
+
+Timings are machine specific; the baseline records the environment and a comparison across
+different machines is flagged in the output.
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+# schema.yaml and model.yaml are resolved relative to the project root, as in the pipeline
+os.chdir(PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, PowerTransformer, StandardScaler
+
+from us_visa.constants import MODEL_TRAINER_MODEL_CONFIG_FILE_PATH, SCHEMA_FILE_PATH, TARGET_COLUMN
+from us_visa.entity.estimator import TargetValueMapping, USvisaModel
+from us_visa.entity.fast_preprocessor import FastPreprocessor
+from us_visa.entity.imputer import MissingValueImputer
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.pipline.prediction_pipeline import USvisaData
+from us_visa.utils.main_utils import add_company_age, drop_columns, read_yaml_file
+from us_visa.utils.model_bundle import load_model_bundle, save_model_bundle
+
+DATASET_PATH = os.path.join(PROJECT_ROOT, "notebook", "Visadataset.csv")
+DEFAULT_BATCH_SIZES = (1, 32, 1000, 100000)
+STAGES = ("input_frame", "input_batch", "fillna", "preprocess_sklearn", "preprocess_fast", "preprocess_batch",
+          "estimator_predict", "model_predict", "model_predict_batch", "bundle_predict")
+# a single call slower than this is measured once instead of being repeated
+LONG_CALL_SECONDS = 2.0
+
+
+def build_fixture(estimator_key: str, seed: int = 42):
+    """
+    :return: (fitted USvisaModel, raw input frame of the dataset)
+    """
+    schema = read_yaml_file(SCHEMA_FILE_PATH)
+    dataset = pd.read_csv(DATASET_PATH)
+    target = dataset[TARGET_COLUMN].replace(TargetValueMapping()._asdict()).astype(int)
+    features = drop_columns(add_company_age(dataset.drop(columns=[TARGET_COLUMN])), schema["drop_columns"])
+
+    preprocessor = ColumnTransformer([
+        ("OneHotEncoder", OneHotEncoder(), schema["oh_columns"]),
+        ("Ordinal_Encoder", OrdinalEncoder(), schema["or_columns"]),
+        ("Transformer", Pipeline(steps=[("transformer", PowerTransformer(method="yeo-johnson"))]),
+         schema["transform_columns"]),
+        ("StandardScaler", StandardScaler(), schema["num_features"]),
+    ])
+    transformed = preprocessor.fit_transform(features)
+
+    model_config = read_yaml_file(MODEL_TRAINER_MODEL_CONFIG_FILE_PATH)["model_selection"][estimator_key]
+    estimator_class = getattr(importlib.import_module(model_config["module"]), model_config["class"])
+    estimator = estimator_class(**model_config.get("params", {}))
+    if "random_state" in estimator.get_params():
+        estimator.set_params(random_state=seed)
+    estimator.fit(transformed, target)
+
+    imputer = MissingValueImputer().fit(features, schema["oh_columns"] + schema["or_columns"],
+                                        schema["num_features"])
+    model = USvisaModel(preprocessing_object=preprocessor, trained_model_object=estimator,
+                        fast_preprocessing_object=FastPreprocessor.from_column_transformer(preprocessor),
+                        imputer_object=imputer)
+    return model, features
+
+
+def make_inputs(model: USvisaModel, features: pd.DataFrame, n_rows: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    frame = features.iloc[rng.integers(0, len(features), size=n_rows)].reset_index(drop=True)
+    # the form posts strings, numbers included
+    records = [USvisaData(**{column: str(value) for column, value in row.items()})
+               for row in frame.to_dict("records")]
+    with_missing = frame.copy()
+    for column in with_missing.columns:
+        with_missing.loc[rng.random(n_rows) < 0.02, column] = np.nan
+    return {
+        "frame": frame,
+        "records": records,
+        "batch": USvisaBatch.from_records(records),
+        "with_missing": with_missing,
+        "transformed": model.preprocessing_object.transform(frame),
+    }
+
+
+def stage_functions(model: USvisaModel, bundled_model: USvisaModel,
+                    inputs: dict) -> Dict[str, Callable[[], object]]:
+    frame, records, batch = inputs["frame"], inputs["records"], inputs["batch"]
+    return {
+        "input_frame": lambda: [record.get_usvisa_input_data_frame() for record in records],
+        "input_batch": lambda: USvisaBatch.from_records(records),
+        "fillna": lambda: model.imputer_object.transform(inputs["with_missing"]),
+        "preprocess_sklearn": lambda: model.preprocessing_object.transform(frame),
+        "preprocess_fast": lambda: model.fast_preprocessing_object.transform(frame),
+        "preprocess_batch": lambda: model.fast_preprocessing_object.transform_batch(batch),
+        "estimator_predict": lambda: model.trained_model_object.predict(inputs["transformed"]),
+        "model_predict": lambda: model.predict(frame),
+        "model_predict_batch": lambda: model.predict(batch),
+        "bundle_predict": lambda: bundled_model.predict(frame),
+    }
+
+
+def measure(fn: Callable[[], object], min_time: float, min_repeats: int, max_repeats: int) -> dict:
+    """
+    Times fn with the garbage collector off, like timeit; the first call warms caches and is
+    discarded unless it alone is slower than LONG_CALL_SECONDS
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        fn()
+        first = time.perf_counter() - start
+        times = [first] if first > LONG_CALL_SECONDS else []
+        while not times or (len(times) < max_repeats and (len(times) < min_repeats or sum(times) < min_time)):
+            if times and times[-1] > LONG_CALL_SECONDS:
+                break
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"median_seconds": statistics.median(times), "min_seconds": min(times), "repeats": len(times)}
+
+
+def environment() -> dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {"revision": revision, "python": platform.python_version(), "machine": platform.machine(),
+            "processor": platform.processor(), "cpu_count": os.cpu_count(), "numpy": np.__version__,
+            "pandas": pd.__version__, "sklearn": sklearn.__version__}
+
+
+def run(batch_sizes: List[int], stages: List[str], estimator_key: str, min_time: float, min_repeats: int,
+        max_repeats: int) -> dict:
+    build_start = time.perf_counter()
+    model, features = build_fixture(estimator_key)
+    print(f"Trained fixture {type(model.trained_model_object).__name__} in "
+          f"{time.perf_counter() - build_start:.1f}s", file=sys.stderr)
+
+    results = []
+    with tempfile.TemporaryDirectory() as bundle_dir:
+        bundle_path = os.path.join(bundle_dir, "model.bundle")
+        save_model_bundle(bundle_path, model)
+        bundled_model = load_model_bundle(bundle_path)
+        for n_rows in batch_sizes:
+            functions = stage_functions(model, bundled_model, make_inputs(model, features, n_rows))
+            for stage in stages:
+                result = {"stage": stage, "batch_size": n_rows,
+                          **measure(functions[stage], min_time, min_repeats, max_repeats)}
+                result["rows_per_second"] = n_rows / result["median_seconds"]
+                result["per_row_us"] = result["median_seconds"] / n_rows * 1e6
+                results.append(result)
+                print(f"{stage:>20} n={n_rows:<7} median {result['median_seconds'] * 1000:10.3f}ms "
+                      f"({result['per_row_us']:9.2f}us/row, {result['repeats']} repeats)", file=sys.stderr)
+    return {"environment": environment(), "estimator": estimator_key, "results": results}
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_seconds: float) -> dict:
+    """
+    Ratio current / baseline of the fastest repeat, the least noisy statistic, for every stage and
+    batch size present in both; a slowdown smaller than min_delta_seconds is never a regression
+    """
+    baseline_results = {(r["stage"], r["batch_size"]): r for r in baseline["results"]}
+    changes, regressions = [], []
+    for result in current["results"]:
+        before = baseline_results.get((result["stage"], result["batch_size"]))
+        if before is None:
+            continue
+        ratio = result["min_seconds"] / before["min_seconds"]
+        change = {"stage": result["stage"], "batch_size": result["batch_size"], "ratio": ratio,
+                  "baseline_min_seconds": before["min_seconds"], "min_seconds": result["min_seconds"]}
+        changes.append(change)
+        if ratio > 1 + tolerance and result["min_seconds"] - before["min_seconds"] > min_delta_seconds:
+            regressions.append(change)
+    keys = ("machine", "processor", "cpu_count", "python")
+    same_machine = all(current["environment"].get(k) == baseline["environment"].get(k) for k in keys)
+    return {"baseline_revision": baseline["environment"].get("revision"), "same_machine": same_machine,
+            "tolerance": tolerance, "min_delta_seconds": min_delta_seconds, "changes": changes, "regressions": regressions}
+
+
+def parse_sizes(value: str) -> List[int]:
+    sizes = []
+    for item in value.split(","):
+        item = item.strip().lower()
+        sizes.append(int(float(item[:-1]) * 1000) if item.endswith("k") else int(item))
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmark the prediction path stage by stage")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_BATCH_SIZES)),
+                        help="Comma separated batch sizes, 1k style suffixes allowed")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--estimator", default="module_1",
+                        help="model_selection entry of model.yaml to train the fixture with")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Least total seconds measured per stage")
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--max-repeats", type=int, default=200)
+    parser.add_argument("--save-baseline", help="Write the results to this baseline file")
+    parser.add_argument("--compare", help="Baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown of a stage before it counts as a regression")
+    parser.add_argument("--min-delta-us", type=float, default=50.0,
+                        help="Slowdowns smaller than this many microseconds are treated as noise")
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        parser.error(f"Unknown stages {unknown}")
+
+    result = run(parse_sizes(args.sizes), stages, args.estimator, args.min_time, args.min_repeats, args.max_repeats)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            result["comparison"] = compare(result, json.load(baseline_file), args.tolerance,
+                                          args.min_delta_us / 1e6)
+        if not result["comparison"]["same_machine"]:
+            print("WARNING: baseline was recorded on a different machine", file=sys.stderr)
+        for regression in result["comparison"]["regressions"]:
+            print(f"REGRESSION: {regression['stage']} n={regression['batch_size']} is "
+                  f"{regression['ratio']:.2f}x the baseline", file=sys.stderr)
+            exit_code = 1
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            baseline_file.write(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Startup benchmark for the serving process.
+
+Imports app.py in a fresh interpreter with -X importtime, then reports total import time,
+the slowest top level packages and peak RSS. Exits non zero when a budget is exceeded or
+when a training-only dependency is pulled in at import time.
+
+    python benchmarks/startup_benchmark.py --time-budget 3.0 --rss-budget-mb 350
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules only the training pipeline needs; serving must not import them at startup
+TRAINING_ONLY_MODULES = ("evidently", "imblearn", "neuro_mf", "boto3", "botocore", "pymongo", "mypy_boto3_s3")
+
+IMPORT_TIME_BUDGET_SECONDS = 3.0
+RSS_BUDGET_MB = 350.0
+
+_CHILD_CODE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+training = sorted({name.split('.')[0] for name in sys.modules} & set(%r))
+print(json.dumps({"wall_seconds": elapsed, "rss_mb": rss_mb, "training_modules": training}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def parse_importtime(stderr: str):
+    """
+    :return: list of (module, nesting depth, cumulative seconds), depth 0 being imported by the child code
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative_us, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules.append((name, (len(indent) - 1) // 2, cumulative_us / 1e6))
+    return modules
+
+
+def run_benchmark(python: str = sys.executable) -> dict:
+    code = _CHILD_CODE % (TRAINING_ONLY_MODULES,)
+    completed = subprocess.run([python, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing app failed:\n{completed.stderr[-4000:]}")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(completed.stderr)
+    result["import_seconds"] = sum(seconds for name, depth, seconds in modules if name == "app" and depth == 0)
+    # packages imported directly by app.py are one level below it
+    direct = [(name, seconds) for name, depth, seconds in modules if depth == 1]
+    result["slowest_imports"] = [{"module": name, "seconds": round(seconds, 4)}
+                                 for name, seconds in sorted(direct, key=lambda p: -p[1])[:10]]
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure serving import time and memory against a budget")
+    parser.add_argument("--time-budget", type=float, default=IMPORT_TIME_BUDGET_SECONDS,
+                        help="Allowed seconds to import app.py")
+    parser.add_argument("--rss-budget-mb", type=float, default=RSS_BUDGET_MB,
+                        help="Allowed peak RSS in MB after importing app.py")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark()
+    print(json.dumps(result, indent=2))
+
+    failures = []
+    if result["wall_seconds"] > args.time_budget:
+        failures.append(f"import time {result['wall_seconds']:.3f}s exceeds budget {args.time_budget}s")
+    if result["rss_mb"] > args.rss_budget_mb:
+        failures.append(f"peak RSS {result['rss_mb']:.1f}MB exceeds budget {args.rss_budget_mb}MB")
+    if result["training_modules"]:
+        failures.append(f"training-only modules imported at startup: {result['training_modules']}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Shared fixtures of the test suite. The tests need the packages of requirements-test.txt on top of
+requirements.txt (pytest, moto[s3] for the S3 tests, httpx for fastapi.testclient):
+
+    pip install -r requirements-test.txt
+"""
+import os
+
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, PowerTransformer, StandardScaler
+
+from us_visa.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from us_visa.entity.estimator import TargetValueMapping, USvisaModel
+from us_visa.utils.main_utils import add_company_age, drop_columns, read_yaml_file, save_object
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.path.join(PROJECT_ROOT, "notebook", "Visadataset.csv")
+# rows past this one were not seen by the trained_model_path model
+TRAINING_ROWS = 3000
+
+
+@pytest.fixture(scope="session")
+def trained_model_path(tmp_path_factory):
+    """
+    Small USvisaModel trained on the first rows of the dataset the way the training pipeline does,
+    pickled like ModelTrainer saves it
+    """
+    schema = read_yaml_file(os.path.join(PROJECT_ROOT, SCHEMA_FILE_PATH))
+    dataset = pd.read_csv(DATASET_PATH, nrows=TRAINING_ROWS)
+    target = dataset[TARGET_COLUMN].replace(TargetValueMapping()._asdict()).astype(int)
+    features = drop_columns(add_company_age(dataset.drop(columns=[TARGET_COLUMN])), schema["drop_columns"])
+    preprocessor = ColumnTransformer([
+        ("OneHotEncoder", OneHotEncoder(), schema["oh_columns"]),
+        ("Ordinal_Encoder", OrdinalEncoder(), schema["or_columns"]),
+        ("Transformer", Pipeline(steps=[("transformer", PowerTransformer(method="yeo-johnson"))]),
+         schema["transform_columns"]),
+        ("StandardScaler", StandardScaler(), schema["num_features"]),
+    ])
+    estimator = RandomForestClassifier(n_estimators=5, max_depth=6, random_state=0)
+    estimator.fit(preprocessor.fit_transform(features), target)
+
+    model_path = str(tmp_path_factory.mktemp("model") / "model.pkl")
+    save_object(model_path, USvisaModel(preprocessing_object=preprocessor, trained_model_object=estimator))
+    return model_path
+
+
+def read_unseen_rows(n_rows: int) -> pd.DataFrame:
+    return pd.read_csv(DATASET_PATH, skiprows=range(1, TRAINING_ROWS + 1), nrows=n_rows)
@@ -0,0 +1,78 @@
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from us_visa.cloud_storage.aws_storage import SimpleStorageService
+from us_visa.cloud_storage.key_cache import S3KeyExistenceCache
+from us_visa.configuration.aws_connection import S3Client
+from us_visa.entity.config_entity import S3TransferConfig
+
+BUCKET_NAME = "usvisa-transfer-test"
+FILES = {
+    "model.pkl": b"model" * 1000,
+    "data_ingestion/feature_store/usvisa.csv": b"case_id,continent\nEZYV01,Asia\n",
+    "data_transformation/transformed_object/preprocessing.pkl": b"preprocessor" * 100,
+    "data_transformation/transformed/train.npy": os.urandom(3 * 1024),
+}
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    for env_key in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(env_key, "testing")
+    with mock_aws():
+        # S3Client keeps its connection on the class, a fresh one must be built inside the mock
+        monkeypatch.setattr(S3Client, "s3_client", None)
+        monkeypatch.setattr(S3Client, "s3_resource", None)
+        monkeypatch.setattr(SimpleStorageService, "key_existence_cache", S3KeyExistenceCache())
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET_NAME)
+        # a small multipart threshold sends the larger files through parallel part uploads
+        yield SimpleStorageService(S3TransferConfig(multipart_threshold=2 * 1024, multipart_chunksize=1024,
+                                                    max_concurrency=2, bulk_workers=2, max_pool_connections=16))
+
+
+def write_tree(root, files: dict) -> None:
+    for relative_path, content in files.items():
+        path = root.joinpath(*relative_path.split("/"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def read_tree(root) -> dict:
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+def test_client_uses_the_configured_connection_pool(storage):
+    assert storage.s3_client.meta.config.max_pool_connections == 16
+    assert storage.s3_resource.meta.client.meta.config.max_pool_connections == 16
+    assert storage.transfer_config.multipart_threshold == 2 * 1024
+
+
+@pytest.mark.parametrize("prefix", ["artifact/07_26_2025_16_33_46", "artifact/07_26_2025_16_33_46/"])
+def test_directory_round_trip_keeps_nested_keys(storage, tmp_path, prefix):
+    write_tree(tmp_path / "upload", FILES)
+
+    upload_report = storage.upload_directory(str(tmp_path / "upload"), BUCKET_NAME, prefix)
+    keys = sorted(item["Key"] for item in storage.s3_client.list_objects_v2(Bucket=BUCKET_NAME)["Contents"])
+    download_report = storage.download_directory(BUCKET_NAME, prefix, str(tmp_path / "download"))
+
+    assert keys == sorted(f"artifact/07_26_2025_16_33_46/{relative_path}" for relative_path in FILES)
+    assert read_tree(tmp_path / "download") == FILES
+    total_bytes = sum(len(content) for content in FILES.values())
+    assert (upload_report["files"], upload_report["bytes"]) == (len(FILES), total_bytes)
+    assert (download_report["files"], download_report["bytes"]) == (len(FILES), total_bytes)
+    assert storage.key_existence_cache.get(BUCKET_NAME, keys[0]) is True
+
+
+def test_download_does_not_match_sibling_prefixes(storage, tmp_path):
+    write_tree(tmp_path / "run", {"model.pkl": b"run"})
+    write_tree(tmp_path / "run_backup", {"model.pkl": b"backup"})
+    storage.upload_directory(str(tmp_path / "run"), BUCKET_NAME, "artifact/run")
+    storage.upload_directory(str(tmp_path / "run_backup"), BUCKET_NAME, "artifact/run_backup")
+
+    report = storage.download_directory(BUCKET_NAME, "artifact/run", str(tmp_path / "download"))
+
+    assert report["files"] == 1
+    assert read_tree(tmp_path / "download") == {"model.pkl": b"run"}
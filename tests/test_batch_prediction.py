@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from conftest import DATASET_PATH, read_unseen_rows
+from us_visa.pipline.batch_prediction import main, prepare_feature_chunk
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+
+
+def test_cli_scores_chunks_on_workers_in_input_order(tmp_path, trained_model_path):
+    dataset = read_unseen_rows(237)
+    input_path, output_path = tmp_path / "input.csv", tmp_path / "predictions.csv"
+    dataset.to_csv(input_path, index=False)
+
+    main(["--input", str(input_path), "--output", str(output_path), "--model", trained_model_path,
+          "--workers", "2", "--chunk-size", "20"])
+
+    predictions = pd.read_csv(output_path)
+    classifier = USvisaClassifier(model_path=trained_model_path)
+    labels, probabilities = classifier.predict_batch(prepare_feature_chunk(dataset))
+    assert predictions["case_id"].tolist() == dataset["case_id"].tolist()
+    assert predictions["prediction"].tolist() == labels.astype(int).tolist()
+    assert predictions["probability"].to_numpy() == pytest.approx(probabilities)
+
+
+def test_cli_writes_an_output_file_for_an_empty_input(tmp_path, trained_model_path):
+    input_path, output_path = tmp_path / "input.csv", tmp_path / "predictions.csv"
+    pd.read_csv(DATASET_PATH, nrows=0).to_csv(input_path, index=False)
+
+    main(["--input", str(input_path), "--output", str(output_path), "--model", trained_model_path, "--workers", "2"])
+
+    predictions = pd.read_csv(output_path)
+    assert predictions.empty
+    assert list(predictions.columns) == ["prediction", "label", "probability"]
@@ -0,0 +1,49 @@
+import io
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import PROJECT_ROOT, read_unseen_rows
+from us_visa.pipline.batch_prediction import prepare_feature_chunk
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, trained_model_path):
+    # app.py mounts static/ and templates/ relative to the project root
+    monkeypatch.chdir(PROJECT_ROOT)
+    import app as app_module
+
+    model_holder = app_module.model_holder
+    monkeypatch.setattr(model_holder, "model_path", trained_model_path)
+    for config in (model_holder.model_serving_config, app_module.model_serving_config):
+        monkeypatch.setattr(config, "model_registry_file_path", str(tmp_path / "registry.db"))
+    monkeypatch.setattr(app_module.model_serving_config, "csv_chunk_size", 40)
+    monkeypatch.setattr(app_module.model_serving_config, "warmup_batch_sizes", (1, 8))
+
+    with TestClient(app_module.app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200:
+            assert time.monotonic() < deadline, client.get("/ready").json()
+            time.sleep(0.05)
+        yield client
+
+
+def test_csv_upload_streams_predictions_in_input_order(client, trained_model_path):
+    dataset = read_unseen_rows(150)
+
+    response = client.post("/predict/csv", files={"file": ("applicants.csv", dataset.to_csv(index=False), "text/csv")})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    # four chunks of at most 40 rows, the header written once
+    assert response.text.count("case_id,prediction,label,probability") == 1
+    predictions = pd.read_csv(io.StringIO(response.text))
+    labels, probabilities = USvisaClassifier(model_path=trained_model_path).predict_batch(
+        prepare_feature_chunk(dataset))
+    assert len(predictions) == len(dataset)
+    assert predictions["case_id"].tolist() == dataset["case_id"].tolist()
+    assert predictions["prediction"].tolist() == labels.astype(int).tolist()
+    assert predictions["probability"].to_numpy() == pytest.approx(probabilities)
@@ -0,0 +1,91 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, PowerTransformer, StandardScaler
+
+from us_visa.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from us_visa.entity.fast_preprocessor import FastPreprocessor
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.utils.main_utils import add_company_age, drop_columns, read_yaml_file
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.path.join(PROJECT_ROOT, "notebook", "Visadataset.csv")
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    """
+    ColumnTransformer of DataTransformation fitted on the first rows of the dataset, its compiled
+    FastPreprocessor and the remaining rows as unseen input
+    """
+    schema = read_yaml_file(os.path.join(PROJECT_ROOT, SCHEMA_FILE_PATH))
+    dataset = pd.read_csv(DATASET_PATH)
+    features = drop_columns(add_company_age(dataset.drop(columns=[TARGET_COLUMN])), schema["drop_columns"])
+    preprocessor = ColumnTransformer([
+        ("OneHotEncoder", OneHotEncoder(), schema["oh_columns"]),
+        ("Ordinal_Encoder", OrdinalEncoder(), schema["or_columns"]),
+        ("Transformer", Pipeline(steps=[("transformer", PowerTransformer(method="yeo-johnson"))]),
+         schema["transform_columns"]),
+        ("StandardScaler", StandardScaler(), schema["num_features"]),
+    ])
+    preprocessor.fit(features.iloc[:5000])
+    return preprocessor, FastPreprocessor.from_column_transformer(preprocessor), features.iloc[5000:7000]
+
+
+def assert_bitwise_equal(actual: np.ndarray, expected: np.ndarray) -> None:
+    assert actual.shape == expected.shape and actual.dtype == expected.dtype == np.float64
+    nan = np.isnan(expected)
+    # NaN payloads are not compared, only where they are
+    assert np.array_equal(np.isnan(actual), nan)
+    assert np.array_equal(actual[~nan].view(np.uint64), expected[~nan].view(np.uint64))
+
+
+def to_batch(frame: pd.DataFrame) -> USvisaBatch:
+    # the form and the JSON routes hand over strings, numbers included
+    return USvisaBatch.from_records([SimpleNamespace(**{column: None if pd.isna(value) else str(value)
+                                                        for column, value in row.items()})
+                                     for row in frame.to_dict("records")])
+
+
+def transform_fast(fast_preprocessor: FastPreprocessor, frame: pd.DataFrame) -> np.ndarray:
+    return fast_preprocessor.transform_fast(frame[fast_preprocessor.feature_names_in].to_numpy(dtype=object))
+
+
+def test_fast_paths_match_sklearn_bit_for_bit(fitted):
+    preprocessor, fast_preprocessor, frame = fitted
+    expected = preprocessor.transform(frame)
+
+    assert_bitwise_equal(transform_fast(fast_preprocessor, frame), expected)
+    assert_bitwise_equal(fast_preprocessor.transform_batch(to_batch(frame)), expected)
+
+
+def test_nan_numeric_matches_sklearn(fitted):
+    preprocessor, fast_preprocessor, frame = fitted
+    frame = frame.copy()
+    frame.loc[frame.index[::7], "no_of_employees"] = np.nan
+    frame.loc[frame.index[::11], "prevailing_wage"] = np.nan
+    frame.loc[frame.index[::13], "company_age"] = np.nan
+    expected = preprocessor.transform(frame)
+    assert np.isnan(expected).any()
+
+    assert_bitwise_equal(transform_fast(fast_preprocessor, frame), expected)
+    assert_bitwise_equal(fast_preprocessor.transform_batch(to_batch(frame)), expected)
+
+
+@pytest.mark.parametrize("column", ["continent", "education_of_employee"])
+def test_unknown_category_raises_like_sklearn(fitted, column):
+    preprocessor, fast_preprocessor, frame = fitted
+    frame = frame.head(5).copy()
+    frame.loc[frame.index[2], column] = "Mars"
+
+    with pytest.raises(ValueError):
+        preprocessor.transform(frame)
+    with pytest.raises(ValueError, match="Mars"):
+        transform_fast(fast_preprocessor, frame)
+    with pytest.raises(ValueError, match="Mars"):
+        fast_preprocessor.transform_batch(to_batch(frame))
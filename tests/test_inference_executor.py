@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from us_visa.serving.inference_executor import InferenceExecutor, InferenceTimeoutError
+
+
+class BlockingClassifier:
+    def __init__(self):
+        self.release = threading.Event()
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def predict_batch(self, dataframe):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if self.calls == 1:
+                self.release.wait(5)
+            return np.ones(len(dataframe), dtype=int), np.full(len(dataframe), 0.5)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def test_timed_out_batch_keeps_its_slot_until_it_finishes():
+    classifier = BlockingClassifier()
+    inference_executor = InferenceExecutor(model_holder=SimpleNamespace(classifier=classifier, model_path=None),
+                                           kind="thread", max_workers=1, timeout_seconds=0.05)
+    dataframe = pd.DataFrame({"continent": ["Asia", "Europe"]})
+
+    async def main():
+        inference_executor.start()
+        start = time.perf_counter()
+        with pytest.raises(InferenceTimeoutError):
+            await inference_executor.predict_batch(dataframe)
+        # the caller gets its timeout right away, while the batch is still running
+        assert time.perf_counter() - start < 1
+        assert inference_executor.stats()["in_flight"] == 1
+
+        # the next batch times out waiting for the slot instead of queueing behind the stuck one in the pool
+        with pytest.raises(InferenceTimeoutError):
+            await inference_executor.predict_batch(dataframe)
+        assert classifier.calls == 1
+
+        classifier.release.set()
+        while inference_executor.stats()["in_flight"]:
+            await asyncio.sleep(0.01)
+        labels, probabilities = await inference_executor.predict_batch(dataframe)
+        assert labels.tolist() == [1, 1] and probabilities.tolist() == [0.5, 0.5]
+        assert classifier.max_running == 1
+        assert inference_executor.stats()["in_flight"] == 0
+        inference_executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_call_queued_behind_a_saturated_pool_times_out():
+    classifier = BlockingClassifier()
+    inference_executor = InferenceExecutor(model_holder=SimpleNamespace(classifier=classifier, model_path=None),
+                                           kind="thread", max_workers=1, timeout_seconds=0.3)
+    dataframe = pd.DataFrame({"continent": ["Asia"]})
+
+    async def main():
+        inference_executor.start()
+        running = asyncio.ensure_future(inference_executor.predict_batch(dataframe))
+        await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        with pytest.raises(InferenceTimeoutError):
+            await inference_executor.predict_batch(dataframe)
+        # the queued call got the request timeout, not an unbounded wait for the slot
+        assert time.perf_counter() - start < 1
+        assert classifier.calls == 1
+
+        with pytest.raises(InferenceTimeoutError):
+            await running
+        assert inference_executor.stats()["timeouts"] == 2
+        classifier.release.set()
+        inference_executor.shutdown()
+
+    asyncio.run(main())
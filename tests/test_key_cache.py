@@ -0,0 +1,105 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from us_visa.cloud_storage import key_cache
+from us_visa.cloud_storage.aws_storage import SimpleStorageService
+from us_visa.cloud_storage.key_cache import S3KeyExistenceCache
+from us_visa.configuration.aws_connection import S3Client
+from us_visa.entity.config_entity import S3KeyCacheConfig
+
+BUCKET_NAME = "usvisa-key-cache-test"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(key_cache.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def storage(monkeypatch, clock):
+    for env_key in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(env_key, "testing")
+    with mock_aws():
+        monkeypatch.setattr(S3Client, "s3_client", None)
+        monkeypatch.setattr(S3Client, "s3_resource", None)
+        monkeypatch.setattr(SimpleStorageService, "key_existence_cache", S3KeyExistenceCache(
+            S3KeyCacheConfig(exists_ttl_seconds=60, missing_ttl_seconds=5, max_entries=100)))
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET_NAME)
+        storage = SimpleStorageService()
+        head_calls = []
+        head_object = storage.s3_client.head_object
+
+        def counting_head_object(**kwargs):
+            head_calls.append(kwargs["Key"])
+            return head_object(**kwargs)
+
+        monkeypatch.setattr(storage.s3_client, "head_object", counting_head_object)
+        storage.head_calls = head_calls
+        yield storage
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = S3KeyExistenceCache(S3KeyCacheConfig(exists_ttl_seconds=60, missing_ttl_seconds=5, max_entries=100))
+    cache.put(BUCKET_NAME, "model.pkl", True)
+    cache.put(BUCKET_NAME, "missing.pkl", False)
+
+    assert cache.get(BUCKET_NAME, "model.pkl") is True
+    assert cache.get(BUCKET_NAME, "missing.pkl") is False
+    clock.now += 10
+    assert cache.get(BUCKET_NAME, "model.pkl") is True
+    assert cache.get(BUCKET_NAME, "missing.pkl") is None
+    clock.now += 60
+    assert cache.get(BUCKET_NAME, "model.pkl") is None
+    assert cache.stats() == {"entries": 2, "hits": 3, "misses": 2}
+
+
+def test_oldest_entries_are_evicted_and_invalidate_forgets():
+    cache = S3KeyExistenceCache(S3KeyCacheConfig(max_entries=2))
+    for key in ("a.pkl", "b.pkl", "c.pkl"):
+        cache.put(BUCKET_NAME, key, True)
+    cache.invalidate(BUCKET_NAME, "c.pkl")
+
+    assert [cache.get(BUCKET_NAME, key) for key in ("a.pkl", "b.pkl", "c.pkl")] == [None, True, None]
+
+
+def test_existing_key_is_checked_once_with_head(storage):
+    storage.s3_client.put_object(Bucket=BUCKET_NAME, Key="model-registry/model.pkl", Body=b"model")
+
+    assert storage.key_exists(BUCKET_NAME, "model-registry/model.pkl") is True
+    assert storage.s3_key_path_available(BUCKET_NAME, "model-registry/model.pkl") is True
+    # an exact key check never matches a longer key sharing the prefix
+    assert storage.key_exists(BUCKET_NAME, "model-registry/model") is False
+    assert storage.head_calls == ["model-registry/model.pkl", "model-registry/model"]
+
+
+def test_missing_key_is_cached_until_its_ttl_expires(storage, clock):
+    assert storage.key_exists(BUCKET_NAME, "model.pkl") is False
+    storage.s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=b"model")
+    # uploaded behind the cache's back, the negative entry still answers
+    assert storage.key_exists(BUCKET_NAME, "model.pkl") is False
+    clock.now += 6
+
+    assert storage.key_exists(BUCKET_NAME, "model.pkl") is True
+    assert storage.head_calls == ["model.pkl", "model.pkl"]
+
+
+def test_upload_file_replaces_a_negative_entry(storage, tmp_path):
+    assert storage.key_exists(BUCKET_NAME, "model.pkl") is False
+    local_path = tmp_path / "model.pkl"
+    local_path.write_bytes(b"model")
+
+    storage.upload_file(str(local_path), "model.pkl", BUCKET_NAME, remove=False)
+
+    assert storage.key_exists(BUCKET_NAME, "model.pkl") is True
+    assert storage.head_calls == ["model.pkl"]
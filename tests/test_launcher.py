@@ -0,0 +1,91 @@
+import os
+import signal
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from us_visa.entity.config_entity import ServingLauncherConfig
+from us_visa.serving.launcher import ServingLauncher, read_memory_usage
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs os.fork and /proc")
+
+
+class RecordingLauncher(ServingLauncher):
+    """
+    Launcher whose forked workers run child_main instead of uvicorn, recording every spawn
+    """
+
+    def __init__(self, child_main, **config):
+        super().__init__(app=None, model_holder=None, serving_launcher_config=ServingLauncherConfig(**config))
+        self.child_main = child_main
+        self.spawns = []
+
+    def _spawn(self, slot: int) -> None:
+        self.spawns.append((slot, time.monotonic()))
+        super()._spawn(slot)
+
+    def _run_worker(self, slot: int) -> None:
+        try:
+            self.child_main()
+        finally:
+            os._exit(1)
+
+    def _bind_socket(self):
+        return SimpleNamespace(close=lambda: None)
+
+    def _preload(self) -> None:
+        pass
+
+
+@pytest.fixture
+def restore_signal_handlers():
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    yield
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+def sleep_until_killed():
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    time.sleep(60)
+
+
+def test_read_memory_usage_of_this_process():
+    usage = read_memory_usage(os.getpid())
+
+    assert usage["rss_mb"] > 0
+    assert usage["pss_mb"] > 0
+    assert usage["shared_mb"] >= 0
+
+
+def test_crash_looping_worker_restarts_with_backoff_until_the_limit(restore_signal_handlers):
+    launcher = RecordingLauncher(lambda: None, workers=1, min_worker_uptime_seconds=10.0,
+                                 max_restart_backoff_seconds=0.3, max_worker_restarts=3)
+
+    start = time.monotonic()
+    launcher.run()
+
+    # first start plus three restarts, then the slot is given up and run returns
+    assert [slot for slot, _ in launcher.spawns] == [0, 0, 0, 0]
+    gaps = [after - before for (_, before), (_, after) in zip(launcher.spawns, launcher.spawns[1:])]
+    assert all(gap >= 0.3 for gap in gaps), gaps
+    assert time.monotonic() - start < 10
+    assert launcher._workers == {} and launcher._restart_at == {}
+
+
+def test_stop_signal_leaves_no_worker_processes():
+    launcher = RecordingLauncher(sleep_until_killed, workers=2, graceful_timeout_seconds=5.0)
+    for slot in range(2):
+        launcher._spawn(slot)
+    pids = list(launcher._workers)
+
+    launcher._handle_stop(signal.SIGTERM, None)
+    launcher._stop_workers()
+
+    assert launcher._workers == {}
+    for pid in pids:
+        # reaped, so the pid no longer exists as a child
+        with pytest.raises(ChildProcessError):
+            os.waitpid(pid, os.WNOHANG)
@@ -0,0 +1,30 @@
+import logging
+
+import pandas as pd
+
+from us_visa.logger import LazyFrameSummary, SamplingFilter, frame_summary
+
+
+class CountingFrame(pd.DataFrame):
+    heads = 0
+
+    def head(self, n=5):
+        CountingFrame.heads += 1
+        return super().head(n)
+
+
+def test_summary_is_built_only_for_sampled_records():
+    logger = logging.getLogger("us_visa.tests.lazy_summary")
+    logger.propagate = False
+    logger.addFilter(SamplingFilter(10))
+    records = []
+    handler = logging.Handler()
+    handler.emit = lambda record: records.append(record.getMessage())
+    logger.addHandler(handler)
+    df = CountingFrame({"continent": ["Asia", "Europe"], "company_age": [24, 9]})
+
+    for _ in range(20):
+        logger.debug("Input DataFrame: %s", LazyFrameSummary(df))
+
+    assert CountingFrame.heads == 2
+    assert records == [f"Input DataFrame: {frame_summary(df)}"] * 2
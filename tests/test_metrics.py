@@ -0,0 +1,95 @@
+import math
+import threading
+
+import pytest
+
+from us_visa.utils.metrics import LatencySummary, MetricsRegistry, numeric_items
+
+
+def test_latency_summary_keeps_totals_and_a_bounded_window():
+    summary = LatencySummary(window=4)
+    for seconds in (10.0, 1.0, 2.0, 3.0, 4.0):
+        summary.observe(seconds)
+
+    count, total, quantiles = summary.snapshot()
+
+    assert (count, total) == (5, 20.0)
+    # the first sample fell out of the window, the totals keep it
+    assert quantiles == {0.5: 2.5, 0.95: pytest.approx(3.85), 0.99: pytest.approx(3.97)}
+    assert summary.quantiles() == quantiles
+
+
+def test_empty_summary_has_nan_quantiles():
+    count, total, quantiles = LatencySummary(window=4).snapshot()
+
+    assert (count, total) == (0, 0.0)
+    assert all(math.isnan(value) for value in quantiles.values())
+
+
+def test_render_writes_the_text_exposition_format():
+    registry = MetricsRegistry(prefix="test")
+    registry.observe("predict", 0.5)
+    registry.observe("predict", 1.5)
+    registry.summary("stage_latency_seconds", "warmup")
+    registry.set_gauge("model_ready", 1)
+    registry.inc_gauge("requests_total")
+    registry.inc_gauge("requests_total")
+    registry.register_callback("cache", lambda: {"hits": 3, "enabled": True, "version": "abc", "hit_rate": None,
+                                                 "fill_ratio": float("nan")})
+    registry.register_callback("broken", lambda: 1 / 0)
+
+    assert registry.render().splitlines() == [
+        "# TYPE test_stage_latency_seconds summary",
+        'test_stage_latency_seconds{stage="predict",quantile="0.5"} 1.0',
+        'test_stage_latency_seconds{stage="predict",quantile="0.95"} 1.45',
+        'test_stage_latency_seconds{stage="predict",quantile="0.99"} 1.49',
+        'test_stage_latency_seconds_sum{stage="predict"} 2.0',
+        'test_stage_latency_seconds_count{stage="predict"} 2',
+        'test_stage_latency_seconds{stage="warmup",quantile="0.5"} NaN',
+        'test_stage_latency_seconds{stage="warmup",quantile="0.95"} NaN',
+        'test_stage_latency_seconds{stage="warmup",quantile="0.99"} NaN',
+        'test_stage_latency_seconds_sum{stage="warmup"} 0.0',
+        'test_stage_latency_seconds_count{stage="warmup"} 0',
+        "# TYPE test_model_ready gauge",
+        "test_model_ready 1.0",
+        "# TYPE test_requests_total gauge",
+        "test_requests_total 2.0",
+        "# TYPE test_cache gauge",
+        'test_cache{key="fill_ratio"} NaN',
+        'test_cache{key="hits"} 3.0',
+    ]
+
+
+def test_render_of_an_empty_registry_is_a_blank_line():
+    assert MetricsRegistry().render() == "\n"
+
+
+def test_render_while_stages_are_added():
+    registry = MetricsRegistry(prefix="test")
+    stages = 300
+
+    def add_stages():
+        for i in range(stages):
+            registry.observe(f"stage_{i}", 0.001)
+            registry.set_gauge(f"gauge_{i}", i)
+
+    writer = threading.Thread(target=add_stages)
+    writer.start()
+    try:
+        for _ in range(200):
+            registry.render()
+    finally:
+        writer.join()
+
+    lines = registry.render().splitlines()
+    assert sum(line.startswith("test_stage_latency_seconds_count{") for line in lines) == stages
+    assert 'test_stage_latency_seconds_count{stage="stage_299"} 1' in lines
+    assert sum(line.startswith("test_gauge_") for line in lines) == stages
+    assert "test_gauge_299 299.0" in lines
+
+
+def test_numeric_items_keeps_numbers_only():
+    assert numeric_items(None) == {}
+    assert numeric_items({}) == {}
+    assert numeric_items({"hits": 2, "rate": 0.5, "enabled": False, "path": "model.pkl", "error": None}) == {
+        "hits": 2.0, "rate": 0.5}
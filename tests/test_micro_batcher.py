@@ -0,0 +1,71 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from us_visa.serving.inference_executor import InferenceTimeoutError
+from us_visa.serving.micro_batcher import MicroBatcher
+from us_visa.serving.prediction_service import is_row_error
+
+
+def make_row(index: int, continent: str = "Asia") -> pd.DataFrame:
+    return pd.DataFrame({"continent": [continent], "no_of_employees": [float(index)]})
+
+
+async def score(dataframe: pd.DataFrame):
+    if (dataframe["continent"] == "Mars").any():
+        raise ValueError("Found unknown categories ['Mars'] in column 0 during transform")
+    return (np.where(dataframe["no_of_employees"] % 2 == 0, "Certified", "Denied"),
+            dataframe["no_of_employees"].to_numpy() / 100.0)
+
+
+async def submit_all(micro_batcher: MicroBatcher, rows):
+    await micro_batcher.start()
+    try:
+        return await asyncio.gather(*(micro_batcher.submit(row) for row in rows), return_exceptions=True)
+    finally:
+        await micro_batcher.stop()
+
+
+def test_bad_row_fails_alone():
+    micro_batcher = MicroBatcher(predict_fn=score, window_ms=50, max_batch_size=64, split_on_error=is_row_error)
+    rows = [make_row(i) for i in range(20)]
+    rows.insert(7, make_row(99, continent="Mars"))
+
+    results = asyncio.run(submit_all(micro_batcher, rows))
+
+    assert isinstance(results[7], ValueError)
+    valid = results[:7] + results[8:]
+    expected = [i for i in range(20)]
+    assert [probability for _, probability in valid] == [i / 100.0 for i in expected]
+    assert [label for label, _ in valid] == ["Certified" if i % 2 == 0 else "Denied" for i in expected]
+    assert micro_batcher.errors == 1
+    assert micro_batcher.splits > 0
+
+
+def test_timeout_is_not_split():
+    calls = []
+
+    async def time_out(dataframe: pd.DataFrame):
+        calls.append(len(dataframe))
+        raise InferenceTimeoutError("Inference did not finish within 0.01s")
+
+    micro_batcher = MicroBatcher(predict_fn=time_out, window_ms=50, max_batch_size=64, split_on_error=is_row_error)
+    results = asyncio.run(submit_all(micro_batcher, [make_row(i) for i in range(8)]))
+
+    assert all(isinstance(result, InferenceTimeoutError) for result in results)
+    assert calls == [8]
+    assert micro_batcher.splits == 0
+
+
+@pytest.mark.parametrize("bad_positions", [[0], [0, 1], [3, 12, 19]])
+def test_every_bad_row_is_isolated(bad_positions):
+    micro_batcher = MicroBatcher(predict_fn=score, window_ms=50, max_batch_size=64)
+    rows = [make_row(i, continent="Mars" if i in bad_positions else "Asia") for i in range(20)]
+
+    results = asyncio.run(submit_all(micro_batcher, rows))
+
+    failed = [i for i, result in enumerate(results) if isinstance(result, Exception)]
+    assert failed == bad_positions
+    assert micro_batcher.errors == len(bad_positions)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree._tree import Tree
+
+from us_visa.exception import USvisaException
+from us_visa.utils.main_utils import load_object, save_object
+from us_visa.utils.model_bundle import load_model_bundle, load_model_file, save_model_bundle
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 12))
+    y = (X[:, 0] + X[:, 3] * X[:, 5] > 0).astype(int)
+    X_test = rng.normal(size=(2000, 12)).astype(np.float32)
+    X_test[::13, 3] = np.nan
+    return X, y, X_test
+
+
+def round_trip(tmp_path, model):
+    model_path = str(tmp_path / "model.pkl")
+    save_object(model_path, model)
+    manifest = save_model_bundle(str(tmp_path / "model.bundle"), load_object(model_path))
+    return load_object(model_path), load_model_bundle(str(tmp_path / "model.bundle")), manifest
+
+
+def assert_same_predictions(pickled, bundled, X):
+    assert np.array_equal(pickled.predict(X), bundled.predict(X))
+    assert np.array_equal(pickled.predict_proba(X).view(np.uint64), bundled.predict_proba(X).view(np.uint64))
+
+
+def test_forest_keeps_native_trees(tmp_path, data):
+    X, y, X_test = data
+    pickled, bundled, manifest = round_trip(tmp_path, RandomForestClassifier(n_estimators=5, max_depth=6,
+                                                                             random_state=0).fit(X, y))
+
+    # sklearn copies tree nodes on unpickle anyway, so they stay inside object.pkl and the
+    # forest predicts with the compiled tree walk
+    assert manifest["arrays"] == []
+    assert all(type(estimator.tree_) is Tree for estimator in bundled.estimators_)
+    assert_same_predictions(pickled, bundled, X_test)
+    assert_same_predictions(pickled, load_model_file(str(tmp_path / "model.bundle")), X_test)
+
+
+def test_large_arrays_are_mapped(tmp_path, data):
+    X, y, X_test = data
+    pickled, bundled, manifest = round_trip(tmp_path, KNeighborsClassifier(n_neighbors=3, algorithm="kd_tree")
+                                            .fit(X, y))
+
+    assert isinstance(bundled._fit_X, np.memmap)
+    assert_same_predictions(pickled, bundled, np.nan_to_num(X_test[:200]))
+
+
+def test_gradient_boosting_keeps_native_trees(tmp_path, data):
+    X, y, X_test = data
+    pickled, bundled, _ = round_trip(tmp_path, GradientBoostingClassifier(n_estimators=3, random_state=0).fit(X, y))
+
+    assert all(isinstance(estimator.tree_, Tree) for estimator in bundled.estimators_.flat)
+    assert_same_predictions(pickled, bundled, np.nan_to_num(X_test))
+
+
+def test_bundle_of_another_format_version_is_rejected(tmp_path, data):
+    X, y, _ = data
+    round_trip(tmp_path, RandomForestClassifier(n_estimators=2, random_state=0).fit(X, y))
+    manifest_path = tmp_path / "model.bundle" / "manifest.json"
+    manifest_path.write_text(manifest_path.read_text().replace('"format_version": 1', '"format_version": 2'))
+
+    with pytest.raises(USvisaException, match="convert the model pickle again"):
+        load_model_bundle(str(tmp_path / "model.bundle"))
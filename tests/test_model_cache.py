@@ -0,0 +1,115 @@
+import os
+
+import boto3
+import pytest
+from botocore.exceptions import EndpointConnectionError
+from moto import mock_aws
+
+from us_visa.cloud_storage.model_cache import S3ModelCache
+from us_visa.entity.config_entity import S3ModelCacheConfig
+from us_visa.exception import USvisaException
+
+BUCKET_NAME = "usvisa-model-cache-test"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    for env_key in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(env_key, "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET_NAME)
+        yield client
+
+
+def make_cache(s3_client, tmp_path, max_bytes: int = 10 ** 9) -> S3ModelCache:
+    return S3ModelCache(s3_client, S3ModelCacheConfig(cache_dir=str(tmp_path / "cache"), max_bytes=max_bytes,
+                                                      download_chunk_bytes=64))
+
+
+def cached_files(cache: S3ModelCache) -> list:
+    return sorted(os.listdir(cache.cache_dir))
+
+
+def age(path: str, seconds: float) -> None:
+    mtime = os.path.getmtime(path) - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_first_fetch_downloads_and_unchanged_object_is_a_hit(s3_client, tmp_path):
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=b"model v1" * 100)
+    cache = make_cache(s3_client, tmp_path)
+
+    first_path = cache.fetch(BUCKET_NAME, "model.pkl")
+    age(first_path, 60)
+    aged_mtime = os.path.getmtime(first_path)
+    second_path = cache.fetch(BUCKET_NAME, "model.pkl")
+
+    assert second_path == first_path
+    with open(first_path, "rb") as file_obj:
+        assert file_obj.read() == b"model v1" * 100
+    assert (cache.hits, cache.misses) == (1, 1)
+    # a hit counts as a use for LRU eviction
+    assert os.path.getmtime(first_path) > aged_mtime
+    assert len(cached_files(cache)) == 1
+
+
+def test_changed_etag_replaces_the_cached_entry(s3_client, tmp_path):
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=b"model v1")
+    cache = make_cache(s3_client, tmp_path)
+    old_path = cache.fetch(BUCKET_NAME, "model.pkl")
+
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=b"model v2")
+    new_path = cache.fetch(BUCKET_NAME, "model.pkl")
+
+    assert new_path != old_path
+    assert not os.path.exists(old_path)
+    with open(new_path, "rb") as file_obj:
+        assert file_obj.read() == b"model v2"
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cached_files(cache) == [os.path.basename(new_path)]
+
+
+def test_least_recently_used_entry_is_evicted(s3_client, tmp_path):
+    for key in ("a.pkl", "b.pkl", "c.pkl"):
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=key.encode() * 50)
+    cache = make_cache(s3_client, tmp_path, max_bytes=2 * 250)
+
+    a_path = cache.fetch(BUCKET_NAME, "a.pkl")
+    b_path = cache.fetch(BUCKET_NAME, "b.pkl")
+    age(a_path, 120)
+    age(b_path, 60)
+    # a is used again, so b becomes the least recently used entry
+    assert cache.fetch(BUCKET_NAME, "a.pkl") == a_path
+    c_path = cache.fetch(BUCKET_NAME, "c.pkl")
+
+    assert os.path.exists(a_path) and os.path.exists(c_path)
+    assert not os.path.exists(b_path)
+    assert cached_files(cache) == sorted(os.path.basename(path) for path in (a_path, c_path))
+
+
+def test_unreachable_s3_falls_back_to_cached_copy(s3_client, tmp_path, monkeypatch):
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=b"model v1")
+    cache = make_cache(s3_client, tmp_path)
+    cached_path = cache.fetch(BUCKET_NAME, "model.pkl")
+
+    def unreachable(**kwargs):
+        raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+
+    monkeypatch.setattr(s3_client, "head_object", unreachable)
+
+    assert cache.fetch(BUCKET_NAME, "model.pkl") == cached_path
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_unreachable_s3_without_cached_copy_raises(s3_client, tmp_path, monkeypatch):
+    cache = make_cache(s3_client, tmp_path)
+
+    def unreachable(**kwargs):
+        raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+
+    monkeypatch.setattr(s3_client, "get_object", unreachable)
+
+    with pytest.raises(USvisaException):
+        cache.fetch(BUCKET_NAME, "model.pkl")
+    assert cached_files(cache) == []
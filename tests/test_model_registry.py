@@ -0,0 +1,75 @@
+import os
+from contextlib import closing
+
+import pytest
+
+from us_visa.entity.config_entity import ModelRegistryConfig
+from us_visa.entity.model_registry import ModelRegistry, resolve_model_path
+from us_visa.serving.model_holder import ModelHolder
+from us_visa.utils.main_utils import get_file_digest
+
+
+def test_registered_bundle_reports_registry_version(tmp_path, monkeypatch):
+    model_registry_config = ModelRegistryConfig(registry_file_path=str(tmp_path / "registry.db"))
+    model_path = tmp_path / "model.pkl"
+    model_path.write_bytes(b"trained model")
+    bundle_path = tmp_path / "model.bundle"
+    version = ModelRegistry(model_registry_config).register_model(model_path=str(model_path),
+                                                                  bundle_path=str(bundle_path))
+
+    monkeypatch.chdir(tmp_path)
+    for path in (str(model_path), str(bundle_path), "model.bundle", os.path.join(".", "model.pkl")):
+        assert ModelHolder.get_model_version(path, model_registry_config) == version
+
+    other_path = tmp_path / "other.pkl"
+    other_path.write_bytes(b"unregistered model")
+    assert ModelHolder.get_model_version(str(other_path), model_registry_config) == get_file_digest(str(other_path))[:12]
+    assert ModelRegistry(model_registry_config).find_by_path(str(other_path)) is None
+
+
+def test_missing_registry_falls_back_to_digest(tmp_path):
+    model_registry_config = ModelRegistryConfig(registry_file_path=str(tmp_path / "missing.db"))
+    model_path = tmp_path / "model.pkl"
+    model_path.write_bytes(b"trained model")
+
+    assert ModelHolder.get_model_version(str(model_path), model_registry_config) == get_file_digest(str(model_path))[:12]
+    assert not os.path.exists(model_registry_config.registry_file_path)
+
+
+def test_trained_models_are_not_served_until_promoted(tmp_path):
+    model_registry_config = ModelRegistryConfig(registry_file_path=str(tmp_path / "registry.db"))
+    model_registry = ModelRegistry(model_registry_config)
+    for name in ("rejected.pkl", "accepted.pkl"):
+        (tmp_path / name).write_bytes(name.encode())
+    model_registry.register_model(model_path=str(tmp_path / "rejected.pkl"))
+    accepted = model_registry.register_model(model_path=str(tmp_path / "accepted.pkl"),
+                                             bundle_path=str(tmp_path / "accepted.bundle"))
+
+    # registered by ModelTrainer, but ModelEvaluation has not accepted either of them
+    with pytest.raises(FileNotFoundError, match="No promoted model"):
+        resolve_model_path(model_registry_config)
+
+    model_registry.promote(accepted)
+    assert resolve_model_path(model_registry_config) == str(tmp_path / "accepted.pkl")
+    (tmp_path / "accepted.bundle").mkdir()
+    assert resolve_model_path(model_registry_config) == str(tmp_path / "accepted.bundle")
+
+
+def test_no_registry_fails_clearly(tmp_path):
+    model_registry_config = ModelRegistryConfig(registry_file_path=str(tmp_path / "registry.db"))
+
+    with pytest.raises(FileNotFoundError, match="No promoted model"):
+        resolve_model_path(model_registry_config)
+
+
+def test_find_by_path_uses_the_path_indexes(tmp_path):
+    model_registry = ModelRegistry(ModelRegistryConfig(registry_file_path=str(tmp_path / "registry.db")))
+    model_path = tmp_path / "model.pkl"
+    model_path.write_bytes(b"trained model")
+    model_registry.register_model(model_path=str(model_path), bundle_path=str(tmp_path / "model.bundle"))
+
+    with closing(model_registry._connect()) as connection:
+        plan = " ".join(row[-1] for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM models WHERE model_path IN (?, ?) OR bundle_path IN (?, ?)",
+            ("a", "b", "a", "b")))
+    assert "models_model_path" in plan and "models_bundle_path" in plan
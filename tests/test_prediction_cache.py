@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from us_visa.constants import MODEL_INPUT_COLUMNS
+from us_visa.serving import prediction_cache as prediction_cache_module
+from us_visa.serving.prediction_cache import PredictionCache, canonical_key
+
+
+def test_numbers_are_canonical_but_categories_are_kept_as_sent():
+    assert canonical_key(("Asia", "2412", 24, " 83425.65 ")) == canonical_key(("Asia", 2412.0, "24", 83425.65))
+    assert canonical_key((" Asia", "2412")) != canonical_key(("Asia", "2412"))
+    assert canonical_key(("Asia ", None)) != canonical_key(("Asia", float("nan")))
+    assert canonical_key((None, float("nan"))) == (None, None)
+
+
+def make_cache(max_entries=100, max_bytes=10 ** 9, ttl_seconds=None) -> PredictionCache:
+    return PredictionCache(max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    cache = make_cache(max_entries=2)
+    cache.get(("a",), "v1")
+    cache.put(("a",), ("Certified", 0.9), "v1")
+    cache.put(("b",), ("Denied", 0.2), "v1")
+    assert cache.get(("a",), "v1") == ("Certified", 0.9)
+
+    cache.put(("c",), ("Denied", 0.3), "v1")
+
+    assert cache.get(("b",), "v1") is None
+    assert cache.get(("a",), "v1") == ("Certified", 0.9)
+    assert cache.get(("c",), "v1") == ("Denied", 0.3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_are_evicted_above_the_byte_budget():
+    entry_size = PredictionCache._entry_size(("a",), ("Certified", 0.9))
+    cache = make_cache(max_bytes=int(entry_size * 2.5))
+    cache.get(("a",), "v1")
+    for key in ("a", "b", "c", "d"):
+        cache.put((key,), ("Certified", 0.9), "v1")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == entry_size * 2
+    assert stats["evictions"] == 2
+    assert cache.get(("a",), "v1") is None and cache.get(("d",), "v1") == ("Certified", 0.9)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache_module.time, "monotonic", lambda: now[0])
+    cache = make_cache(ttl_seconds=60)
+    cache.get(("a",), "v1")
+    cache.put(("a",), ("Certified", 0.9), "v1")
+
+    now[0] += 59
+    assert cache.get(("a",), "v1") == ("Certified", 0.9)
+    now[0] += 2
+    assert cache.get(("a",), "v1") is None
+    stats = cache.stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+
+
+def test_new_model_version_empties_the_cache():
+    cache = make_cache()
+    cache.get(("a",), "v1")
+    cache.put(("a",), ("Certified", 0.9), "v1")
+
+    assert cache.get(("a",), "v2") is None
+    cache.put(("a",), ("Denied", 0.4), "v2")
+
+    assert cache.get(("a",), "v2") == ("Denied", 0.4)
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_late_put_from_replaced_model_is_dropped():
+    cache = make_cache()
+    cache.get(("a",), "v2")
+    cache.put(("a",), ("Certified", 0.9), "v2")
+
+    # a request scored by v1 finishes after v2 took over
+    cache.put(("b",), ("Denied", 0.1), "v1")
+
+    assert cache.get(("a",), "v2") == ("Certified", 0.9)
+    assert cache.get(("b",), "v2") is None
+    stats = cache.stats()
+    assert (stats["stale_puts"], stats["invalidations"], stats["entries"]) == (1, 0, 1)
+
+
+def test_lookup_and_fill_answer_hits_and_store_misses():
+    row = dict(continent="Asia", education_of_employee="Master's", has_job_experience="Y",
+               requires_job_training="N", no_of_employees=2412, company_age=24, region_of_employment="Northeast",
+               prevailing_wage=83425.65, unit_of_wage="Year", full_time_position="Y")
+    frame = pd.DataFrame([row, {**row, "continent": "Europe"}, row])[list(MODEL_INPUT_COLUMNS)]
+    cache = make_cache()
+
+    keys, results, missing = cache.lookup(frame, "v1")
+    assert missing == [0, 1, 2]
+    labels, probabilities = cache.fill(keys, results, missing, np.array([1, 0, 1]), np.array([0.8, 0.3, 0.8]), "v1")
+    assert labels.tolist() == [1, 0, 1] and probabilities.tolist() == [0.8, 0.3, 0.8]
+
+    keys, results, missing = cache.lookup(frame, "v1")
+    assert missing == [] and [result[1] for result in results] == [0.8, 0.3, 0.8]
@@ -0,0 +1,38 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from us_visa.constants import MODEL_CATEGORICAL_INPUT_COLUMNS, MODEL_INPUT_COLUMNS, MODEL_NUMERIC_INPUT_COLUMNS
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.pipline.prediction_pipeline import MISSING_VALUE_DEFAULTS, _DEFAULT_IMPUTER
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROW = dict(continent="Asia", education_of_employee="Master's", has_job_experience="Y", requires_job_training="N",
+           no_of_employees="2412", company_age="24", region_of_employment="Northeast", prevailing_wage="83425.65",
+           unit_of_wage="Year", full_time_position="Y")
+
+
+def test_defaults_are_values_the_encoders_know():
+    dataset = pd.read_csv(os.path.join(PROJECT_ROOT, "notebook", "Visadataset.csv"))
+    assert set(MISSING_VALUE_DEFAULTS) == set(MODEL_INPUT_COLUMNS)
+    for column in MODEL_CATEGORICAL_INPUT_COLUMNS:
+        assert MISSING_VALUE_DEFAULTS[column] in set(dataset[column]), column
+    for column in MODEL_NUMERIC_INPUT_COLUMNS:
+        assert isinstance(MISSING_VALUE_DEFAULTS[column], (int, float)), column
+
+
+def test_default_imputer_fills_missing_numeric_and_categorical_values():
+    rows = [ROW, {**ROW, "no_of_employees": None, "has_job_experience": None},
+            {**ROW, "requires_job_training": "", "prevailing_wage": ""}]
+    batch = _DEFAULT_IMPUTER.transform(USvisaBatch.from_records([SimpleNamespace(**row) for row in rows]))
+
+    assert batch.column_values("has_job_experience").tolist() == ["Y", "Y", "Y"]
+    assert batch.column_values("requires_job_training").tolist() == ["N", "N", "N"]
+    assert np.array_equal(batch.numeric("no_of_employees"), [2412.0, 2109.0, 2412.0])
+    assert np.array_equal(batch.numeric("prevailing_wage"), [83425.65, 83425.65, 50000.0])
+
+    frame = pd.DataFrame([{**ROW, "no_of_employees": np.nan, "has_job_experience": np.nan}])
+    filled = _DEFAULT_IMPUTER.transform(frame)
+    assert filled.loc[0, "no_of_employees"] == 2109 and filled.loc[0, "has_job_experience"] == "Y"
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from us_visa.entity.config_entity import ModelServingConfig
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.serving import shadow as shadow_module
+from us_visa.serving.prediction_service import PredictionService
+from us_visa.serving.shadow import ShadowScorer
+
+ROW = dict(continent="Asia", education_of_employee="Master's", has_job_experience="Y", requires_job_training="N",
+           no_of_employees="2412", company_age="24", region_of_employment="Northeast", prevailing_wage="83425.65",
+           unit_of_wage="Year", full_time_position="Y")
+
+
+class FakeClassifier:
+    """
+    Shadow model answering a fixed result, optionally failing or waiting for release first
+    """
+    result = None
+    error = None
+    release = None
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    def predict_batch(self, data):
+        if FakeClassifier.release is not None:
+            FakeClassifier.release.wait(5)
+        if FakeClassifier.error is not None:
+            raise FakeClassifier.error
+        return FakeClassifier.result
+
+
+@pytest.fixture
+def model_serving_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(shadow_module, "USvisaClassifier", FakeClassifier)
+    monkeypatch.setattr(FakeClassifier, "result", (np.array([1, 1, 1, 1]), np.array([0.9, 0.6, 0.7, 0.8])))
+    monkeypatch.setattr(FakeClassifier, "error", None)
+    monkeypatch.setattr(FakeClassifier, "release", None)
+    shadow_model_path = tmp_path / "shadow.pkl"
+    shadow_model_path.write_bytes(b"shadow model")
+    return ModelServingConfig(model_file_path=None, shadow_model_file_path=str(shadow_model_path),
+                              model_registry_file_path=str(tmp_path / "registry.db"), shadow_queue_max_size=2,
+                              cache_enabled=False, micro_batch_enabled=False, coalesce_enabled=False)
+
+
+async def drain(shadow_scorer: ShadowScorer, scored_batches: int) -> None:
+    for _ in range(500):
+        if shadow_scorer.scored_batches + shadow_scorer.errors >= scored_batches:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Shadow scored {shadow_scorer.stats()}")
+
+
+def test_full_queue_drops_batches_without_blocking(model_serving_config):
+    FakeClassifier.release = threading.Event()
+    shadow_scorer = ShadowScorer(model_serving_config)
+    frame = pd.DataFrame([ROW] * 4)
+    labels, probabilities = np.array([1, 0, 1, 1]), np.array([0.8, 0.4, 0.7, 0.9])
+
+    async def main():
+        await shadow_scorer.start()
+        shadow_scorer.submit(frame, labels, probabilities, 0.01)
+        # the worker takes the first batch and blocks on the shadow model, two more fill the queue
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            shadow_scorer.submit(frame, labels, probabilities, 0.01)
+        assert not shadow_scorer.wants_batch()
+        FakeClassifier.release.set()
+        await drain(shadow_scorer, 3)
+        await shadow_scorer.stop()
+
+    asyncio.run(main())
+
+    stats = shadow_scorer.stats()
+    assert (stats["submitted"], stats["dropped"], stats["scored_batches"]) == (3, 4, 3)
+
+
+def test_agreement_and_probability_delta_are_recorded(model_serving_config):
+    shadow_scorer = ShadowScorer(model_serving_config)
+
+    async def main():
+        await shadow_scorer.start()
+        shadow_scorer.submit(pd.DataFrame([ROW] * 4), np.array([1, 0, 1, 1]), np.array([0.8, 0.4, 0.7, 0.9]), 0.02)
+        await drain(shadow_scorer, 1)
+        await shadow_scorer.stop()
+
+    asyncio.run(main())
+
+    stats = shadow_scorer.stats()
+    assert stats["enabled"] is False and stats["model_path"] == model_serving_config.shadow_model_file_path
+    assert (stats["scored_batches"], stats["scored_rows"], stats["errors"]) == (1, 4, 0)
+    assert stats["agreement_rate"] == 0.75
+    assert stats["mean_abs_probability_delta"] == pytest.approx((0.1 + 0.2 + 0.0 + 0.1) / 4)
+    assert stats["mean_primary_batch_seconds"] == 0.02
+    assert stats["mean_shadow_batch_seconds"] >= 0
+
+
+def test_shadow_failure_never_reaches_the_primary_response(model_serving_config):
+    FakeClassifier.error = ValueError("Found unknown categories ['Mars'] in column continent during transform")
+    prediction_service = PredictionService(SimpleNamespace(model_path=None), model_serving_config)
+    primary = (np.array([1, 0]), np.array([0.8, 0.3]))
+
+    async def predict_batch(data):
+        return primary
+
+    prediction_service.inference_executor.predict_batch = predict_batch
+    batch = USvisaBatch.from_records([SimpleNamespace(**ROW), SimpleNamespace(**{**ROW, "continent": None})])
+
+    async def main():
+        await prediction_service.shadow_scorer.start()
+        results = [await prediction_service._score(batch) for _ in range(2)]
+        await drain(prediction_service.shadow_scorer, 2)
+        await prediction_service.shadow_scorer.stop()
+        return results
+
+    results = asyncio.run(main())
+
+    for labels, probabilities in results:
+        assert np.array_equal(labels, primary[0]) and np.array_equal(probabilities, primary[1])
+    assert prediction_service.shadow_scorer.stats()["errors"] == 2
+
+
+def test_full_queue_skips_copying_the_batch(model_serving_config, monkeypatch):
+    prediction_service = PredictionService(SimpleNamespace(model_path=None), model_serving_config)
+    shadow_scorer = prediction_service.shadow_scorer
+
+    async def predict_batch(data):
+        return np.array([1]), np.array([0.8])
+
+    prediction_service.inference_executor.predict_batch = predict_batch
+    batch = USvisaBatch.from_records([SimpleNamespace(**ROW)])
+    copies = []
+    original_take = USvisaBatch.take
+    monkeypatch.setattr(USvisaBatch, "take", lambda self, indices: copies.append(1) or original_take(self, indices))
+
+    async def main():
+        await shadow_scorer.start()
+        shadow_scorer._worker.cancel()
+        for _ in range(5):
+            await prediction_service._score(batch)
+        await shadow_scorer.stop()
+
+    asyncio.run(main())
+
+    assert len(copies) == 2
+    assert (shadow_scorer.submitted, shadow_scorer.dropped) == (2, 3)
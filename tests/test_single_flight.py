@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from us_visa.serving.inference_executor import InferenceTimeoutError
+from us_visa.serving.prediction_service import is_row_error
+from us_visa.serving.single_flight import SingleFlight
+
+
+def make_compute(keys, calls):
+    async def compute(positions):
+        calls.append([keys[position] for position in positions])
+        await asyncio.sleep(0.01)
+        if any(keys[position] == "Mars" for position in positions):
+            raise ValueError("Found unknown categories ['Mars'] in column 0 during transform")
+        return [f"scored-{keys[position]}" for position in positions]
+    return compute
+
+
+def test_failing_key_does_not_fail_keys_computed_with_it():
+    single_flight = SingleFlight(split_on_error=is_row_error)
+
+    async def main():
+        calls = []
+        first_keys = ["Asia", "Mars"]
+        second_keys = ["Asia"]
+        first = asyncio.ensure_future(single_flight.run(first_keys, make_compute(first_keys, calls)))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(single_flight.run(second_keys, make_compute(second_keys, calls)))
+        return await asyncio.gather(first, second, return_exceptions=True), calls
+
+    (first, second), calls = asyncio.run(main())
+
+    assert isinstance(first, ValueError)
+    assert second == ["scored-Asia"]
+    # the second caller joined the first one's computation instead of scoring Asia itself
+    assert calls == [["Asia", "Mars"], ["Asia"], ["Mars"]]
+    assert single_flight.coalesced == 1
+    assert single_flight.stats()["in_flight"] == 0
+
+
+def test_only_failing_keys_fail():
+    single_flight = SingleFlight()
+    keys = ["Asia", "Europe", "Mars", "Africa", "Oceania"]
+
+    async def main():
+        calls = []
+        own = asyncio.ensure_future(single_flight.run(keys, make_compute(keys, calls)))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(single_flight.run([key], make_compute([key], calls))) for key in keys]
+        return await asyncio.gather(own, *others, return_exceptions=True)
+
+    own, *others = asyncio.run(main())
+
+    assert isinstance(own, ValueError)
+    assert others[2] is own
+    assert [result for i, result in enumerate(others) if i != 2] == [
+        ["scored-Asia"], ["scored-Europe"], ["scored-Africa"], ["scored-Oceania"]]
+
+
+def test_timeout_fails_every_key_without_retry():
+    single_flight = SingleFlight(split_on_error=is_row_error)
+    calls = []
+
+    async def compute(positions):
+        calls.append(positions)
+        raise InferenceTimeoutError("Inference did not finish within 0.01s")
+
+    with pytest.raises(InferenceTimeoutError):
+        asyncio.run(single_flight.run(["Asia", "Europe", "Africa"], compute))
+    assert calls == [[0, 1, 2]]
+    assert single_flight.splits == 0
@@ -0,0 +1,126 @@
+import sys
+import threading
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from us_visa.entity.config_entity import TrainingJobConfig
+from us_visa.serving.training_jobs import (JOB_COMPLETED, JOB_FAILED, TrainingJobManager, _write_status,
+                                           run_training_job)
+
+
+def make_manager(tmp_path, monkeypatch) -> TrainingJobManager:
+    manager = TrainingJobManager(TrainingJobConfig(job_dir=str(tmp_path), lock_poll_seconds=0.01))
+    # jobs stay queued, no training process is started
+    monkeypatch.setattr(manager, "_ensure_dispatcher", lambda: None)
+    return manager
+
+
+def test_queue_position_is_shared_by_every_worker(tmp_path, monkeypatch):
+    first, second = make_manager(tmp_path, monkeypatch), make_manager(tmp_path, monkeypatch)
+
+    job_ids = [first.submit(), second.submit(), first.submit()]
+
+    for manager in (first, second):
+        assert [manager.status(job_id)["queue_position"] for job_id in job_ids] == [1, 2, 3]
+
+
+def test_one_job_runs_at_a_time_across_workers(tmp_path, monkeypatch):
+    first, second = make_manager(tmp_path, monkeypatch), make_manager(tmp_path, monkeypatch)
+    held = first._acquire_job_lock()
+    acquired = threading.Event()
+
+    def wait_for_lock():
+        if second._acquire_job_lock() is not None:
+            acquired.set()
+
+    waiter = threading.Thread(target=wait_for_lock, daemon=True)
+    waiter.start()
+    assert not acquired.wait(0.2)
+
+    held.close()
+    assert acquired.wait(2)
+    waiter.join()
+
+
+def test_shutdown_stops_waiting_for_the_lock(tmp_path, monkeypatch):
+    first, second = make_manager(tmp_path, monkeypatch), make_manager(tmp_path, monkeypatch)
+    held = first._acquire_job_lock()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(second._acquire_job_lock()), daemon=True)
+    waiter.start()
+
+    second.shutdown()
+    waiter.join(2)
+
+    assert results == [None]
+    held.close()
+
+
+def run_failing_job(tmp_path, monkeypatch, run_pipeline):
+    manager = make_manager(tmp_path, monkeypatch)
+    job_id = manager.submit()
+    # run_training_job imports the pipeline lazily; a stand-in module keeps the training stack
+    # (MongoDB, evidently) out of a test of the job bookkeeping
+    training_pipeline = ModuleType("us_visa.pipline.training_pipeline")
+    training_pipeline.TrainPipeline = lambda: SimpleNamespace(run_pipeline=run_pipeline)
+    monkeypatch.setitem(sys.modules, "us_visa.pipline.training_pipeline", training_pipeline)
+    run_training_job(job_id, manager.training_job_config)
+    return manager.status(job_id)
+
+
+def test_failing_stage_is_marked_failed(tmp_path, monkeypatch):
+    def run_pipeline(progress_callback):
+        progress_callback("data_ingestion", "started", None)
+        progress_callback("data_ingestion", "completed", object())
+        progress_callback("data_validation", "started", None)
+        progress_callback("data_validation", "failed", None)
+        raise ValueError("schema mismatch")
+
+    status = run_failing_job(tmp_path, monkeypatch, run_pipeline)
+
+    assert status["state"] == JOB_FAILED and status["error"] == "schema mismatch"
+    assert status["stages"]["data_ingestion"]["status"] == "completed"
+    assert status["stages"]["data_validation"]["status"] == "failed"
+    assert status["stages"]["data_transformation"]["status"] == "pending"
+
+
+def test_stage_left_started_is_marked_failed_with_the_job(tmp_path, monkeypatch):
+    def run_pipeline(progress_callback):
+        progress_callback("data_ingestion", "started", None)
+        raise RuntimeError("killed mid stage")
+
+    status = run_failing_job(tmp_path, monkeypatch, run_pipeline)
+
+    assert status["state"] == JOB_FAILED
+    assert status["stages"]["data_ingestion"]["status"] == "failed"
+
+
+def test_artifact_is_only_served_for_an_accepted_model(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, monkeypatch)
+    job_id = manager.submit()
+    status = manager.status(job_id)
+    status.update(state=JOB_COMPLETED, trained_model_file_path=str(tmp_path / "model.pkl"))
+
+    for model_accepted, artifact_path in ((None, None), (False, None), (True, str(tmp_path / "model.pkl"))):
+        status["model_accepted"] = model_accepted
+        _write_status(manager.status_file_path(job_id), status)
+        assert manager.artifact_path(job_id) == artifact_path
+
+
+def test_pipeline_reports_the_stage_that_raised(monkeypatch):
+    # needs the whole training stack installed
+    TrainPipeline = pytest.importorskip("us_visa.pipline.training_pipeline").TrainPipeline
+
+    def fail_validation(self, data_ingestion_artifact):
+        raise ValueError("schema mismatch")
+
+    monkeypatch.setattr(TrainPipeline, "start_data_ingestion", lambda self: object())
+    monkeypatch.setattr(TrainPipeline, "start_data_validation", fail_validation)
+    events = []
+
+    with pytest.raises(Exception, match="schema mismatch"):
+        TrainPipeline().run_pipeline(progress_callback=lambda stage, status, _: events.append((stage, status)))
+
+    assert events == [("data_ingestion", "started"), ("data_ingestion", "completed"),
+                      ("data_validation", "started"), ("data_validation", "failed")]
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from us_visa.entity.usvisa_batch import USvisaBatch, take_rows
+
+ROW = dict(continent="Asia", education_of_employee="Master's", has_job_experience="Y", requires_job_training="N",
+           no_of_employees="2412", company_age="24", region_of_employment="Northeast", prevailing_wage="83425.65",
+           unit_of_wage="Year", full_time_position="Y")
+
+
+def test_take_keeps_only_the_categories_of_its_rows():
+    batch = USvisaBatch.from_records([SimpleNamespace(**ROW), SimpleNamespace(**{**ROW, "continent": "Mars"}),
+                                      SimpleNamespace(**{**ROW, "continent": None}),
+                                      SimpleNamespace(**{**ROW, "continent": "Europe"})])
+
+    subset = take_rows(batch, [3, 2, 0])
+
+    assert sorted(subset.categories("continent").tolist()) == ["Asia", "Europe"]
+    assert subset.column_values("continent").tolist() == ["Europe", None, "Asia"]
+    assert np.array_equal(subset.numeric("company_age"), [24.0, 24.0, 24.0])
+    assert subset.to_dataframe().equals(batch.to_dataframe().iloc[[3, 2, 0]].reset_index(drop=True))
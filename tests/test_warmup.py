@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import PROJECT_ROOT
+from us_visa.entity.config_entity import ModelServingConfig
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+from us_visa.serving.prediction_service import PredictionService
+from us_visa.serving.warmup import synthetic_batch
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    # app.py mounts static/ and templates/ relative to the project root
+    monkeypatch.chdir(PROJECT_ROOT)
+    import app as app_module
+
+    model_holder = app_module.model_holder
+    monkeypatch.setattr(model_holder.model_serving_config, "model_registry_file_path", str(tmp_path / "registry.db"))
+    for name in ("model_path", "model_version", "load_seconds", "load_error", "warmed_up", "warmup_seconds"):
+        monkeypatch.setattr(model_holder, name, getattr(model_holder, name))
+    yield app_module
+    model_holder.unload()
+
+
+def test_ready_answers_503_until_the_model_is_warm(app_module, trained_model_path):
+    model_holder = app_module.model_holder
+    # no lifespan: the test drives loading and warm up itself
+    client = TestClient(app_module.app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["loaded"] is False
+
+    model_holder.load(trained_model_path)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["loaded"] is True and response.json()["warmed_up"] is False
+
+    model_holder.mark_warm(0.25)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True and response.json()["warmup_seconds"] == 0.25
+
+    # a reload is cold again until it has been warmed up
+    model_holder.load(trained_model_path)
+    assert client.get("/ready").status_code == 503
+
+
+def test_synthetic_batches_score_on_the_fitted_model(trained_model_path):
+    classifier = USvisaClassifier(model_path=trained_model_path)
+
+    for seed, size in enumerate((1, 8, 64)):
+        batch = synthetic_batch(classifier.model, n_rows=size, seed=seed)
+        labels, probabilities = classifier.predict_batch(batch)
+        assert len(batch) == len(labels) == len(probabilities) == size
+        labels, _ = classifier.predict_batch(batch.to_dataframe())
+        assert len(labels) == size
+
+
+def test_concurrent_warm_up_calls_never_share_a_batch(trained_model_path):
+    classifier = USvisaClassifier(model_path=trained_model_path)
+    scored = []
+
+    class RecordingExecutor:
+        max_workers = 3
+
+        async def predict_batch(self, data):
+            scored.append(data)
+            return classifier.predict_batch(data)
+
+    model_holder = SimpleNamespace(classifier=classifier, is_ready=True, model_version="test", warmed_up=False,
+                                   mark_warm=lambda seconds: setattr(model_holder, "warmed_up", True))
+    prediction_service = PredictionService(model_holder=model_holder, model_serving_config=ModelServingConfig(
+        warmup_batch_sizes=(4,), warmup_rounds=1, micro_batch_enabled=False, cache_enabled=False,
+        coalesce_enabled=False))
+    prediction_service.inference_executor = RecordingExecutor()
+
+    asyncio.run(prediction_service.warm_up())
+
+    # three workers, each through the columnar and the DataFrame path
+    assert len(scored) == 6 and len({id(data) for data in scored}) == 6
+    assert model_holder.warmed_up
@@ -1,8 +1,13 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from us_visa.configuration.aws_connection import S3Client
-from io import StringIO
+from us_visa.cloud_storage.key_cache import S3KeyExistenceCache
+from us_visa.cloud_storage.model_cache import S3ModelCache
+from us_visa.entity.config_entity import S3TransferConfig
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
 from typing import Union,List
-import os,sys
+import os,sys,time
 from us_visa.logger import logging
 from mypy_boto3_s3.service_resource import Bucket
 from us_visa.exception import USvisaException
@@ -13,26 +18,63 @@ import pickle
 
 class SimpleStorageService:
 
-    def __init__(self):
-        s3_client = S3Client()
+    # shared by every instance, estimators create a new SimpleStorageService per use
+    key_existence_cache: S3KeyExistenceCache = S3KeyExistenceCache()
+
+    def __init__(self, s3_transfer_config: S3TransferConfig = S3TransferConfig()):
+        s3_client = S3Client(s3_transfer_config=s3_transfer_config)
         self.s3_resource = s3_client.s3_resource
         self.s3_client = s3_client.s3_client
+        self.model_cache = S3ModelCache(self.s3_client)
+        self.s3_transfer_config = s3_transfer_config
+        # objects above the threshold are moved as parallel multipart / ranged GET parts
+        self.transfer_config = TransferConfig(multipart_threshold=s3_transfer_config.multipart_threshold,
+                                              multipart_chunksize=s3_transfer_config.multipart_chunksize,
+                                              max_concurrency=s3_transfer_config.max_concurrency,
+                                              use_threads=True)
+
+    @staticmethod
+    def _log_throughput(action: str, num_bytes: int, seconds: float) -> None:
+        logging.info(f"{action}: {num_bytes / 1e6:.2f}MB in {seconds:.3f}s "
+                     f"({num_bytes / 1e6 / max(seconds, 1e-9):.2f}MB/s)")
 
-    def s3_key_path_available(self,bucket_name,s3_key)->bool:
+    def key_exists(self, bucket_name: str, s3_key: str) -> bool:
+        """
+        Method Name :   key_exists
+        Description :   This method checks that the exact s3_key exists with a HEAD request, answering
+                        from the short TTL existence cache when possible
+
+        Output      :   True when the object exists
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        cached = self.key_existence_cache.get(bucket_name, s3_key)
+        if cached is not None:
+            return cached
         try:
-            bucket = self.get_bucket(bucket_name)
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=s3_key)]
-            if len(file_objects) > 0:
-                return True
-            else:
-                return False
+            self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            exists = True
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                raise USvisaException(e, sys) from e
+            exists = False
+        self.key_existence_cache.put(bucket_name, s3_key, exists)
+        return exists
+
+    def s3_key_path_available(self,bucket_name,s3_key,prefix: bool = False)->bool:
+        """
+        :param prefix: True to accept any key starting with s3_key (one LIST call), otherwise the exact key is checked with HEAD
+        """
+        try:
+            if not prefix:
+                return self.key_exists(bucket_name, s3_key)
+            response = self.s3_client.list_objects_v2(Bucket=bucket_name, Prefix=s3_key, MaxKeys=1)
+            return response.get("KeyCount", 0) > 0
         except Exception as e:
             raise USvisaException(e,sys)
         
         
 
-    @staticmethod
-    def read_object(object_name: str, decode: bool = True, make_readable: bool = False) -> Union[StringIO, str]:
+    def read_object(self, object_name: object, decode: bool = True, make_readable: bool = False) -> Union[StringIO, str]:
         """
         Method Name :   read_object
         Description :   This method reads the object_name object with kwargs
@@ -46,10 +88,18 @@ class SimpleStorageService:
         logging.info("Entered the read_object method of S3Operations class")
 
         try:
+            start = time.perf_counter()
+            buffer = BytesIO()
+            # works for both s3.Object and the s3.ObjectSummary items of a listing
+            self.s3_client.download_fileobj(object_name.bucket_name, object_name.key, buffer,
+                                            Config=self.transfer_config)
+            content = buffer.getvalue()
+            self._log_throughput(f"Read s3://{object_name.bucket_name}/{object_name.key}", len(content),
+                                 time.perf_counter() - start)
             func = (
-                lambda: object_name.get()["Body"].read().decode()
+                lambda: content.decode()
                 if decode is True
-                else object_name.get()["Body"].read()
+                else content
             )
             conv_func = lambda: StringIO(func()) if make_readable is True else func()
             logging.info("Exited the read_object method of S3Operations class")
@@ -78,10 +128,11 @@ class SimpleStorageService:
         except Exception as e:
             raise USvisaException(e, sys) from e
 
-    def get_file_object( self, filename: str, bucket_name: str) -> Union[List[object], object]:
+    def get_file_object( self, filename: str, bucket_name: str, prefix: bool = False) -> Union[List[object], object]:
         """
         Method Name :   get_file_object
-        Description :   This method gets the file object from bucket_name bucket based on filename
+        Description :   This method gets the file object from bucket_name bucket based on filename,
+                        listing every key starting with filename only when prefix is True
 
         Output      :   list of objects or object is returned based on filename
         On Failure  :   Write an exception log and then raise an exception
@@ -92,9 +143,13 @@ class SimpleStorageService:
         logging.info("Entered the get_file_object method of S3Operations class")
 
         try:
-            bucket = self.get_bucket(bucket_name)
-
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=filename)]
+            if not prefix:
+                # exact key: a HEAD instead of a paginated LIST over the bucket history
+                file_objects = [self.s3_resource.Object(bucket_name, filename)] \
+                    if self.key_exists(bucket_name, filename) else []
+            else:
+                bucket = self.get_bucket(bucket_name)
+                file_objects = [file_object for file_object in bucket.objects.filter(Prefix=filename)]
 
             func = lambda x: x[0] if len(x) == 1 else x
 
@@ -126,9 +181,10 @@ class SimpleStorageService:
                 else model_dir + "/" + model_name
             )
             model_file = func()
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
-            model = pickle.loads(model_obj)
+            # read through the local disk cache, only changed objects are downloaded again
+            cached_file_path = self.model_cache.fetch(bucket_name=bucket_name, key=model_file)
+            with open(cached_file_path, "rb") as file_obj:
+                model = pickle.load(file_obj)
             logging.info("Exited the load_model method of S3Operations class")
             return model
 
@@ -155,6 +211,7 @@ class SimpleStorageService:
             if e.response["Error"]["Code"] == "404":
                 folder_obj = folder_name + "/"
                 self.s3_client.put_object(Bucket=bucket_name, Key=folder_obj)
+                self.key_existence_cache.invalidate(bucket_name, folder_obj)
             else:
                 pass
             logging.info("Exited the create_folder method of S3Operations class")
@@ -177,13 +234,13 @@ class SimpleStorageService:
                 f"Uploading {from_filename} file to {to_filename} file in {bucket_name} bucket"
             )
 
+            start = time.perf_counter()
             self.s3_resource.meta.client.upload_file(
-                from_filename, bucket_name, to_filename
-            )
-
-            logging.info(
-                f"Uploaded {from_filename} file to {to_filename} file in {bucket_name} bucket"
+                from_filename, bucket_name, to_filename, Config=self.transfer_config
             )
+            self._log_throughput(f"Uploaded {from_filename} to s3://{bucket_name}/{to_filename}",
+                                 os.path.getsize(from_filename), time.perf_counter() - start)
+            self.key_existence_cache.put(bucket_name, to_filename, True)
 
             if remove is True:
                 os.remove(from_filename)
@@ -261,4 +318,100 @@ class SimpleStorageService:
             logging.info("Exited the read_csv method of S3Operations class")
             return df
         except Exception as e:
-            raise USvisaException(e, sys) from e 
\ No newline at end of file
+            raise USvisaException(e, sys) from e
+
+    def download_file(self, filename: str, bucket_name: str, to_filename: str) -> None:
+        """
+        Method Name :   download_file
+        Description :   This method downloads the filename object of bucket_name bucket to the to_filename local file
+
+        Output      :   File is written to to_filename
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered the download_file method of S3Operations class")
+
+        try:
+            os.makedirs(os.path.dirname(to_filename) or ".", exist_ok=True)
+            start = time.perf_counter()
+            self.s3_client.download_file(bucket_name, filename, to_filename, Config=self.transfer_config)
+            self._log_throughput(f"Downloaded s3://{bucket_name}/{filename} to {to_filename}",
+                                 os.path.getsize(to_filename), time.perf_counter() - start)
+
+            logging.info("Exited the download_file method of S3Operations class")
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def _run_bulk(self, action: str, jobs: List[tuple], func) -> dict:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.s3_transfer_config.bulk_workers) as executor:
+            sizes = list(executor.map(lambda job: func(*job), jobs))
+        seconds = time.perf_counter() - start
+        report = {"files": len(jobs), "bytes": sum(sizes), "seconds": round(seconds, 3),
+                  "mb_per_second": round(sum(sizes) / 1e6 / max(seconds, 1e-9), 2)}
+        self._log_throughput(f"{action} {len(jobs)} files", sum(sizes), seconds)
+        return report
+
+    def upload_directory(self, local_dir: str, bucket_name: str, prefix: str) -> dict:
+        """
+        Method Name :   upload_directory
+        Description :   This method uploads every file below local_dir, e.g. a whole artifact/<timestamp> run
+                        directory, to bucket_name under prefix, several files at a time
+
+        Output      :   Returns a report with file count, bytes, seconds and MB/s
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered the upload_directory method of S3Operations class")
+
+        try:
+            jobs = []
+            for root, _, files in os.walk(local_dir):
+                for name in files:
+                    local_path = os.path.join(root, name)
+                    relative_path = os.path.relpath(local_path, local_dir).replace(os.sep, "/")
+                    jobs.append((local_path, f"{prefix.rstrip('/')}/{relative_path}"))
+
+            def upload(local_path: str, key: str) -> int:
+                self.s3_client.upload_file(local_path, bucket_name, key, Config=self.transfer_config)
+                self.key_existence_cache.put(bucket_name, key, True)
+                return os.path.getsize(local_path)
+
+            report = self._run_bulk(f"Uploaded {local_dir} to s3://{bucket_name}/{prefix}", jobs, upload)
+            logging.info("Exited the upload_directory method of S3Operations class")
+            return report
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def download_directory(self, bucket_name: str, prefix: str, local_dir: str) -> dict:
+        """
+        Method Name :   download_directory
+        Description :   This method downloads every object under prefix of bucket_name bucket into local_dir,
+                        several files at a time
+
+        Output      :   Returns a report with file count, bytes, seconds and MB/s
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered the download_directory method of S3Operations class")
+
+        try:
+            prefix = prefix.rstrip("/") + "/"
+            jobs = []
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                for item in page.get("Contents", []):
+                    if item["Key"].endswith("/"):
+                        continue
+                    jobs.append((item["Key"], os.path.join(local_dir, *item["Key"][len(prefix):].split("/"))))
+
+            def download(key: str, local_path: str) -> int:
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                self.s3_client.download_file(bucket_name, key, local_path, Config=self.transfer_config)
+                return os.path.getsize(local_path)
+
+            report = self._run_bulk(f"Downloaded s3://{bucket_name}/{prefix} to {local_dir}", jobs, download)
+            logging.info("Exited the download_directory method of S3Operations class")
+            return report
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
@@ -0,0 +1,50 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from us_visa.entity.config_entity import S3KeyCacheConfig
+
+
+class S3KeyExistenceCache:
+    """
+    This class remembers the result of exact-key HEAD lookups for a short time, with a separate
+    TTL for keys found and keys missing, so repeated existence checks do not go to S3 at all
+    """
+
+    def __init__(self, s3_key_cache_config: S3KeyCacheConfig = S3KeyCacheConfig()):
+        """
+        :param s3_key_cache_config: TTLs for positive and negative entries and the entry cap
+        """
+        self.s3_key_cache_config = s3_key_cache_config
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, bucket_name: str, key: str) -> Optional[bool]:
+        """
+        :return: Cached existence of the key, None when unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get((bucket_name, key))
+            if entry is None or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def put(self, bucket_name: str, key: str, exists: bool) -> None:
+        ttl = self.s3_key_cache_config.exists_ttl_seconds if exists else self.s3_key_cache_config.missing_ttl_seconds
+        with self._lock:
+            self._entries[(bucket_name, key)] = (exists, time.monotonic() + ttl)
+            self._entries.move_to_end((bucket_name, key))
+            while len(self._entries) > self.s3_key_cache_config.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, bucket_name: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((bucket_name, key), None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
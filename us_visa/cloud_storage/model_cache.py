@@ -0,0 +1,130 @@
+import glob
+import hashlib
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from us_visa.entity.config_entity import S3ModelCacheConfig
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+
+
+class S3ModelCache:
+    """
+    This class is a read-through disk cache for objects fetched from S3. Entries are keyed on
+    bucket/key/ETag: a cached copy is revalidated with a conditional HEAD (If-None-Match) and
+    only downloaded again when the ETag changed. Downloads go to a temp file that is renamed
+    into place, and the least recently used entries are evicted above max_bytes
+    """
+
+    def __init__(self, s3_client, s3_model_cache_config: S3ModelCacheConfig = S3ModelCacheConfig()):
+        """
+        :param s3_client: boto3 S3 client
+        :param s3_model_cache_config: Configuration of the cache directory and size cap
+        """
+        self.s3_client = s3_client
+        self.s3_model_cache_config = s3_model_cache_config
+        self.cache_dir = s3_model_cache_config.cache_dir
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key_hash(bucket_name: str, key: str) -> str:
+        return hashlib.sha256(f"{bucket_name}/{key}".encode()).hexdigest()[:24]
+
+    def _entry_path(self, bucket_name: str, key: str, etag: str) -> str:
+        etag = etag.strip('"')
+        return os.path.join(self.cache_dir, f"{self._key_hash(bucket_name, key)}-{etag}.bin")
+
+    def _cached_entry(self, bucket_name: str, key: str) -> Optional[str]:
+        entries = glob.glob(os.path.join(self.cache_dir, f"{self._key_hash(bucket_name, key)}-*.bin"))
+        return max(entries, key=os.path.getmtime) if entries else None
+
+    @staticmethod
+    def _etag_of(entry_path: str) -> str:
+        return '"' + os.path.basename(entry_path)[:-len(".bin")].split("-", 1)[1] + '"'
+
+    def _remove_other_versions(self, bucket_name: str, key: str, keep_path: str) -> None:
+        for entry_path in glob.glob(os.path.join(self.cache_dir, f"{self._key_hash(bucket_name, key)}-*.bin")):
+            if entry_path != keep_path:
+                os.remove(entry_path)
+
+    def _evict(self, keep_path: str) -> None:
+        entries = [(os.path.getmtime(path), os.path.getsize(path), path)
+                   for path in glob.glob(os.path.join(self.cache_dir, "*.bin"))]
+        total_bytes = sum(size for _, size, _ in entries)
+        # oldest access first; the mtime of an entry is bumped on every hit. The entry being
+        # returned is kept even when it alone is above the cap
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.s3_model_cache_config.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            os.remove(path)
+            total_bytes -= size
+            logging.info(f"Evicted [{path}] from S3 model cache")
+
+    def _download(self, bucket_name: str, key: str) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        start = time.perf_counter()
+        response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
+        # the ETag of the body actually downloaded, not of an earlier HEAD, names the entry
+        entry_path = self._entry_path(bucket_name, key, response["ETag"])
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as file_obj:
+                for chunk in response["Body"].iter_chunks(self.s3_model_cache_config.download_chunk_bytes):
+                    file_obj.write(chunk)
+            os.replace(tmp_path, entry_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(entry_path)
+        logging.info(f"Downloaded s3://{bucket_name}/{key} ({size / 1e6:.1f}MB) to cache in {elapsed:.3f}s")
+        return entry_path
+
+    def fetch(self, bucket_name: str, key: str) -> str:
+        """
+        Method Name :   fetch
+        Description :   This method returns a local file holding the current version of s3://bucket_name/key
+
+        Output      :   Returns the path of the cached file
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            with self._lock:
+                cached_path = self._cached_entry(bucket_name, key)
+                if cached_path is not None:
+                    try:
+                        self.s3_client.head_object(Bucket=bucket_name, Key=key,
+                                                   IfNoneMatch=self._etag_of(cached_path))
+                    except ClientError as e:
+                        if e.response["Error"]["Code"] in ("304", "NotModified"):
+                            self.hits += 1
+                            os.utime(cached_path)
+                            logging.info(f"S3 model cache hit for s3://{bucket_name}/{key}")
+                            return cached_path
+                        raise
+                    except BotoCoreError as e:
+                        # S3 unreachable: the last known version is better than failing to start
+                        logging.warning(f"Could not revalidate s3://{bucket_name}/{key} ({e}), using cached copy")
+                        self.hits += 1
+                        return cached_path
+
+                self.misses += 1
+                entry_path = self._download(bucket_name, key)
+                self._remove_other_versions(bucket_name, key, entry_path)
+                self._evict(keep_path=entry_path)
+                return entry_path
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "cache_dir": self.cache_dir}
@@ -6,13 +6,15 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler, OneHotEncoder, OrdinalEncoder, PowerTransformer, LabelEncoder
 from sklearn.compose import ColumnTransformer
 
-from us_visa.constants import TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR
+from us_visa.constants import TARGET_COLUMN, SCHEMA_FILE_PATH
 from us_visa.entity.config_entity import DataTransformationConfig
 from us_visa.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifacts, DataValidationArtifact
 from us_visa.exception import USvisaException
 from us_visa.logger import logging
-from us_visa.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file, drop_columns
+from us_visa.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file, drop_columns, add_company_age
 from us_visa.entity.estimator import TargetValueMapping
+from us_visa.entity.fast_preprocessor import FastPreprocessor
+from us_visa.entity.imputer import MissingValueImputer
 
 
 class DataTransformation:
@@ -64,6 +66,24 @@ class DataTransformation:
         except Exception as e:
             raise USvisaException(e, sys) from e
 
+    def export_fast_preprocessor(self, preprocessor: ColumnTransformer, verify_df: pd.DataFrame):
+        """
+        Method Name :   export_fast_preprocessor
+        Description :   This method compiles the fitted preprocessor to FastPreprocessor, verifies it
+                        is bit compatible with sklearn on verify_df and saves it next to preprocessing.pkl
+
+        Output      :   Returns saved file path, None when the preprocessor cannot be compiled
+        """
+        try:
+            fast_preprocessor = FastPreprocessor.from_column_transformer(preprocessor)
+            fast_preprocessor.verify(preprocessor, verify_df)
+            save_object(self.data_transformation_config.transformed_fast_object_file_path, fast_preprocessor)
+            logging.info("Saved compiled fast preprocessor")
+            return self.data_transformation_config.transformed_fast_object_file_path
+        except Exception as e:
+            logging.warning(f"Fast preprocessor export skipped, serving will use sklearn transform: {e}")
+            return None
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         try:
             if not self.data_validation_artifact.validation_status:
@@ -84,8 +104,8 @@ class DataTransformation:
             logging.info("Got train and test features")
 
             # Add company_age
-            input_feature_train_df['company_age'] = CURRENT_YEAR - input_feature_train_df['yr_of_estab']
-            input_feature_test_df['company_age'] = CURRENT_YEAR - input_feature_test_df['yr_of_estab']
+            input_feature_train_df = add_company_age(input_feature_train_df)
+            input_feature_test_df = add_company_age(input_feature_test_df)
 
             # Drop unwanted columns
             drop_cols = self._schema_config['drop_columns']
@@ -94,6 +114,14 @@ class DataTransformation:
 
             logging.info("Dropped columns and added company_age")
 
+            # Learn fill values from the training split only; serving applies the same values
+            imputer = MissingValueImputer().fit(
+                input_feature_train_df,
+                categorical_columns=self._schema_config['oh_columns'] + self._schema_config['or_columns'],
+                numeric_columns=self._schema_config['num_features'])
+            input_feature_train_df = imputer.transform(input_feature_train_df)
+            input_feature_test_df = imputer.transform(input_feature_test_df)
+
             # Map target column using TargetValueMapping
             try:
                 # Normalize labels (remove extra spaces, fix casing)
@@ -118,6 +146,9 @@ class DataTransformation:
             input_feature_train_arr = preprocessor.fit_transform(input_feature_train_df)
             input_feature_test_arr = preprocessor.transform(input_feature_test_df)
 
+            # Compile the fitted preprocessor into the numpy fast path used at serving time
+            transformed_fast_object_file_path = self.export_fast_preprocessor(preprocessor, input_feature_test_df)
+
             # Apply SMOTEENN
             logging.info("Applying SMOTEENN to balance classes")
             smt = SMOTEENN(sampling_strategy="minority")
@@ -134,6 +165,7 @@ class DataTransformation:
 
             # Save transformed objects and arrays
             save_object(self.data_transformation_config.transformed_object_file_path, preprocessor)
+            save_object(self.data_transformation_config.transformed_imputer_object_file_path, imputer)
             save_numpy_array_data(self.data_transformation_config.transformed_train_file_path, train_arr)
             save_numpy_array_data(self.data_transformation_config.transformed_test_file_path, test_arr)
 
@@ -142,7 +174,9 @@ class DataTransformation:
             return DataTransformationArtifact(
                 transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
-                transformed_test_file_path=self.data_transformation_config.transformed_test_file_path
+                transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+                transformed_fast_object_file_path=transformed_fast_object_file_path,
+                transformed_imputer_object_file_path=self.data_transformation_config.transformed_imputer_object_file_path
             )
 
         except Exception as e:
@@ -2,7 +2,8 @@ from us_visa.entity.config_entity import ModelEvaluationConfig
 from us_visa.entity.artifact_entity import ModelTrainerArtifact, DataIngestionArtifacts, ModelEvaluationArtifact
 from sklearn.metrics import f1_score
 from us_visa.exception import USvisaException
-from us_visa.constants import TARGET_COLUMN, CURRENT_YEAR
+from us_visa.constants import TARGET_COLUMN
+from us_visa.utils.main_utils import add_company_age
 from us_visa.logger import logging
 import sys
 import pandas as pd
@@ -62,7 +63,7 @@ class ModelEvaluation:
         """
         try:
             test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
-            test_df['company_age'] = CURRENT_YEAR-test_df['yr_of_estab']
+            test_df = add_company_age(test_df)
 
             x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]
             y = y.replace(
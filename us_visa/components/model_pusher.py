@@ -5,6 +5,7 @@ from us_visa.exception import USvisaException
 from us_visa.logger import logging
 from us_visa.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtifact
 from us_visa.entity.config_entity import ModelPusherConfig
+from us_visa.entity.model_registry import ModelRegistry
 from us_visa.entity.s3_estimator import USvisaEstimator
 
 
@@ -36,6 +37,11 @@ class ModelPusher:
 
             self.usvisa_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
 
+            # the accepted model becomes the one serving resolves at startup
+            model_registry = ModelRegistry()
+            model_version = model_registry.register_model(model_path=self.model_evaluation_artifact.trained_model_path)
+            model_registry.promote(model_version)
+
 
             model_pusher_artifact = ModelPusherArtifact(bucket_name=self.model_pusher_config.bucket_name,
                                                         s3_model_path=self.model_pusher_config.s3_model_key_path)
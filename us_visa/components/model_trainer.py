@@ -1,3 +1,4 @@
+import os
 import sys
 from typing import Tuple
 
@@ -11,9 +12,11 @@ from neuro_mf  import ModelFactory
 from us_visa.exception import USvisaException
 from us_visa.logger import logging
 from us_visa.utils.main_utils import load_numpy_array_data, read_yaml_file, load_object, save_object
+from us_visa.utils.model_bundle import save_model_bundle
 from us_visa.entity.config_entity import ModelTrainerConfig
 from us_visa.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
 from us_visa.entity.estimator import USvisaModel
+from us_visa.entity.model_registry import ModelRegistry
 
 class ModelTrainer:
     def __init__(self, data_transformation_artifact: DataTransformationArtifact,
@@ -74,6 +77,14 @@ class ModelTrainer:
             best_model_detail ,metric_artifact = self.get_model_object_and_report(train=train_arr, test=test_arr)
             
             preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
+            fast_preprocessing_obj = None
+            if self.data_transformation_artifact.transformed_fast_object_file_path is not None:
+                fast_preprocessing_obj = load_object(
+                    file_path=self.data_transformation_artifact.transformed_fast_object_file_path)
+            imputer_obj = None
+            if self.data_transformation_artifact.transformed_imputer_object_file_path is not None:
+                imputer_obj = load_object(
+                    file_path=self.data_transformation_artifact.transformed_imputer_object_file_path)
 
 
             if best_model_detail.best_score < self.model_trainer_config.expected_accuracy:
@@ -81,14 +92,24 @@ class ModelTrainer:
                 raise Exception("No best model found with score more than base score")
 
             usvisa_model = USvisaModel(preprocessing_object=preprocessing_obj,
-                                       trained_model_object=best_model_detail.best_model)
+                                       trained_model_object=best_model_detail.best_model,
+                                       fast_preprocessing_object=fast_preprocessing_obj,
+                                       imputer_object=imputer_obj)
             logging.info("Created usvisa model object with preprocessor and model")
             logging.info("Created best model file path.")
             save_object(self.model_trainer_config.trained_model_file_path, usvisa_model)
+            # same model with its large arrays as separate memory mapped blocks for serving
+            save_model_bundle(self.model_trainer_config.trained_model_bundle_path, usvisa_model)
+            ModelRegistry().register_model(model_path=self.model_trainer_config.trained_model_file_path,
+                                           bundle_path=self.model_trainer_config.trained_model_bundle_path,
+                                           metric_artifact=metric_artifact,
+                                           run_timestamp=os.path.basename(
+                                               os.path.dirname(self.model_trainer_config.model_trainer_dir)))
 
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 metric_artifact=metric_artifact,
+                trained_model_bundle_path=self.model_trainer_config.trained_model_bundle_path,
             )
             logging.info(f"Model trainer artifact: {model_trainer_artifact}")
             return model_trainer_artifact
@@ -1,16 +1,19 @@
 import boto3
 import os
+from botocore.config import Config
 from us_visa.constants import AWS_SECRET_ACCESS_KEY_ENV_KEY, AWS_ACCESS_KEY_ID_ENV_KEY,REGION_NAME
+from us_visa.entity.config_entity import S3TransferConfig
 
 
 class S3Client:
 
     s3_client=None
     s3_resource = None
-    def __init__(self, region_name=REGION_NAME):
+    def __init__(self, region_name=REGION_NAME, s3_transfer_config: S3TransferConfig = S3TransferConfig()):
         """ 
         This Class gets aws credentials from env_variable and creates an connection with s3 bucket 
         and raise exception when environment variable is not set
+        :param s3_transfer_config: Connection pool size shared by client and resource, used on first creation
         """
 
         if S3Client.s3_resource==None or S3Client.s3_client==None:
@@ -20,16 +23,22 @@ class S3Client:
                 raise Exception(f"Environment variable: {AWS_ACCESS_KEY_ID_ENV_KEY} is not not set.")
             if __secret_access_key is None:
                 raise Exception(f"Environment variable: {AWS_SECRET_ACCESS_KEY_ENV_KEY} is not set.")
+
+            # the default pool of 10 connections serialises parallel multipart and bulk transfers
+            botocore_config = Config(max_pool_connections=s3_transfer_config.max_pool_connections,
+                                     retries={"mode": "standard"})
         
             S3Client.s3_resource = boto3.resource('s3',
                                             aws_access_key_id=__access_key_id,
                                             aws_secret_access_key=__secret_access_key,
-                                            region_name=region_name
+                                            region_name=region_name,
+                                            config=botocore_config
                                             )
             S3Client.s3_client = boto3.client('s3',
                                         aws_access_key_id=__access_key_id,
                                         aws_secret_access_key=__secret_access_key,
-                                        region_name=region_name
+                                        region_name=region_name,
+                                        config=botocore_config
                                         )
         self.s3_resource = S3Client.s3_resource
         self.s3_client = S3Client.s3_client
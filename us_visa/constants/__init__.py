@@ -19,6 +19,8 @@ MODEL_FILE_NAME = "model.pkl"
 TARGET_COLUMN = "case_status"
 CURRENT_YEAR = date.today().year
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
+FAST_PREPROCESSING_OBJECT_FILE_NAME = "fast_preprocessing.pkl"
+IMPUTER_OBJECT_FILE_NAME = "imputer.pkl"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
 
@@ -59,6 +61,7 @@ MODEL TRAINER related constant start with MODEL_TRAINER var name
 MODEL_TRAINER_DIR_NAME: str = "model_trainer"
 MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
+MODEL_TRAINER_TRAINED_MODEL_BUNDLE_NAME: str = "model.bundle"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_MODEL_CONFIG_FILE_PATH: str = os.path.join("config", "model.yaml")
 
@@ -74,3 +77,123 @@ MODEL_PUSHER_S3_KEY = "model-registry"
 
 APP_HOST = "0.0.0.0"
 APP_PORT = 8080
+
+
+"""
+Model serving related constant start with MODEL_SERVING VAR NAME
+"""
+MODEL_SERVING_MODEL_PATH_ENV_KEY = "USVISA_MODEL_PATH"
+MODEL_SERVING_MAX_BATCH_SIZE: int = 10000
+MODEL_INPUT_COLUMNS = ("continent", "education_of_employee", "has_job_experience", "requires_job_training",
+                       "no_of_employees", "region_of_employment", "prevailing_wage", "unit_of_wage",
+                       "full_time_position", "company_age")
+MODEL_CATEGORICAL_INPUT_COLUMNS = ("continent", "education_of_employee", "has_job_experience",
+                                   "requires_job_training", "region_of_employment", "unit_of_wage",
+                                   "full_time_position")
+MODEL_NUMERIC_INPUT_COLUMNS = ("no_of_employees", "prevailing_wage", "company_age")
+MODEL_SERVING_MICRO_BATCH_ENABLED: bool = True
+MODEL_SERVING_MICRO_BATCH_WINDOW_MS: float = 5.0
+MODEL_SERVING_MICRO_BATCH_MAX_SIZE: int = 64
+MODEL_SERVING_CACHE_ENABLED: bool = True
+MODEL_SERVING_CACHE_MAX_ENTRIES: int = 100000
+MODEL_SERVING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+MODEL_SERVING_CACHE_TTL_SECONDS: float = 3600.0
+# concurrent requests for the same canonical applicant row share one computation
+MODEL_SERVING_COALESCE_ENABLED: bool = True
+MODEL_SERVING_EXECUTOR_KIND: str = "thread"
+MODEL_SERVING_EXECUTOR_MAX_WORKERS: int = 4
+MODEL_SERVING_INFERENCE_TIMEOUT_SECONDS: float = 10.0
+MODEL_SERVING_CSV_CHUNK_SIZE: int = 5000
+MODEL_SERVING_WARMUP_ENABLED: bool = True
+# covers the single row, micro batch and bulk code paths
+MODEL_SERVING_WARMUP_BATCH_SIZES = (1, 8, 64, 512)
+MODEL_SERVING_WARMUP_ROUNDS: int = 3
+MODEL_SERVING_SHADOW_MODEL_PATH_ENV_KEY = "USVISA_SHADOW_MODEL_PATH"
+# batches waiting for the shadow model, newer ones are dropped once it is full
+MODEL_SERVING_SHADOW_QUEUE_MAX_SIZE: int = 64
+
+
+"""
+Batch prediction related constant start with BATCH_PREDICTION VAR NAME
+"""
+BATCH_PREDICTION_CHUNK_SIZE: int = 50000
+BATCH_PREDICTION_WORKERS: int = os.cpu_count() or 1
+
+
+"""
+Training job related constant start with TRAINING_JOB VAR NAME
+"""
+TRAINING_JOB_DIR: str = os.path.join(ARTIFACT_DIR, "training_jobs")
+TRAINING_JOB_STATUS_FILE_NAME: str = "status.json"
+TRAINING_JOB_LOG_FILE_NAME: str = "train.log"
+TRAINING_JOB_LOCK_FILE_NAME: str = "training.lock"
+TRAINING_JOB_LOCK_POLL_SECONDS: float = 1.0
+TRAINING_JOB_STAGES = ("data_ingestion", "data_validation", "data_transformation", "model_trainer",
+                       "model_evaluation", "model_pusher")
+
+
+"""
+Model bundle related constant start with MODEL_BUNDLE VAR NAME
+"""
+MODEL_BUNDLE_MANIFEST_FILE_NAME: str = "manifest.json"
+MODEL_BUNDLE_OBJECT_FILE_NAME: str = "object.pkl"
+MODEL_BUNDLE_ARRAY_DIR: str = "arrays"
+MODEL_BUNDLE_FORMAT_VERSION: int = 1
+# arrays smaller than this stay inside object.pkl
+MODEL_BUNDLE_MIN_ARRAY_BYTES: int = 64 * 1024
+# "c" is copy-on-write: pages are shared with every process mapping the file until written
+MODEL_BUNDLE_MMAP_MODE: str = "c"
+
+
+"""
+Model registry related constant start with MODEL_REGISTRY VAR NAME
+"""
+MODEL_REGISTRY_FILE_PATH_ENV_KEY = "USVISA_MODEL_REGISTRY_PATH"
+MODEL_REGISTRY_FILE_PATH: str = os.path.join(ARTIFACT_DIR, "model_registry.db")
+MODEL_REGISTRY_CURRENT_POINTER: str = "current"
+# a model promoted to this pointer is scored in shadow next to the current one
+MODEL_REGISTRY_SHADOW_POINTER: str = "shadow"
+
+
+"""
+S3 model cache related constant start with S3_MODEL_CACHE VAR NAME
+"""
+S3_MODEL_CACHE_DIR_ENV_KEY = "USVISA_S3_MODEL_CACHE_DIR"
+S3_MODEL_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "s3_model_cache")
+S3_MODEL_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+S3_MODEL_CACHE_DOWNLOAD_CHUNK_BYTES: int = 8 * 1024 * 1024
+
+
+"""
+S3 transfer related constant start with S3_TRANSFER VAR NAME
+"""
+S3_TRANSFER_MULTIPART_THRESHOLD: int = 16 * 1024 * 1024
+S3_TRANSFER_MULTIPART_CHUNKSIZE: int = 16 * 1024 * 1024
+S3_TRANSFER_MAX_CONCURRENCY: int = 8
+S3_TRANSFER_BULK_WORKERS: int = 4
+# every bulk worker may run max_concurrency part transfers at once, all on the shared client
+S3_TRANSFER_MAX_POOL_CONNECTIONS: int = S3_TRANSFER_BULK_WORKERS * S3_TRANSFER_MAX_CONCURRENCY
+
+
+"""
+S3 key existence cache related constant start with S3_KEY_CACHE VAR NAME
+"""
+S3_KEY_CACHE_EXISTS_TTL_SECONDS: float = 60.0
+# kept shorter so a freshly pushed model is seen quickly
+S3_KEY_CACHE_MISSING_TTL_SECONDS: float = 10.0
+S3_KEY_CACHE_MAX_ENTRIES: int = 10000
+
+
+"""
+Serving launcher related constant start with SERVING_LAUNCHER VAR NAME
+"""
+SERVING_LAUNCHER_WORKERS_ENV_KEY = "USVISA_WORKERS"
+SERVING_LAUNCHER_WORKERS: int = 1
+SERVING_LAUNCHER_BACKLOG: int = 2048
+# a worker exiting sooner than this after its start counts as a crash loop and is restarted with backoff
+SERVING_LAUNCHER_MIN_WORKER_UPTIME_SECONDS: float = 5.0
+SERVING_LAUNCHER_MAX_RESTART_BACKOFF_SECONDS: float = 30.0
+# a worker slot that crash loops this many times in a row is not restarted again
+SERVING_LAUNCHER_MAX_WORKER_RESTARTS: int = 10
+SERVING_LAUNCHER_MEMORY_REPORT_INTERVAL_SECONDS: float = 60.0
+SERVING_LAUNCHER_GRACEFUL_TIMEOUT_SECONDS: float = 30.0
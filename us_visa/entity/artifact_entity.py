@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class DataIngestionArtifacts:
@@ -19,6 +20,8 @@ class DataTransformationArtifact:
     transformed_object_file_path:str 
     transformed_train_file_path:str
     transformed_test_file_path:str
+    transformed_fast_object_file_path:Optional[str] = None
+    transformed_imputer_object_file_path:Optional[str] = None
 
 
 
@@ -34,6 +37,7 @@ class ClassificationMetricArtifact:
 class ModelTrainerArtifact:
     trained_model_file_path:str 
     metric_artifact:ClassificationMetricArtifact
+    trained_model_bundle_path: Optional[str] = None
 
 @dataclass
 class ModelEvaluationArtifact:
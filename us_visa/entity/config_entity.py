@@ -1,6 +1,7 @@
 import os 
 from us_visa.constants import *
 from dataclasses import dataclass
+from typing import Optional
 from datetime import datetime
 
 TIMESTAMP:str=datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
@@ -41,6 +42,12 @@ class DataTransformationConfig:
     transformed_object_file_path: str = os.path.join(data_transformation_dir,
                                                      DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
                                                      PREPROCSSING_OBJECT_FILE_NAME)
+    transformed_fast_object_file_path: str = os.path.join(data_transformation_dir,
+                                                          DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
+                                                          FAST_PREPROCESSING_OBJECT_FILE_NAME)
+    transformed_imputer_object_file_path: str = os.path.join(data_transformation_dir,
+                                                             DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
+                                                             IMPUTER_OBJECT_FILE_NAME)
     
 
 
@@ -50,6 +57,8 @@ class DataTransformationConfig:
 class ModelTrainerConfig:
     model_trainer_dir: str = os.path.join(training_pipeline_config.artifact_dir, MODEL_TRAINER_DIR_NAME)
     trained_model_file_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRAINED_MODEL_DIR, MODEL_FILE_NAME)
+    trained_model_bundle_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRAINED_MODEL_DIR,
+                                                  MODEL_TRAINER_TRAINED_MODEL_BUNDLE_NAME)
     expected_accuracy: float = MODEL_TRAINER_EXPECTED_SCORE
     model_config_file_path: str = MODEL_TRAINER_MODEL_CONFIG_FILE_PATH    
 
@@ -71,4 +80,89 @@ class ModelPusherConfig:
 @dataclass
 class USvisaPredictorConfig:
     model_file_path: str = MODEL_FILE_NAME
-    model_bucket_name: str = MODEL_BUCKET_NAME    
\ No newline at end of file
+    model_bucket_name: str = MODEL_BUCKET_NAME    
+
+@dataclass
+class ModelServingConfig:
+    # None resolves the promoted model from the model registry at load time
+    model_file_path: Optional[str] = os.getenv(MODEL_SERVING_MODEL_PATH_ENV_KEY)
+    model_registry_file_path: str = os.getenv(MODEL_REGISTRY_FILE_PATH_ENV_KEY, MODEL_REGISTRY_FILE_PATH)
+    max_batch_size: int = MODEL_SERVING_MAX_BATCH_SIZE
+    micro_batch_enabled: bool = MODEL_SERVING_MICRO_BATCH_ENABLED
+    micro_batch_window_ms: float = MODEL_SERVING_MICRO_BATCH_WINDOW_MS
+    micro_batch_max_size: int = MODEL_SERVING_MICRO_BATCH_MAX_SIZE
+    cache_enabled: bool = MODEL_SERVING_CACHE_ENABLED
+    cache_max_entries: int = MODEL_SERVING_CACHE_MAX_ENTRIES
+    cache_max_bytes: int = MODEL_SERVING_CACHE_MAX_BYTES
+    cache_ttl_seconds: float = MODEL_SERVING_CACHE_TTL_SECONDS
+    coalesce_enabled: bool = MODEL_SERVING_COALESCE_ENABLED
+    executor_kind: str = MODEL_SERVING_EXECUTOR_KIND
+    executor_max_workers: int = MODEL_SERVING_EXECUTOR_MAX_WORKERS
+    inference_timeout_seconds: float = MODEL_SERVING_INFERENCE_TIMEOUT_SECONDS
+    csv_chunk_size: int = MODEL_SERVING_CSV_CHUNK_SIZE
+    warmup_enabled: bool = MODEL_SERVING_WARMUP_ENABLED
+    warmup_batch_sizes: tuple = MODEL_SERVING_WARMUP_BATCH_SIZES
+    warmup_rounds: int = MODEL_SERVING_WARMUP_ROUNDS
+    # None scores the registry shadow pointer in shadow when one is set, otherwise shadowing is off
+    shadow_model_file_path: Optional[str] = os.getenv(MODEL_SERVING_SHADOW_MODEL_PATH_ENV_KEY)
+    shadow_queue_max_size: int = MODEL_SERVING_SHADOW_QUEUE_MAX_SIZE
+
+
+@dataclass
+class BatchPredictionConfig:
+    model_file_path: Optional[str] = ModelServingConfig.model_file_path
+    model_registry_file_path: str = ModelServingConfig.model_registry_file_path
+    chunk_size: int = BATCH_PREDICTION_CHUNK_SIZE
+    workers: int = BATCH_PREDICTION_WORKERS
+
+
+@dataclass
+class TrainingJobConfig:
+    job_dir: str = TRAINING_JOB_DIR
+    status_file_name: str = TRAINING_JOB_STATUS_FILE_NAME
+    log_file_name: str = TRAINING_JOB_LOG_FILE_NAME
+    lock_file_name: str = TRAINING_JOB_LOCK_FILE_NAME
+    lock_poll_seconds: float = TRAINING_JOB_LOCK_POLL_SECONDS
+
+
+@dataclass
+class ModelRegistryConfig:
+    registry_file_path: str = os.getenv(MODEL_REGISTRY_FILE_PATH_ENV_KEY, MODEL_REGISTRY_FILE_PATH)
+    current_pointer: str = MODEL_REGISTRY_CURRENT_POINTER
+    shadow_pointer: str = MODEL_REGISTRY_SHADOW_POINTER
+
+
+@dataclass
+class S3ModelCacheConfig:
+    cache_dir: str = os.getenv(S3_MODEL_CACHE_DIR_ENV_KEY, S3_MODEL_CACHE_DIR)
+    max_bytes: int = S3_MODEL_CACHE_MAX_BYTES
+    download_chunk_bytes: int = S3_MODEL_CACHE_DOWNLOAD_CHUNK_BYTES
+
+
+@dataclass
+class S3TransferConfig:
+    multipart_threshold: int = S3_TRANSFER_MULTIPART_THRESHOLD
+    multipart_chunksize: int = S3_TRANSFER_MULTIPART_CHUNKSIZE
+    max_concurrency: int = S3_TRANSFER_MAX_CONCURRENCY
+    bulk_workers: int = S3_TRANSFER_BULK_WORKERS
+    max_pool_connections: int = S3_TRANSFER_MAX_POOL_CONNECTIONS
+
+
+@dataclass
+class S3KeyCacheConfig:
+    exists_ttl_seconds: float = S3_KEY_CACHE_EXISTS_TTL_SECONDS
+    missing_ttl_seconds: float = S3_KEY_CACHE_MISSING_TTL_SECONDS
+    max_entries: int = S3_KEY_CACHE_MAX_ENTRIES
+
+
+@dataclass
+class ServingLauncherConfig:
+    host: str = APP_HOST
+    port: int = APP_PORT
+    workers: int = int(os.getenv(SERVING_LAUNCHER_WORKERS_ENV_KEY, SERVING_LAUNCHER_WORKERS))
+    backlog: int = SERVING_LAUNCHER_BACKLOG
+    min_worker_uptime_seconds: float = SERVING_LAUNCHER_MIN_WORKER_UPTIME_SECONDS
+    max_restart_backoff_seconds: float = SERVING_LAUNCHER_MAX_RESTART_BACKOFF_SECONDS
+    max_worker_restarts: int = SERVING_LAUNCHER_MAX_WORKER_RESTARTS
+    memory_report_interval_seconds: float = SERVING_LAUNCHER_MEMORY_REPORT_INTERVAL_SECONDS
+    graceful_timeout_seconds: float = SERVING_LAUNCHER_GRACEFUL_TIMEOUT_SECONDS
@@ -1,9 +1,14 @@
 import sys
 import os 
+from typing import Tuple, Union
+
+import numpy as np
 from pandas import DataFrame 
 from sklearn.pipeline import Pipeline
 from us_visa.exception import USvisaException
-from us_visa.logger import logging 
+from us_visa.logger import hot_path_logger
+from us_visa.utils.metrics import metrics
+from us_visa.entity.usvisa_batch import USvisaBatch
 
 class TargetValueMapping:
     def __init__(self):
@@ -12,20 +17,40 @@ class TargetValueMapping:
 
     def _asdict(self):
         return self.__dict__
-    # def reverse_mapping(self):
-    #     mapping_response = self._asdict()
-    #     return dict(zip(mapping_response.values(),mapping_response.keys()))
+    def reverse_mapping(self):
+        mapping_response = self._asdict()
+        return dict(zip(mapping_response.values(),mapping_response.keys()))
     
 
 
 class USvisaModel:
-    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
+    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object,
+                 fast_preprocessing_object: object = None, imputer_object: object = None):
         """
         :param preprocessing_object: Input Object of preprocesser
         :param trained_model_object: Input Object of trained model 
+        :param fast_preprocessing_object: Compiled FastPreprocessor of preprocessing_object, optional
+        :param imputer_object: MissingValueImputer fitted on the training split, optional
         """
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+        self.fast_preprocessing_object = fast_preprocessing_object
+        self.imputer_object = imputer_object
+
+    def transform(self, dataframe: Union[DataFrame, USvisaBatch]):
+        """
+        Transforms raw inputs, a DataFrame or a columnar USvisaBatch, with the compiled fast path
+        when the model was exported with one, otherwise with the sklearn preprocessing_object
+        """
+        # models pickled before the fast path existed have no such attribute
+        fast_preprocessing_object = getattr(self, "fast_preprocessing_object", None)
+        if isinstance(dataframe, USvisaBatch):
+            if fast_preprocessing_object is not None:
+                return fast_preprocessing_object.transform_batch(dataframe)
+            dataframe = dataframe.to_dataframe()
+        if fast_preprocessing_object is not None:
+            return fast_preprocessing_object.transform(dataframe)
+        return self.preprocessing_object.transform(dataframe)
 
     def predict(self, dataframe: DataFrame) -> DataFrame:
         """
@@ -33,15 +58,48 @@ class USvisaModel:
         which guarantees that the inputs are in the same format as the training data
         At last it performs prediction on transformed features
         """
-        logging.info("Entered predict method of UTruckModel class")
+        hot_path_logger.info("Entered predict method of UTruckModel class")
+
+        try:
+            hot_path_logger.info("Using the trained model to get predictions")
+
+            with metrics.timer("transform"):
+                transformed_feature = self.transform(dataframe)
+
+            hot_path_logger.info("Used the trained model to get predictions")
+            with metrics.timer("estimator"):
+                return self.trained_model_object.predict(transformed_feature)
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def predict_with_proba(self, dataframe: DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Function transforms the whole batch once and returns both predicted labels and
+        the probability of the Certified class for every row
+        """
+        hot_path_logger.info("Entered predict_with_proba method of USvisaModel class")
 
         try:
-            logging.info("Using the trained model to get predictions")
+            with metrics.timer("transform"):
+                transformed_feature = self.transform(dataframe)
+
+            if not hasattr(self.trained_model_object, "predict_proba"):
+                with metrics.timer("estimator"):
+                    labels = self.trained_model_object.predict(transformed_feature)
+                return labels, np.asarray(labels, dtype=float)
+
+            with metrics.timer("estimator"):
+                proba = self.trained_model_object.predict_proba(transformed_feature)
+            classes = self.trained_model_object.classes_
+            labels = classes[np.argmax(proba, axis=1)]
 
-            transformed_feature = self.preprocessing_object.transform(dataframe)
+            certified = TargetValueMapping().Certified
+            certified_idx = np.flatnonzero(classes == certified)
+            certified_proba = proba[:, certified_idx[0]] if len(certified_idx) else np.zeros(len(proba))
 
-            logging.info("Used the trained model to get predictions")
-            return self.trained_model_object.predict(transformed_feature)
+            hot_path_logger.info("Exited predict_with_proba method of USvisaModel class")
+            return labels, certified_proba
 
         except Exception as e:
             raise USvisaException(e, sys) from e
@@ -0,0 +1,272 @@
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, PowerTransformer, StandardScaler
+
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+
+
+def _unwrap(transformer: object) -> object:
+    # single step pipelines such as Pipeline([('transformer', PowerTransformer())]) are compiled as their step
+    while isinstance(transformer, Pipeline):
+        if len(transformer.steps) != 1:
+            raise ValueError(f"Only single step pipelines can be compiled, got {transformer}")
+        transformer = transformer.steps[0][1]
+    return transformer
+
+
+def _lookup(categories: np.ndarray, values: np.ndarray, column: str) -> np.ndarray:
+    """
+    Maps values to their index in the sorted categories array with a vectorized binary search
+    """
+    index = np.searchsorted(categories, values)
+    index = np.minimum(index, len(categories) - 1)
+    unknown = categories[index] != values
+    if unknown.any():
+        raise ValueError(f"Found unknown categories {sorted(set(values[unknown].tolist()))} "
+                         f"in column {column} during transform")
+    return index
+
+
+class FastPreprocessor:
+    """
+    This class is a compiled copy of the fitted ColumnTransformer built in DataTransformation.
+    Encoders are flattened into category tables and the power transform plus scalers into
+    lambda / mean / scale vectors, so serving runs a few numpy kernels instead of walking the
+    sklearn object graph for every batch
+    """
+
+    def __init__(self, feature_names_in: List[str]):
+        self.feature_names_in = list(feature_names_in)
+        self.n_features_out = 0
+        # (column index, sorted categories, output offset)
+        self.one_hot: List[Tuple[int, np.ndarray, int]] = []
+        self.ordinal: List[Tuple[int, np.ndarray, int]] = []
+        # yeo-johnson lambdas with its internal standardization
+        self.power_columns: Optional[np.ndarray] = None
+        self.power_offsets: Optional[np.ndarray] = None
+        self.power_lambdas: Optional[np.ndarray] = None
+        self.power_mean: Optional[np.ndarray] = None
+        self.power_scale: Optional[np.ndarray] = None
+        self.power_expm1_kernel: bool = True
+        # standard scaler
+        self.scale_columns: Optional[np.ndarray] = None
+        self.scale_offsets: Optional[np.ndarray] = None
+        self.scale_mean: Optional[np.ndarray] = None
+        self.scale_scale: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor: ColumnTransformer) -> "FastPreprocessor":
+        """
+        Method Name :   from_column_transformer
+        Description :   This method compiles a fitted ColumnTransformer into lookup tables and vectors
+
+        Output      :   Returns FastPreprocessor producing the same matrix as preprocessor.transform
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered from_column_transformer method of FastPreprocessor class")
+        try:
+            compiled = cls(feature_names_in=preprocessor.feature_names_in_)
+            position = {name: i for i, name in enumerate(compiled.feature_names_in)}
+            offset = 0
+
+            power, scale = [], []
+            for name, transformer, columns in preprocessor.transformers_:
+                if transformer == "drop" or name == "remainder":
+                    continue
+                transformer = _unwrap(transformer)
+                columns = list(columns)
+
+                if isinstance(transformer, OneHotEncoder):
+                    if transformer.drop is not None:
+                        raise ValueError("OneHotEncoder with drop is not supported")
+                    for column, categories in zip(columns, transformer.categories_):
+                        compiled.one_hot.append((position[column], np.asarray(categories, dtype=object), offset))
+                        offset += len(categories)
+
+                elif isinstance(transformer, OrdinalEncoder):
+                    for column, categories in zip(columns, transformer.categories_):
+                        compiled.ordinal.append((position[column], np.asarray(categories, dtype=object), offset))
+                        offset += 1
+
+                elif isinstance(transformer, PowerTransformer):
+                    if transformer.method != "yeo-johnson" or not transformer.standardize:
+                        raise ValueError("Only standardized yeo-johnson PowerTransformer is supported")
+                    power.append((columns, offset, transformer))
+                    offset += len(columns)
+
+                elif isinstance(transformer, StandardScaler):
+                    scale.append((columns, offset, transformer))
+                    offset += len(columns)
+
+                else:
+                    raise ValueError(f"Cannot compile transformer {name}: {type(transformer).__name__}")
+
+            if len(power) > 1 or len(scale) > 1:
+                raise ValueError("Only one PowerTransformer and one StandardScaler block are supported")
+
+            if power:
+                columns, start, transformer = power[0]
+                compiled.power_columns = np.array([position[c] for c in columns])
+                compiled.power_offsets = np.arange(start, start + len(columns))
+                compiled.power_lambdas = np.asarray(transformer.lambdas_, dtype=np.float64)
+                compiled.power_mean = np.asarray(transformer._scaler.mean_, dtype=np.float64)
+                compiled.power_scale = np.asarray(transformer._scaler.scale_, dtype=np.float64)
+                # older sklearn releases ship their own (x + 1) ** lambda kernel instead of scipy's expm1 form
+                compiled.power_expm1_kernel = not hasattr(PowerTransformer, "_yeo_johnson_transform")
+
+            if scale:
+                columns, start, transformer = scale[0]
+                compiled.scale_columns = np.array([position[c] for c in columns])
+                compiled.scale_offsets = np.arange(start, start + len(columns))
+                compiled.scale_mean = (np.asarray(transformer.mean_, dtype=np.float64)
+                                       if transformer.with_mean else None)
+                compiled.scale_scale = (np.asarray(transformer.scale_, dtype=np.float64)
+                                        if transformer.with_std else None)
+
+            compiled.n_features_out = offset
+            logging.info(f"Compiled preprocessor with {offset} output features")
+            return compiled
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def _yeo_johnson(self, x: np.ndarray) -> np.ndarray:
+        lmbda = self.power_lambdas
+        eps = np.finfo(np.float64).eps
+        pos = x >= 0
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            if self.power_expm1_kernel:
+                pos_out = np.where(np.abs(lmbda) < eps, np.log1p(x),
+                                   np.expm1(lmbda * np.log1p(x)) / lmbda)
+                neg_out = np.where(np.abs(lmbda - 2) > eps,
+                                   -np.expm1((2 - lmbda) * np.log1p(-x)) / (2 - lmbda),
+                                   -np.log1p(-x))
+            else:
+                pos_out = np.where(np.abs(lmbda) < eps, np.log1p(x),
+                                   (np.power(x + 1, lmbda) - 1) / lmbda)
+                neg_out = np.where(np.abs(lmbda - 2) > eps,
+                                   -(np.power(-x + 1, 2 - lmbda) - 1) / (2 - lmbda),
+                                   -np.log1p(-x))
+        return np.where(pos, pos_out, neg_out)
+
+    def transform_fast(self, X: np.ndarray) -> np.ndarray:
+        """
+        Method Name :   transform_fast
+        Description :   This method transforms raw rows whose columns follow feature_names_in
+
+        Output      :   Returns float64 matrix matching the sklearn ColumnTransformer output
+        On Failure  :   Raises ValueError on unknown categories like the sklearn encoders
+        """
+        X = np.asarray(X, dtype=object)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names_in):
+            raise ValueError(f"Expected 2D input with {len(self.feature_names_in)} columns, got shape {X.shape}")
+
+        n_rows = X.shape[0]
+        out = np.zeros((n_rows, self.n_features_out), dtype=np.float64)
+        rows = np.arange(n_rows)
+
+        for column, categories, offset in self.one_hot:
+            index = _lookup(categories, X[:, column], self.feature_names_in[column])
+            out[rows, offset + index] = 1.0
+
+        for column, categories, offset in self.ordinal:
+            out[:, offset] = _lookup(categories, X[:, column], self.feature_names_in[column])
+
+        if self.power_columns is not None:
+            x = X[:, self.power_columns].astype(np.float64)
+            x = self._yeo_johnson(x)
+            x -= self.power_mean
+            x /= self.power_scale
+            out[:, self.power_offsets] = x
+
+        if self.scale_columns is not None:
+            x = X[:, self.scale_columns].astype(np.float64)
+            if self.scale_mean is not None:
+                x -= self.scale_mean
+            if self.scale_scale is not None:
+                x /= self.scale_scale
+            out[:, self.scale_offsets] = x
+
+        return out
+
+    def transform(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Drop-in replacement for ColumnTransformer.transform on a raw input DataFrame
+        """
+        return self.transform_fast(dataframe[self.feature_names_in].to_numpy(dtype=object))
+
+    def _batch_index(self, batch, column: int, categories: np.ndarray) -> np.ndarray:
+        name = self.feature_names_in[column]
+        codes = batch.codes(name)
+        if (codes < 0).any():
+            raise ValueError(f"Found missing values in column {name} during transform")
+        # only the vocabulary is searched, rows are then gathered by code
+        return _lookup(categories, batch.categories(name), name)[codes]
+
+    def _batch_numeric(self, batch, columns: np.ndarray) -> np.ndarray:
+        return np.column_stack([batch.numeric(self.feature_names_in[column]) for column in columns])
+
+    def transform_batch(self, batch) -> np.ndarray:
+        """
+        Method Name :   transform_batch
+        Description :   This method transforms a columnar USvisaBatch without materializing an object matrix
+
+        Output      :   Returns float64 matrix equal to transform_fast on the same rows
+        On Failure  :   Raises ValueError on unknown categories like the sklearn encoders
+        """
+        n_rows = len(batch)
+        out = np.zeros((n_rows, self.n_features_out), dtype=np.float64)
+        rows = np.arange(n_rows)
+
+        for column, categories, offset in self.one_hot:
+            out[rows, offset + self._batch_index(batch, column, categories)] = 1.0
+
+        for column, categories, offset in self.ordinal:
+            out[:, offset] = self._batch_index(batch, column, categories)
+
+        if self.power_columns is not None:
+            x = self._yeo_johnson(self._batch_numeric(batch, self.power_columns))
+            x -= self.power_mean
+            x /= self.power_scale
+            out[:, self.power_offsets] = x
+
+        if self.scale_columns is not None:
+            x = self._batch_numeric(batch, self.scale_columns)
+            if self.scale_mean is not None:
+                x -= self.scale_mean
+            if self.scale_scale is not None:
+                x /= self.scale_scale
+            out[:, self.scale_offsets] = x
+
+        return out
+
+    def verify(self, preprocessor: ColumnTransformer, dataframe: DataFrame) -> None:
+        """
+        Method Name :   verify
+        Description :   This method checks transform_fast is bit for bit equal to preprocessor.transform
+
+        On Failure  :   Raises an exception describing the first mismatching column
+        """
+        try:
+            expected = preprocessor.transform(dataframe)
+            if hasattr(expected, "toarray"):
+                expected = expected.toarray()
+            expected = np.asarray(expected, dtype=np.float64)
+            actual = self.transform(dataframe)
+
+            if expected.shape != actual.shape:
+                raise ValueError(f"Shape mismatch: sklearn {expected.shape} vs fast {actual.shape}")
+            mismatch = expected.view(np.uint64) != actual.view(np.uint64)
+            if mismatch.any():
+                row, column = np.argwhere(mismatch)[0]
+                raise ValueError(f"Output column {column} differs at row {row}: "
+                                 f"sklearn {expected[row, column]!r} vs fast {actual[row, column]!r}")
+            logging.info(f"Verified compiled preprocessor on {len(dataframe)} rows")
+        except Exception as e:
+            raise USvisaException(e, sys) from e
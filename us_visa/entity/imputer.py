@@ -0,0 +1,61 @@
+import sys
+from typing import Dict, Iterable, Union
+
+import pandas as pd
+from pandas import DataFrame
+
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+
+
+class MissingValueImputer:
+    """
+    This class learns one fill value per input column from the training split (mode for
+    categorical, median for numeric columns) and fills a whole batch in a single pass, a
+    DataFrame with one fillna call or a USvisaBatch with one masked assignment per column
+    """
+
+    def __init__(self, fill_values: Dict[str, object] = None):
+        """
+        :param fill_values: Known fill values per column, learned by fit when not given
+        """
+        self.fill_values: Dict[str, object] = dict(fill_values or {})
+
+    def fit(self, dataframe: DataFrame, categorical_columns: Iterable[str],
+            numeric_columns: Iterable[str]) -> "MissingValueImputer":
+        """
+        Method Name :   fit
+        Description :   This method learns the mode of categorical_columns and median of numeric_columns
+
+        Output      :   Returns self with fill_values set
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            fill_values = {}
+            for column in categorical_columns:
+                modes = dataframe[column].mode(dropna=True)
+                # ties resolve to the first value in sorted order, so fits are reproducible
+                fill_values[column] = modes.iloc[0]
+            for column in numeric_columns:
+                fill_values[column] = float(pd.to_numeric(dataframe[column], errors="coerce").median())
+            self.fill_values = fill_values
+            logging.info(f"Learned missing value fill values: {fill_values}")
+            return self
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def transform(self, data: Union[DataFrame, USvisaBatch]) -> Union[DataFrame, USvisaBatch]:
+        """
+        Fills missing values of every known column; a DataFrame is returned as a new frame,
+        a USvisaBatch is filled in place
+        """
+        if isinstance(data, USvisaBatch):
+            return data.fill_missing(self.fill_values)
+        columns = {column: value for column, value in self.fill_values.items() if column in data.columns}
+        if not any(data[column].hasnans for column in columns):
+            return data
+        return data.fillna(columns)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.fill_values})"
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from typing import List, Optional
+
+from us_visa.entity.config_entity import ModelRegistryConfig
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.utils.main_utils import get_file_digest
+
+MODEL_STATUS_TRAINED = "trained"
+MODEL_STATUS_PROMOTED = "promoted"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    version TEXT PRIMARY KEY,
+    model_path TEXT NOT NULL,
+    bundle_path TEXT,
+    size_bytes INTEGER NOT NULL,
+    f1_score REAL,
+    precision_score REAL,
+    recall_score REAL,
+    run_timestamp TEXT,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    promoted_at REAL
+);
+CREATE TABLE IF NOT EXISTS pointers (
+    name TEXT PRIMARY KEY,
+    version TEXT NOT NULL REFERENCES models(version),
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS models_model_path ON models (model_path);
+CREATE INDEX IF NOT EXISTS models_bundle_path ON models (bundle_path);
+"""
+
+
+class ModelRegistry:
+    """
+    This class is a local SQLite index of trained models: version, metrics, size and path of
+    every run, plus named pointers ("current") to the promoted model, so serving looks the
+    model up by key instead of scanning timestamped artifact directories
+    """
+
+    def __init__(self, model_registry_config: ModelRegistryConfig = ModelRegistryConfig()):
+        """
+        :param model_registry_config: Configuration holding the registry database path
+        """
+        self.model_registry_config = model_registry_config
+        self.registry_file_path = model_registry_config.registry_file_path
+
+    def _connect(self) -> sqlite3.Connection:
+        registry_dir = os.path.dirname(self.registry_file_path)
+        if registry_dir:
+            os.makedirs(registry_dir, exist_ok=True)
+        connection = sqlite3.connect(self.registry_file_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.executescript(_SCHEMA)
+        return connection
+
+    @staticmethod
+    def get_model_version(model_path: str) -> str:
+        return get_file_digest(model_path)[:12]
+
+    def register_model(self, model_path: str, bundle_path: Optional[str] = None, metric_artifact=None,
+                       run_timestamp: Optional[str] = None) -> str:
+        """
+        Method Name :   register_model
+        Description :   This method records a trained model file in the registry
+
+        Output      :   Returns the model version, the digest of model_path
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            version = self.get_model_version(model_path)
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO models (version, model_path, bundle_path, size_bytes, f1_score, "
+                    "precision_score, recall_score, run_timestamp, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (version, model_path, bundle_path, os.path.getsize(model_path),
+                     getattr(metric_artifact, "f1_score", None),
+                     getattr(metric_artifact, "precision_score", None),
+                     getattr(metric_artifact, "recall_score", None),
+                     run_timestamp, MODEL_STATUS_TRAINED, time.time()))
+            logging.info(f"Registered model version [{version}] from [{model_path}]")
+            return version
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def promote(self, version: str, pointer: Optional[str] = None) -> None:
+        """
+        Method Name :   promote
+        Description :   This method moves the pointer (default "current") to version
+
+        Output      :   None
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            pointer = pointer or self.model_registry_config.current_pointer
+            now = time.time()
+            with closing(self._connect()) as connection, connection:
+                updated = connection.execute("UPDATE models SET status = ?, promoted_at = ? WHERE version = ?",
+                                             (MODEL_STATUS_PROMOTED, now, version)).rowcount
+                if updated == 0:
+                    raise KeyError(f"Model version [{version}] is not registered")
+                connection.execute("INSERT OR REPLACE INTO pointers (name, version, updated_at) VALUES (?, ?, ?)",
+                                   (pointer, version, now))
+            logging.info(f"Promoted model version [{version}] to [{pointer}]")
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def get_model(self, version: str) -> Optional[dict]:
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT * FROM models WHERE version = ?", (version,)).fetchone()
+        return None if row is None else dict(row)
+
+    def find_by_path(self, path: str) -> Optional[dict]:
+        """
+        :return: Registry row whose model file or bundle is at path, None when path is not registered
+        """
+        if not os.path.exists(self.registry_file_path):
+            return None
+        # paths are stored as registered, relative to the project root or absolute
+        absolute_path = os.path.abspath(path)
+        paths = sorted({path, absolute_path, os.path.relpath(absolute_path)})
+        placeholders = ", ".join("?" * len(paths))
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                f"SELECT * FROM models WHERE model_path IN ({placeholders}) OR bundle_path IN ({placeholders}) "
+                "ORDER BY created_at DESC LIMIT 1", paths + paths).fetchone()
+        return None if row is None else dict(row)
+
+    def get_current(self, pointer: Optional[str] = None) -> Optional[dict]:
+        """
+        :return: Registry row of the model the pointer refers to, None when nothing was promoted
+        """
+        pointer = pointer or self.model_registry_config.current_pointer
+        if not os.path.exists(self.registry_file_path):
+            return None
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT models.* FROM pointers JOIN models ON models.version = pointers.version "
+                "WHERE pointers.name = ?", (pointer,)).fetchone()
+        return None if row is None else dict(row)
+
+    def list_models(self, limit: int = 20) -> List[dict]:
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM models ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def get_serving_path(model: dict) -> str:
+    """
+    Path to load a registry row from, preferring its memory mapped bundle
+    """
+    if model["bundle_path"] and os.path.isdir(model["bundle_path"]):
+        return model["bundle_path"]
+    return model["model_path"]
+
+
+def resolve_model_path(model_registry_config: ModelRegistryConfig = ModelRegistryConfig()) -> str:
+    """
+    Method Name :   resolve_model_path
+    Description :   This method returns the path of the promoted model, preferring its memory mapped bundle.
+                    Only models ModelEvaluation accepted are promoted, so a trained but unvetted run is never served
+
+    Output      :   Returns the model path to serve
+    On Failure  :   Raises FileNotFoundError when the registry has no promoted model
+    """
+    current = ModelRegistry(model_registry_config).get_current()
+    if current is None:
+        raise FileNotFoundError(f"No promoted model in registry [{model_registry_config.registry_file_path}]; "
+                                f"run the training pipeline until a model is accepted, or pass a model path")
+    return get_serving_path(current)
@@ -0,0 +1,186 @@
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from us_visa.constants import MODEL_CATEGORICAL_INPUT_COLUMNS, MODEL_INPUT_COLUMNS, MODEL_NUMERIC_INPUT_COLUMNS
+
+MISSING_CODE = -1
+
+
+def _to_float(value: object) -> float:
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        value = value.strip()
+        return float(value) if value else math.nan
+    return float(value)
+
+
+class USvisaBatch:
+    """
+    This class accumulates applicant records straight into typed columns: every categorical
+    column as int32 codes into its own vocabulary and every numeric column as float64 (NaN for
+    missing, so whole number columns are float too). The predictor reads the columns directly,
+    no per-row dicts or DataFrame are built on the way
+    """
+
+    def __init__(self, capacity: int = 8):
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self._codes: Dict[str, np.ndarray] = {column: np.full(self._capacity, MISSING_CODE, dtype=np.int32)
+                                              for column in MODEL_CATEGORICAL_INPUT_COLUMNS}
+        self._vocab: Dict[str, Dict[str, int]] = {column: {} for column in MODEL_CATEGORICAL_INPUT_COLUMNS}
+        self._numeric: Dict[str, np.ndarray] = {column: np.full(self._capacity, np.nan, dtype=np.float64)
+                                                for column in MODEL_NUMERIC_INPUT_COLUMNS}
+
+    @classmethod
+    def from_records(cls, records: Sequence[object]) -> "USvisaBatch":
+        """
+        :param records: USvisaData, pydantic USvisaRecord or any object with the model input attributes
+        """
+        batch = cls(capacity=len(records))
+        for record in records:
+            batch.append(record)
+        return batch
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for column, codes in self._codes.items():
+            grown = np.full(self._capacity, MISSING_CODE, dtype=np.int32)
+            grown[:self._size] = codes[:self._size]
+            self._codes[column] = grown
+        for column, values in self._numeric.items():
+            grown = np.full(self._capacity, np.nan, dtype=np.float64)
+            grown[:self._size] = values[:self._size]
+            self._numeric[column] = grown
+
+    def _intern(self, column: str, value: str) -> int:
+        vocab = self._vocab[column]
+        code = vocab.get(value)
+        if code is None:
+            code = vocab[value] = len(vocab)
+        return code
+
+    def append(self, record: object) -> None:
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        for column in MODEL_CATEGORICAL_INPUT_COLUMNS:
+            value = getattr(record, column, None)
+            if value is not None and value != "":
+                self._codes[column][row] = self._intern(column, value)
+        for column in MODEL_NUMERIC_INPUT_COLUMNS:
+            self._numeric[column][row] = _to_float(getattr(record, column, None))
+        self._size += 1
+
+    def codes(self, column: str) -> np.ndarray:
+        return self._codes[column][:self._size]
+
+    def categories(self, column: str) -> np.ndarray:
+        """
+        :return: Vocabulary of column as an object array, position i holding the value of code i
+        """
+        categories = np.empty(len(self._vocab[column]), dtype=object)
+        for value, code in self._vocab[column].items():
+            categories[code] = value
+        return categories
+
+    def numeric(self, column: str) -> np.ndarray:
+        return self._numeric[column][:self._size]
+
+    def column_values(self, column: str) -> np.ndarray:
+        """
+        Decoded values of one column, None (categorical) or NaN (numeric) where missing
+        """
+        if column in self._numeric:
+            return self.numeric(column)
+        codes = self.codes(column)
+        values = np.append(self.categories(column), None)
+        # the MISSING_CODE -1 indexes the trailing None
+        return values[codes]
+
+    def fill_missing(self, fill_values: Dict[str, object]) -> "USvisaBatch":
+        """
+        Replaces missing entries in place with one vectorized assignment per column
+        """
+        for column, value in fill_values.items():
+            if column in self._codes:
+                codes = self.codes(column)
+                missing = codes == MISSING_CODE
+                if missing.any():
+                    codes[missing] = self._intern(column, value)
+            elif column in self._numeric:
+                values = self.numeric(column)
+                missing = np.isnan(values)
+                if missing.any():
+                    values[missing] = float(value)
+        return self
+
+    def take(self, indices: Sequence[int]) -> "USvisaBatch":
+        """
+        New batch holding the rows at indices; vocabularies keep only the values those rows use, so
+        an unknown category in a row left out cannot fail the subset
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        subset = USvisaBatch(capacity=len(indices))
+        subset._size = len(indices)
+        for column in MODEL_CATEGORICAL_INPUT_COLUMNS:
+            codes = self.codes(column)[indices]
+            categories = self.categories(column)
+            used = np.unique(codes[codes != MISSING_CODE])
+            # one extra slot maps MISSING_CODE, the last index, back to MISSING_CODE
+            remap = np.full(len(categories) + 1, MISSING_CODE, dtype=np.int32)
+            remap[used] = np.arange(len(used), dtype=np.int32)
+            subset._codes[column][:len(indices)] = remap[codes]
+            subset._vocab[column] = {categories[code]: i for i, code in enumerate(used.tolist())}
+        for column in MODEL_NUMERIC_INPUT_COLUMNS:
+            subset._numeric[column][:len(indices)] = self.numeric(column)[indices]
+        return subset
+
+    @classmethod
+    def concat(cls, batches: List["USvisaBatch"]) -> "USvisaBatch":
+        """
+        Joins batches into one, remapping every batch's codes onto a merged vocabulary
+        """
+        merged = cls(capacity=sum(len(batch) for batch in batches))
+        start = 0
+        for batch in batches:
+            stop = start + len(batch)
+            for column in MODEL_CATEGORICAL_INPUT_COLUMNS:
+                categories = batch.categories(column)
+                # one extra slot maps MISSING_CODE, the last index, back to MISSING_CODE
+                remap = np.array([merged._intern(column, value) for value in categories] + [MISSING_CODE],
+                                 dtype=np.int32)
+                merged._codes[column][start:stop] = remap[batch.codes(column)]
+            for column in MODEL_NUMERIC_INPUT_COLUMNS:
+                merged._numeric[column][start:stop] = batch.numeric(column)
+            start = stop
+        merged._size = start
+        return merged
+
+    def rows(self) -> Iterator[Tuple]:
+        """
+        Yields one tuple per row in MODEL_INPUT_COLUMNS order, e.g. for prediction cache keys
+        """
+        columns = [self.column_values(column).tolist() for column in MODEL_INPUT_COLUMNS]
+        return zip(*columns)
+
+    def to_dataframe(self, columns: Optional[Iterable[str]] = None) -> DataFrame:
+        """
+        Decoded frame for the sklearn preprocessor fallback, built column by column
+        """
+        return DataFrame({column: self.column_values(column) for column in (columns or MODEL_INPUT_COLUMNS)})
+
+
+def take_rows(data: Union[DataFrame, USvisaBatch], indices: Sequence[int]) -> Union[DataFrame, USvisaBatch]:
+    """
+    Rows at indices of either input type, renumbered from zero
+    """
+    if isinstance(data, USvisaBatch):
+        return data.take(indices)
+    return data.iloc[list(indices)].reset_index(drop=True)
@@ -1,5 +1,10 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+from collections import defaultdict
 
 from from_root import from_root
 from datetime import datetime
@@ -10,11 +15,110 @@ log_dir = 'logs'
 
 logs_path = os.path.join(from_root(), log_dir, LOG_FILE)
 
-os.makedirs(log_dir, exist_ok=True)
+os.makedirs(os.path.dirname(logs_path), exist_ok=True)
 
+LOG_FORMAT = "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s"
+
+# USVISA_LOG_LEVEL sets the root level, USVISA_LOG_LEVELS overrides single loggers,
+# e.g. "us_visa.hot_path=WARNING,botocore=INFO"
+LOG_LEVEL_ENV_KEY = "USVISA_LOG_LEVEL"
+LOG_LEVELS_ENV_KEY = "USVISA_LOG_LEVELS"
+# only one in this many INFO/DEBUG records of the same message template is kept on the hot path
+LOG_HOT_PATH_SAMPLE_EVERY_ENV_KEY = "USVISA_LOG_HOT_PATH_SAMPLE_EVERY"
+LOG_FRAME_MAX_ROWS = 5
+LOG_FRAME_MAX_CHARS = 1000
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps the first and then every n-th INFO/DEBUG record per message template; warnings and
+    errors always pass
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.every == 1:
+            return True
+        with self._lock:
+            count = self._counts[record.msg]
+            self._counts[record.msg] = count + 1
+        return count % self.every == 0
+
+
+def _configure_levels() -> None:
+    logging.getLogger().setLevel(os.getenv(LOG_LEVEL_ENV_KEY, "DEBUG").upper())
+    for item in os.getenv(LOG_LEVELS_ENV_KEY, "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+# Records are put on an in-memory queue by the calling thread and written to the file by a
+# background listener thread, so request handlers never wait on disk I/O
+log_queue: queue.Queue = queue.Queue(-1)
+file_handler = logging.FileHandler(logs_path)
+file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+queue_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+# the queue handler only merges args into the message, the file handler applies LOG_FORMAT
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
 logging.basicConfig(
-    filename=logs_path,
-    format="[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s",
+    handlers=[queue_handler],
     level=logging.DEBUG,
-)
\ No newline at end of file
+)
+_configure_levels()
+queue_listener.start()
+atexit.register(lambda: queue_listener.stop())
+
+
+def _restart_listener_in_child() -> None:
+    # forked workers (process pools, pre-fork server) do not inherit the writer thread; records the
+    # parent had queued are copied too, so the child starts on a fresh queue instead of writing them twice
+    global log_queue, queue_listener
+    log_queue = queue.Queue(-1)
+    queue_handler.queue = log_queue
+    queue_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    queue_listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+hot_path_logger = logging.getLogger("us_visa.hot_path")
+hot_path_logger.addFilter(SamplingFilter(int(os.getenv(LOG_HOT_PATH_SAMPLE_EVERY_ENV_KEY, "100"))))
+
+
+def frame_summary(df, max_rows: int = LOG_FRAME_MAX_ROWS, max_chars: int = LOG_FRAME_MAX_CHARS) -> dict:
+    """
+    Size bounded description of a DataFrame (or USvisaBatch) for log records instead of printing the whole frame
+    """
+    if not hasattr(df, "head"):
+        rows = len(df)
+        df = df.take(range(min(rows, max_rows))).to_dataframe()
+        return {"rows": rows, "columns": len(df.columns), "head": str(df.to_dict(orient="records"))[:max_chars]}
+    head = df.head(max_rows).to_dict(orient="records")
+    head_text = str(head)
+    if len(head_text) > max_chars:
+        head_text = head_text[:max_chars] + "..."
+    return {"rows": len(df), "columns": len(df.columns), "head": head_text}
+
+
+class LazyFrameSummary:
+    """
+    Log argument that builds the frame_summary of df only when the record is formatted, so
+    records dropped by the level check or the sampling filter cost nothing
+    """
+    __slots__ = ("df", "max_rows", "max_chars")
+
+    def __init__(self, df, max_rows: int = LOG_FRAME_MAX_ROWS, max_chars: int = LOG_FRAME_MAX_CHARS):
+        self.df = df
+        self.max_rows = max_rows
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        return str(frame_summary(self.df, self.max_rows, self.max_chars))
@@ -0,0 +1,228 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from us_visa.constants import MODEL_INPUT_COLUMNS
+from us_visa.entity.config_entity import BatchPredictionConfig, ModelRegistryConfig
+from us_visa.entity.estimator import TargetValueMapping
+from us_visa.entity.model_registry import resolve_model_path
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+from us_visa.utils.main_utils import add_company_age
+from us_visa.utils.model_bundle import load_model_file
+
+ID_COLUMN = "case_id"
+
+
+def prepare_feature_chunk(chunk: DataFrame) -> DataFrame:
+    """
+    Derives company_age from yr_of_estab when the raw dataset column is given and
+    returns only the model input columns
+    """
+    try:
+        if "company_age" not in chunk.columns and "yr_of_estab" in chunk.columns:
+            chunk = add_company_age(chunk)
+        missing = [column for column in MODEL_INPUT_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Input is missing required columns: {missing}")
+        return chunk[list(MODEL_INPUT_COLUMNS)].copy()
+    except Exception as e:
+        raise USvisaException(e, sys) from e
+
+
+def read_csv_feature_chunks(source: Union[str, IO], chunk_size: int) -> Iterator[Tuple[DataFrame, DataFrame]]:
+    """
+    Reads a dataset shaped like notebook/Visadataset.csv chunk by chunk so memory stays bounded
+    :return: iterator of (raw chunk, model input features) pairs
+    """
+    for chunk in pd.read_csv(source, chunksize=chunk_size):
+        yield chunk, prepare_feature_chunk(chunk)
+
+
+def format_predictions(chunk: DataFrame, labels: np.ndarray, probabilities: np.ndarray) -> DataFrame:
+    """
+    Builds the output rows of a scored chunk: case_id when present, label code, label name and
+    probability of approval
+    """
+    label_names = TargetValueMapping().reverse_mapping()
+    output = DataFrame({
+        "prediction": np.asarray(labels).astype(int),
+        "label": [label_names.get(int(label), str(label)) for label in labels],
+        "probability": np.asarray(probabilities, dtype=np.float64),
+    })
+    if ID_COLUMN in chunk.columns:
+        output.insert(0, ID_COLUMN, chunk[ID_COLUMN].to_numpy())
+    return output
+
+
+def read_parquet_chunks(file_path: str, chunk_size: int) -> Iterator[DataFrame]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+    for record_batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield record_batch.to_pandas()
+
+
+def read_feature_chunks(file_path: str, chunk_size: int) -> Iterator[Tuple[DataFrame, DataFrame]]:
+    """
+    Reads a CSV or Parquet dataset chunk by chunk
+    :return: iterator of (raw chunk, model input features) pairs
+    """
+    if file_path.endswith(".parquet"):
+        for chunk in read_parquet_chunks(file_path, chunk_size):
+            yield chunk, prepare_feature_chunk(chunk)
+    else:
+        yield from read_csv_feature_chunks(file_path, chunk_size)
+
+
+# ---------- process pool worker side ----------
+_worker_classifier: Optional[USvisaClassifier] = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_classifier
+    _worker_classifier = USvisaClassifier(model_path=model_path, model=load_model_file(model_path))
+
+
+def _score_chunk(features: DataFrame) -> DataFrame:
+    # only the model inputs cross the process boundary; case_id is attached by the parent
+    labels, probabilities = _worker_classifier.predict_batch(features)
+    return format_predictions(features, labels, probabilities)
+
+
+class PredictionWriter:
+    """
+    Appends scored chunks to a Parquet file (or CSV when the output path ends in .csv)
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._parquet_writer = None
+        self._header = True
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+
+    def write(self, predictions: DataFrame) -> None:
+        if self.file_path.endswith(".csv"):
+            predictions.to_csv(self.file_path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(predictions, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.file_path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+class BatchPredictionPipeline:
+    """
+    This class scores a whole dataset offline: chunks are read in order, scored on a pool of
+    worker processes that each load the model once, and written back in input order
+    """
+
+    def __init__(self, batch_prediction_config: BatchPredictionConfig = BatchPredictionConfig()):
+        """
+        :param batch_prediction_config: Configuration for model path, chunk size and workers
+        """
+        self.batch_prediction_config = batch_prediction_config
+
+    def run_pipeline(self, input_file_path: str, output_file_path: str) -> dict:
+        """
+        Method Name :   run_pipeline
+        Description :   This method scores input_file_path into output_file_path
+
+        Output      :   Returns a report with rows, chunks, seconds and rows per second
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered run_pipeline method of BatchPredictionPipeline class")
+        config = self.batch_prediction_config
+        try:
+            start = time.perf_counter()
+            rows, chunks = 0, 0
+            writer = PredictionWriter(output_file_path)
+            # at most two chunks per worker are read ahead, so memory stays bounded for any input size
+            max_pending = 2 * config.workers
+            model_path = config.model_file_path or resolve_model_path(
+                ModelRegistryConfig(registry_file_path=config.model_registry_file_path))
+
+            with ProcessPoolExecutor(max_workers=config.workers, initializer=_init_worker,
+                                     initargs=(model_path,)) as executor:
+                pending = deque()
+
+                def drain_one():
+                    nonlocal rows, chunks
+                    ids, future = pending.popleft()
+                    predictions = future.result()
+                    if ids is not None:
+                        predictions.insert(0, ID_COLUMN, ids)
+                    writer.write(predictions)
+                    rows += len(predictions)
+                    chunks += 1
+                    elapsed = time.perf_counter() - start
+                    logging.info(f"Scored {rows} rows in {chunks} chunks, {rows / max(elapsed, 1e-9):.0f} rows/sec")
+
+                try:
+                    for chunk, features in read_feature_chunks(input_file_path, config.chunk_size):
+                        if features.empty:
+                            continue
+                        ids = chunk[ID_COLUMN].to_numpy() if ID_COLUMN in chunk.columns else None
+                        pending.append((ids, executor.submit(_score_chunk, features)))
+                        if len(pending) >= max_pending:
+                            drain_one()
+                    while pending:
+                        drain_one()
+                    if chunks == 0:
+                        # an input without rows still gets the output file the report names
+                        writer.write(format_predictions(DataFrame(), np.empty(0, dtype=int), np.empty(0)))
+                finally:
+                    writer.close()
+
+            elapsed = time.perf_counter() - start
+            report = {
+                "input": input_file_path,
+                "output": output_file_path,
+                "rows": rows,
+                "chunks": chunks,
+                "workers": config.workers,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(rows / max(elapsed, 1e-9), 1),
+            }
+            logging.info(f"Batch prediction report: {report}")
+            return report
+
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+
+def main(argv=None) -> None:
+    defaults = BatchPredictionConfig()
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet dataset with the trained US visa model")
+    parser.add_argument("--input", required=True, help="CSV or .parquet file shaped like notebook/Visadataset.csv")
+    parser.add_argument("--output", required=True, help="Output .parquet file (or .csv)")
+    parser.add_argument("--model", default=defaults.model_file_path, help="Path of the trained model.pkl or model bundle, defaults to the registry's current model")
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size)
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    args = parser.parse_args(argv)
+
+    config = BatchPredictionConfig(model_file_path=args.model, chunk_size=args.chunk_size, workers=args.workers)
+    report = BatchPredictionPipeline(batch_prediction_config=config).run_pipeline(args.input, args.output)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
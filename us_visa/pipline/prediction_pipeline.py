@@ -1,13 +1,41 @@
 import os
 import sys
 import pickle
+from typing import Optional, Tuple, Union
+
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from us_visa.exception import USvisaException
-from us_visa.logger import logging
+from us_visa.logger import hot_path_logger, LazyFrameSummary
+from us_visa.constants import MODEL_INPUT_COLUMNS
+from us_visa.entity.model_registry import resolve_model_path
+from us_visa.entity.imputer import MissingValueImputer
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.utils.metrics import metrics
+from us_visa.utils.model_bundle import is_model_bundle, load_model_bundle
+
+# fill values for models saved before imputation values were learned in DataTransformation; categories
+# must be in the vocabulary the encoders were fitted on and numeric columns need numbers
+MISSING_VALUE_DEFAULTS = {
+    "continent": "Asia",
+    "education_of_employee": "Bachelor's",
+    "has_job_experience": "Y",
+    "requires_job_training": "N",
+    "no_of_employees": 2109,
+    "region_of_employment": "Northeast",
+    "prevailing_wage": 50000,
+    "unit_of_wage": "Year",
+    "full_time_position": "Y",
+    "company_age": 10,
+}
+_DEFAULT_IMPUTER = MissingValueImputer(fill_values=MISSING_VALUE_DEFAULTS)
 
 # ---------- USvisaData Class ----------
 class USvisaData:
+    # one applicant record; slots keep it a small fixed layout object, see USvisaBatch for many
+    __slots__ = MODEL_INPUT_COLUMNS
+
     def __init__(self,
                  continent,
                  education_of_employee,
@@ -51,6 +79,15 @@ class USvisaData:
         except Exception as e:
             raise USvisaException(e, sys) from e
 
+    def get_usvisa_input_batch(self) -> USvisaBatch:
+        """
+        Single row columnar batch for the predictor, no intermediate dict or DataFrame
+        """
+        try:
+            return USvisaBatch.from_records([self])
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
     def get_usvisa_input_data_frame(self) -> DataFrame:
         try:
             data_dict = self.get_usvisa_data_as_dict()
@@ -61,11 +98,22 @@ class USvisaData:
 # artifact/07_26_2025_16_33_46/model_trainer/trained_model/model.pkl
 # ---------- USvisaClassifier Class ----------
 class USvisaClassifier:
-    def __init__(self, model_path: str = "artifact/07_26_2025_16_33_46/model_trainer/trained_model/model.pkl") -> None:
+    def __init__(self, model_path: Optional[str] = None, model: object = None) -> None:
+        """
+        :param model_path: Location of the pickled USvisaModel or of a model bundle directory,
+                           defaults to the promoted model of the model registry
+        :param model: Already loaded USvisaModel, skips reading model_path when given
+        """
         try:
-            self.model_path = model_path
+            self.model_path = model_path if model_path is not None else resolve_model_path()
+            if model is not None:
+                self.model = model
+                return
             if not os.path.exists(self.model_path):
                 raise FileNotFoundError(f"Model file not found at {self.model_path}")
+            if is_model_bundle(self.model_path):
+                self.model = load_model_bundle(self.model_path)
+                return
             with open(self.model_path, "rb") as f:
                 self.model = pickle.load(f)
         except Exception as e:
@@ -73,7 +121,7 @@ class USvisaClassifier:
 ##prediction output 
     def predict(self, input_df: pd.DataFrame = None, dataframe: pd.DataFrame = None) -> str:
         try:
-            logging.info("Entered predict method of USvisaClassifier class")
+            hot_path_logger.info("Entered predict method of USvisaClassifier class")
 
             # Accept either input_df or dataframe
             if dataframe is not None:
@@ -82,30 +130,41 @@ class USvisaClassifier:
             if input_df is None:
                 raise ValueError("No input DataFrame provided for prediction.")
 
-            # Fill missing values
-            input_df["continent"] = input_df["continent"].fillna("Asia")
-            input_df["education_of_employee"] = input_df["education_of_employee"].fillna("Bachelor's")
-            input_df["has_job_experience"] = input_df["has_job_experience"].fillna("YES")
-            input_df["requires_job_training"] = input_df["requires_job_training"].fillna("NO")
-            input_df["no_of_employees"] = input_df["no_of_employees"].fillna("51-200")
-            input_df["region_of_employment"] = input_df["region_of_employment"].fillna("Northeast")
-            input_df["prevailing_wage"] = input_df["prevailing_wage"].fillna(50000)
-            input_df["unit_of_wage"] = input_df["unit_of_wage"].fillna("Year")
-            input_df["full_time_position"] = input_df["full_time_position"].fillna("Y")
-            input_df["company_age"] = input_df["company_age"].fillna(10)
-
-            # Debug (optional)
-            print("Input DataFrame:\n", input_df)
+            with metrics.timer("fillna"):
+                input_df = self.imputer.transform(input_df)
+
+            hot_path_logger.debug("Input DataFrame: %s", LazyFrameSummary(input_df))
 
             # Prediction
             prediction = self.model.predict(input_df)
-            print("Model Raw Prediction:", prediction)
+            hot_path_logger.debug("Model Raw Prediction: %s", prediction[:5])
 
             # return "Visa Approved ✅" if prediction[0] == 1 else "Visa Not Approved ❌"
             return "Visa Approved ✅" if int(round(prediction[0])) == 1 else "Visa Not Approved ❌"
         except Exception as e:
             raise USvisaException(e, sys) from e
 
+    def predict_batch(self, dataframe: Union[pd.DataFrame, USvisaBatch]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores every row of dataframe (a DataFrame or columnar USvisaBatch) with a single transform + predict call
+        :return: predicted labels and probability of approval, one entry per row
+        """
+        try:
+            hot_path_logger.info("Entered predict_batch method of USvisaClassifier class with %d rows", len(dataframe))
+            with metrics.timer("fillna"):
+                dataframe = self.imputer.transform(dataframe)
+            return self.model.predict_with_proba(dataframe)
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    @property
+    def imputer(self) -> MissingValueImputer:
+        """
+        Fill values learned with the model, the fixed defaults for models saved before that
+        """
+        imputer = getattr(self.model, "imputer_object", None)
+        return imputer if imputer is not None else _DEFAULT_IMPUTER
+
 
 
     
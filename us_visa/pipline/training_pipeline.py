@@ -1,4 +1,5 @@
 import sys
+from typing import Callable, Optional
 from us_visa.logger import logging 
 from us_visa.exception import USvisaException
 from us_visa.components.data_ingestion import DataIngestion
@@ -31,7 +32,7 @@ class TrainPipeline:
         self.data_transformation_config=DataTransformationConfig()
         self.model_trainer_config=ModelTrainerConfig()
         self.model_evaulation_config=ModelEvaluationConfig()
-        self.mode_pusher_config=ModelPusherConfig()
+        self.model_pusher_config=ModelPusherConfig()
 
 
     def start_data_ingestion(self) -> DataIngestionArtifacts:
@@ -149,23 +150,43 @@ class TrainPipeline:
 
 
     
-    def run_pipeline(self, ) -> None:
+    def run_pipeline(self, progress_callback: Optional[Callable[[str, str, object], None]] = None) -> None:
         """
         This method of TrainPipeline class is responsible for running complete pipeline
+        :param progress_callback: Optional, called as (stage, "started" / "completed" / "failed", artifact)
+                                  around every stage
         """
+        def run_stage(stage: str, func, **kwargs):
+            if progress_callback is not None:
+                progress_callback(stage, "started", None)
+            try:
+                artifact = func(**kwargs)
+            except Exception:
+                if progress_callback is not None:
+                    progress_callback(stage, "failed", None)
+                raise
+            if progress_callback is not None:
+                progress_callback(stage, "completed", artifact)
+            return artifact
+
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(
+            data_ingestion_artifact = run_stage("data_ingestion", self.start_data_ingestion)
+            data_validation_artifact = run_stage("data_validation", self.start_data_validation,
+                                                 data_ingestion_artifact=data_ingestion_artifact)
+            data_transformation_artifact = run_stage(
+                "data_transformation", self.start_data_transformation,
                 data_ingestion_artifact=data_ingestion_artifact, data_validation_artifact=data_validation_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
-            model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,
-                                                                    model_trainer_artifact=model_trainer_artifact)
+            model_trainer_artifact = run_stage("model_trainer", self.start_model_trainer,
+                                               data_transformation_artifact=data_transformation_artifact)
+            model_evaluation_artifact = run_stage("model_evaluation", self.start_model_evaluation,
+                                                  data_ingestion_artifact=data_ingestion_artifact,
+                                                  model_trainer_artifact=model_trainer_artifact)
             
             if not model_evaluation_artifact.is_model_accepted:
                 logging.info(f"Model not accepted.")
                 return None
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            model_pusher_artifact = run_stage("model_pusher", self.start_model_pusher,
+                                              model_evaluation_artifact=model_evaluation_artifact)
 
         except Exception as e:
             raise USvisaException(e, sys)
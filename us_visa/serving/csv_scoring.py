@@ -0,0 +1,36 @@
+import asyncio
+from typing import IO, AsyncIterator, Awaitable, Callable, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from us_visa.logger import logging
+from us_visa.pipline.batch_prediction import format_predictions, read_csv_feature_chunks
+
+
+async def stream_csv_predictions(source: IO, chunk_size: int,
+                                 predict_fn: Callable[[DataFrame], Awaitable[Tuple[np.ndarray, np.ndarray]]]
+                                 ) -> AsyncIterator[str]:
+    """
+    Parses the uploaded CSV chunk by chunk, scores each chunk with predict_fn and yields the
+    predictions as CSV text, so neither the input nor the output is ever fully in memory
+    """
+    reader = read_csv_feature_chunks(source, chunk_size=chunk_size)
+    rows = 0
+    header = True
+    try:
+        while True:
+            # pandas parsing is blocking, keep it off the event loop
+            item = await asyncio.to_thread(next, reader, None)
+            if item is None:
+                break
+            chunk, features = item
+            labels, probabilities = await predict_fn(features)
+            yield format_predictions(chunk, labels, probabilities).to_csv(index=False, header=header)
+            header = False
+            rows += len(chunk)
+    except Exception as e:
+        # the status line is already sent, so the error can only be logged and the stream cut short
+        logging.error(f"CSV scoring stopped after {rows} rows: {e}")
+        raise
+    logging.info(f"Streamed predictions for {rows} uploaded rows")
@@ -0,0 +1,143 @@
+import asyncio
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+from us_visa.serving.model_holder import ModelHolder
+
+
+class InferenceTimeoutError(Exception):
+    """
+    Raised when scoring a batch takes longer than the configured inference timeout
+    """
+
+
+# ---------- process pool worker side ----------
+_worker_classifier: Optional[USvisaClassifier] = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_classifier
+    _worker_classifier = USvisaClassifier(model_path=model_path)
+
+
+def _predict_in_worker(dataframe: DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    return _worker_classifier.predict_batch(dataframe)
+
+
+class InferenceExecutor:
+    """
+    This class runs CPU bound scoring off the asyncio event loop, either on a thread pool
+    (numpy / sklearn release the GIL for most of the work) or on a process pool whose workers
+    each preload the model once. In flight batches are bounded and every call has a timeout; a
+    batch keeps its slot until the pool has actually finished it, even after its caller timed out
+    """
+
+    def __init__(self, model_holder: ModelHolder, kind: str, max_workers: int, timeout_seconds: Optional[float]):
+        """
+        :param model_holder: Holder of the served model, used directly by threads and by path for processes
+        :param kind: "thread" or "process"
+        :param max_workers: Pool size, also the number of batches allowed in flight
+        :param timeout_seconds: Longest wait for one batch, queueing for a slot included, before
+                                InferenceTimeoutError, None to disable
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown inference executor kind: {kind}")
+        self.model_holder = model_holder
+        self.kind = kind
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                                 initargs=(self.model_holder.model_path,))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="usvisa-inference")
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        logging.info(f"Started {self.kind} inference executor with {self.max_workers} workers")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logging.info("Stopped inference executor")
+
+    async def predict_batch(self, dataframe: DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Method Name :   predict_batch
+        Description :   This method scores dataframe on the executor and awaits the result
+
+        Output      :   Returns labels and probabilities for every row
+        On Failure  :   Raises InferenceTimeoutError when timeout_seconds elapse, waiting for a slot included,
+                        otherwise the scoring error
+        """
+        if self._executor is None:
+            raise RuntimeError("Inference executor is not started")
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore
+        # waiting for a slot counts against the same timeout as the scoring itself
+        deadline = None if self.timeout_seconds is None else loop.time() + self.timeout_seconds
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.timeout_seconds)
+        except asyncio.TimeoutError as e:
+            self.timeouts += 1
+            logging.error(f"No inference slot for {len(dataframe)} rows within {self.timeout_seconds}s")
+            raise InferenceTimeoutError(f"Inference timed out after {self.timeout_seconds}s") from e
+        try:
+            if self.kind == "process":
+                future = loop.run_in_executor(self._executor, _predict_in_worker, dataframe)
+            else:
+                future = loop.run_in_executor(self._executor, self.model_holder.classifier.predict_batch, dataframe)
+        except BaseException:
+            semaphore.release()
+            raise
+        self.in_flight += 1
+        # a worker that is already scoring cannot be interrupted: the slot is given back when the
+        # work is done, not when the caller stops waiting, so timed out batches cannot pile up in the pool
+        future.add_done_callback(partial(self._release, semaphore))
+
+        try:
+            remaining = None if deadline is None else max(deadline - loop.time(), 0.0)
+            result = await asyncio.wait_for(asyncio.shield(future), remaining)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError as e:
+            self.timeouts += 1
+            logging.error(f"Inference of {len(dataframe)} rows timed out after {self.timeout_seconds}s")
+            raise InferenceTimeoutError(f"Inference timed out after {self.timeout_seconds}s") from e
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def _release(self, semaphore: asyncio.Semaphore, future: asyncio.Future) -> None:
+        self.in_flight -= 1
+        semaphore.release()
+        # nobody may be waiting for a timed out batch any more; reading its error keeps asyncio from logging it
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "timeout_seconds": self.timeout_seconds,
+        }
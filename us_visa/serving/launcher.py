@@ -0,0 +1,219 @@
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+import uvicorn
+
+from us_visa.entity.config_entity import ServingLauncherConfig
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.serving.model_holder import ModelHolder
+
+
+def read_memory_usage(pid: int) -> Dict[str, float]:
+    """
+    RSS of pid plus its proportional (PSS) and shared share from /proc, in MB. PSS splits shared
+    pages between the processes mapping them, so summing it over workers gives the real footprint.
+    Empty where /proc is not available
+    """
+    usage: Dict[str, float] = {}
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    usage["rss_mb"] = int(line.split()[1]) / 1024
+        shared_kb = 0
+        with open(f"/proc/{pid}/smaps_rollup") as smaps_file:
+            for line in smaps_file:
+                key, _, value = line.partition(":")
+                if key == "Pss":
+                    usage["pss_mb"] = int(value.split()[0]) / 1024
+                elif key in ("Shared_Clean", "Shared_Dirty"):
+                    shared_kb += int(value.split()[0])
+        usage["shared_mb"] = shared_kb / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return usage
+
+
+class ServingLauncher:
+    """
+    This class is a pre-fork server: the parent loads the model once, freezes the garbage collector
+    so the model objects are never written to again, binds one listening socket and forks the uvicorn
+    workers. The model pages stay copy-on-write shared between workers, the kernel spreads
+    connections over the shared socket, and the parent restarts workers that exit, with backoff,
+    until a worker crash loops max_worker_restarts times in a row
+    """
+
+    def __init__(self, app, model_holder: ModelHolder,
+                 serving_launcher_config: ServingLauncherConfig = ServingLauncherConfig()):
+        """
+        :param app: ASGI application every worker serves
+        :param model_holder: Holder the app serves from, loaded in the parent before forking
+        :param serving_launcher_config: Worker count, socket and supervision settings
+        """
+        self.app = app
+        self.model_holder = model_holder
+        self.serving_launcher_config = serving_launcher_config
+        self._socket: Optional[socket.socket] = None
+        # pid -> (worker slot, monotonic start time)
+        self._workers: Dict[int, Tuple[int, float]] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._stopping = False
+
+    def _bind_socket(self) -> socket.socket:
+        config = self.serving_launcher_config
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((config.host, config.port))
+        sock.listen(config.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def _preload(self) -> None:
+        try:
+            self.model_holder.load()
+        except Exception as e:
+            # workers still start and answer /ready with 503, as a single process server would
+            logging.error(f"Model preload failed: {e}")
+        # collect once, then move every surviving object to the permanent generation: later
+        # collections in the workers skip them instead of touching their headers and copying the pages
+        gc.collect()
+        gc.freeze()
+        logging.info(f"Froze {gc.get_freeze_count()} objects before forking workers")
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(slot)
+        self._workers[pid] = (slot, time.monotonic())
+        logging.info(f"Started worker-{slot} with pid {pid}")
+
+    def _run_worker(self, slot: int) -> None:
+        exit_code = 0
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            config = uvicorn.Config(self.app, host=self.serving_launcher_config.host,
+                                    port=self.serving_launcher_config.port)
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except BaseException as e:
+            logging.error(f"worker-{slot} failed: {e}")
+            exit_code = 1
+        finally:
+            logging.shutdown()
+            os._exit(exit_code)
+
+    def _reap(self) -> None:
+        while self._workers:
+            pid, wait_status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            slot, started_at = self._workers.pop(pid)
+            if self._stopping:
+                continue
+            uptime = time.monotonic() - started_at
+            if uptime < self.serving_launcher_config.min_worker_uptime_seconds:
+                self._failures[slot] = self._failures.get(slot, 0) + 1
+            else:
+                self._failures[slot] = 0
+            exit_code = os.waitstatus_to_exitcode(wait_status)
+            if self._failures[slot] > self.serving_launcher_config.max_worker_restarts:
+                logging.error(f"worker-{slot} (pid {pid}) exited with code {exit_code} after {uptime:.1f}s, "
+                              f"giving up after {self._failures[slot] - 1} restarts in a row")
+                continue
+            backoff = 0.0
+            if self._failures[slot]:
+                backoff = min(2.0 ** (self._failures[slot] - 1),
+                              self.serving_launcher_config.max_restart_backoff_seconds)
+            self._restart_at[slot] = time.monotonic() + backoff
+            logging.error(f"worker-{slot} (pid {pid}) exited with code {exit_code} "
+                          f"after {uptime:.1f}s, restarting in {backoff:.1f}s")
+
+    def report_memory(self) -> Dict[str, Dict[str, float]]:
+        """
+        Method Name :   report_memory
+        Description :   This method logs RSS, PSS and shared memory of the parent and every worker
+
+        Output      :   Returns memory usage keyed by process name
+        """
+        report = {"parent": read_memory_usage(os.getpid())}
+        for pid, (slot, _) in sorted(self._workers.items(), key=lambda item: item[1][0]):
+            report[f"worker-{slot}"] = {"pid": pid, **read_memory_usage(pid)}
+        total_pss = sum(usage.get("pss_mb", 0.0) for usage in report.values())
+        logging.info(f"Serving memory (MB), total PSS {total_pss:.1f}: " + ", ".join(
+            f"{name} rss={usage.get('rss_mb', 0.0):.1f} pss={usage.get('pss_mb', 0.0):.1f} "
+            f"shared={usage.get('shared_mb', 0.0):.1f}" for name, usage in report.items()))
+        return report
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _stop_workers(self) -> None:
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.serving_launcher_config.graceful_timeout_seconds
+        while self._workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self._workers):
+            logging.error(f"Killing pid {pid} after graceful timeout")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._workers.pop(pid, None)
+
+    def run(self) -> None:
+        """
+        Method Name :   run
+        Description :   This method preloads the model, forks the workers and supervises them until SIGTERM / SIGINT
+
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered the run method of ServingLauncher class")
+        try:
+            config = self.serving_launcher_config
+            if not hasattr(os, "fork"):
+                raise RuntimeError("The pre-fork launcher needs os.fork, run a single worker on this platform")
+
+            self._socket = self._bind_socket()
+            self._preload()
+            signal.signal(signal.SIGTERM, self._handle_stop)
+            signal.signal(signal.SIGINT, self._handle_stop)
+            logging.info(f"Serving on {config.host}:{config.port} with {config.workers} workers")
+
+            for slot in range(config.workers):
+                self._spawn(slot)
+            next_report = time.monotonic() + config.memory_report_interval_seconds
+
+            while not self._stopping:
+                self._reap()
+                if not self._workers and not self._restart_at:
+                    logging.error("Every worker crash looped past the restart limit, stopping")
+                    break
+                now = time.monotonic()
+                for slot, restart_at in list(self._restart_at.items()):
+                    if restart_at <= now and not self._stopping:
+                        del self._restart_at[slot]
+                        self._spawn(slot)
+                if now >= next_report:
+                    self.report_memory()
+                    next_report = now + config.memory_report_interval_seconds
+                time.sleep(0.2)
+
+            logging.info("Stopping workers")
+            self._stop_workers()
+            self._socket.close()
+            logging.info("Exited the run method of ServingLauncher class")
+        except Exception as e:
+            raise USvisaException(e, sys) from e
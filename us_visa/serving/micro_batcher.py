@@ -0,0 +1,157 @@
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.utils.metrics import metrics
+
+BatchPredictFn = Callable[[DataFrame], Awaitable[Tuple[np.ndarray, np.ndarray]]]
+
+
+class MicroBatcher:
+    """
+    This class collects concurrent single-row prediction requests for a short window and
+    scores them as one matrix, then hands every caller back its own row of the result
+    """
+
+    def __init__(self, predict_fn: BatchPredictFn, window_ms: float, max_batch_size: int,
+                 split_on_error: Callable[[Exception], bool] = lambda e: True):
+        """
+        :param predict_fn: Coroutine function scoring a DataFrame and returning labels and probabilities per row
+        :param window_ms: Longest time the first queued request waits for others to join its batch
+        :param max_batch_size: Batch is flushed as soon as this many rows are queued
+        :param split_on_error: Whether a failed batch is retried in halves to isolate the failing rows;
+                               errors that would fail every row again (timeouts) should not be
+        """
+        self.predict_fn = predict_fn
+        self.split_on_error = split_on_error
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._scoring: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.rows = 0
+        self.max_observed_batch = 0
+        self.errors = 0
+        self.splits = 0
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logging.info(f"Started micro batcher with window {self.window_ms}ms and max size {self.max_batch_size}")
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            for task in list(self._scoring):
+                task.cancel()
+            logging.info("Stopped micro batcher")
+
+    @property
+    def queue_depth(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    async def submit(self, dataframe: DataFrame) -> Tuple[object, float]:
+        """
+        Method Name :   submit
+        Description :   This method queues a one-row DataFrame or USvisaBatch and waits for its batched result
+
+        Output      :   Returns (label, probability) of the submitted row
+        On Failure  :   Raises the exception hit while scoring the batch
+        """
+        if self._worker is None:
+            raise RuntimeError("Micro batcher is not started")
+        if len(dataframe) != 1:
+            raise ValueError(f"Micro batcher expects one row per request, got {len(dataframe)}")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((dataframe, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[DataFrame, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.window_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            batch = [(df, future) for df, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+            # scoring runs as its own task so the next batch can be collected while this one is in the executor
+            task = asyncio.create_task(self._score_or_fail(batch))
+            self._scoring.add(task)
+            task.add_done_callback(self._scoring.discard)
+
+    async def _score_or_fail(self, batch: List[Tuple[DataFrame, asyncio.Future]]) -> None:
+        try:
+            await self._score(batch)
+        except Exception as e:
+            if len(batch) > 1 and self.split_on_error(e):
+                # one bad row must not fail its neighbours: score each half again until the failing rows are alone
+                self.splits += 1
+                middle = len(batch) // 2
+                await asyncio.gather(self._score_or_fail(batch[:middle]), self._score_or_fail(batch[middle:]))
+                return
+            self.errors += 1
+            logging.error(f"Micro batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _score(self, batch: List[Tuple[DataFrame, asyncio.Future]]) -> None:
+        try:
+            frames = [df for df, _ in batch]
+            if all(isinstance(frame, USvisaBatch) for frame in frames):
+                frame = USvisaBatch.concat(frames)
+            else:
+                frame = pd.concat([frame.to_dataframe() if isinstance(frame, USvisaBatch) else frame
+                                   for frame in frames], ignore_index=True)
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+        labels, probabilities = await self.predict_fn(frame)
+
+        metrics.observe("micro_batch_size", len(batch), name="batch_rows")
+        self.batches += 1
+        self.rows += len(batch)
+        self.max_observed_batch = max(self.max_observed_batch, len(batch))
+
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result((labels[i], float(probabilities[i])))
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_observed_batch,
+            "errors": self.errors,
+            "splits": self.splits,
+            "window_ms": self.window_ms,
+            "max_batch_size_limit": self.max_batch_size,
+        }
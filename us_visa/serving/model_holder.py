@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from us_visa.entity.config_entity import ModelRegistryConfig, ModelServingConfig
+from us_visa.entity.model_registry import ModelRegistry, resolve_model_path
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+from us_visa.utils.main_utils import get_file_digest
+from us_visa.utils.metrics import metrics
+from us_visa.utils.model_bundle import get_model_bundle_version, is_model_bundle
+
+
+class ModelNotReadyError(Exception):
+    """
+    Raised when a prediction is requested before the model has been loaded
+    """
+
+
+class ModelHolder:
+    """
+    This class keeps a single loaded USvisaClassifier for the whole process so that
+    requests share one model instead of unpickling model.pkl on every call
+    """
+
+    def __init__(self, model_serving_config: ModelServingConfig = ModelServingConfig()):
+        """
+        :param model_serving_config: Configuration holding the model file path to serve
+        """
+        self.model_serving_config = model_serving_config
+        self.model_path: Optional[str] = model_serving_config.model_file_path
+        self.model_version: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.load_error: Optional[str] = None
+        self.warmed_up: bool = False
+        self.warmup_seconds: Optional[float] = None
+        self._classifier: Optional[USvisaClassifier] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_model_version(model_path: str, model_registry_config: Optional[ModelRegistryConfig] = None) -> str:
+        """
+        Method Name :   get_model_version
+        Description :   This method returns the registry version of model_path when it is a registered model
+                        file or bundle, otherwise a version id derived from the content digest of the model
+
+        Output      :   Returns the registry version or the first 12 hex chars of the content digest
+        """
+        if model_registry_config is not None:
+            model = ModelRegistry(model_registry_config).find_by_path(model_path)
+            if model is not None:
+                # the bundle digest differs from the model.pkl digest the registry keys on
+                return model["version"]
+        if is_model_bundle(model_path):
+            return get_model_bundle_version(model_path)
+        return get_file_digest(model_path)[:12]
+
+    def load(self, model_path: Optional[str] = None) -> USvisaClassifier:
+        """
+        Method Name :   load
+        Description :   This method loads the model once and keeps it for every later request
+
+        Output      :   Returns the shared USvisaClassifier
+        On Failure  :   Records the error so readiness fails, then raises an exception
+        """
+        logging.info("Entered the load method of ModelHolder class")
+        with self._lock:
+            try:
+                model_registry_config = ModelRegistryConfig(
+                    registry_file_path=self.model_serving_config.model_registry_file_path)
+                if model_path is not None:
+                    self.model_path = model_path
+                if self.model_path is None:
+                    self.model_path = resolve_model_path(model_registry_config)
+                if not os.path.exists(self.model_path):
+                    raise FileNotFoundError(f"Model file not found at {self.model_path}")
+
+                start = time.perf_counter()
+                classifier = USvisaClassifier(model_path=self.model_path)
+                self.load_seconds = time.perf_counter() - start
+
+                self.model_version = self.get_model_version(self.model_path, model_registry_config)
+                self._classifier = classifier
+                self.load_error = None
+                # a freshly loaded model is cold until warm up has run against it again
+                self.warmed_up = False
+                self.warmup_seconds = None
+                metrics.set_gauge("model_load_seconds", self.load_seconds)
+                logging.info(f"Loaded model version [{self.model_version}] from [{self.model_path}] "
+                             f"in {self.load_seconds:.3f}s")
+                return classifier
+            except Exception as e:
+                self._classifier = None
+                self.model_version = None
+                self.load_error = str(e)
+                logging.error(f"Model load failed: {e}")
+                raise USvisaException(e, sys) from e
+
+    def unload(self) -> None:
+        with self._lock:
+            self._classifier = None
+            self.model_version = None
+            self.warmed_up = False
+
+    def mark_warm(self, warmup_seconds: float) -> None:
+        self.warmed_up = True
+        self.warmup_seconds = warmup_seconds
+        metrics.set_gauge("model_warmup_seconds", warmup_seconds)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._classifier is not None
+
+    @property
+    def classifier(self) -> USvisaClassifier:
+        if self._classifier is None:
+            raise ModelNotReadyError(self.load_error or "Model is not loaded")
+        return self._classifier
+
+    def status(self) -> dict:
+        return {
+            # serving can start once loaded, rolling deploys wait for the warmed up model
+            "ready": self.is_ready and self.warmed_up,
+            "loaded": self.is_ready,
+            "warmed_up": self.warmed_up,
+            "warmup_seconds": self.warmup_seconds,
+            "model_path": self.model_path,
+            "model_version": self.model_version,
+            "load_seconds": self.load_seconds,
+            "error": self.load_error,
+        }
+
+
+model_holder: ModelHolder = ModelHolder()
@@ -0,0 +1,176 @@
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from us_visa.constants import MODEL_INPUT_COLUMNS
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.logger import logging
+
+CachedPrediction = Tuple[object, float]
+
+
+def _canonical_value(value: object) -> object:
+    if value is None:
+        return None
+    if isinstance(value, (float, np.floating)) and math.isnan(value):
+        return None
+    if isinstance(value, str):
+        # float() ignores surrounding whitespace as the model's numeric parsing does; other strings are
+        # kept as sent, " Asia" is an unknown category to the encoders and must not hit the "Asia" entry
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return value
+
+
+def canonical_key(values: Tuple) -> Tuple:
+    """
+    Normalizes one applicant row so that equal profiles hash equal: numbers (or numeric strings)
+    become floats and missing values become None; other strings are compared as sent
+    """
+    return tuple(_canonical_value(value) for value in values)
+
+
+def canonical_keys(dataframe: Union[DataFrame, USvisaBatch]) -> List[Tuple]:
+    if isinstance(dataframe, USvisaBatch):
+        return [canonical_key(row) for row in dataframe.rows()]
+    return [canonical_key(row) for row in
+            dataframe[list(MODEL_INPUT_COLUMNS)].itertuples(index=False, name=None)]
+
+
+class PredictionCache:
+    """
+    This class is an in-process LRU cache of (label, probability) per canonical applicant row,
+    bounded by entry count, approximate memory and entry age, and emptied on model version change.
+    Lookups carry the version being served and switch the cache to it; a result stored for any other
+    version was scored by a model that has since been replaced and is dropped
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: Optional[float]):
+        """
+        :param max_entries: Most entries kept before the least recently used one is evicted
+        :param max_bytes: Approximate memory budget of keys and values
+        :param ttl_seconds: Age after which an entry is treated as a miss, None to disable
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.model_version: Optional[str] = None
+
+        self._entries: "OrderedDict[Hashable, Tuple[CachedPrediction, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @staticmethod
+    def _entry_size(key: Tuple, value: CachedPrediction) -> int:
+        return (sys.getsizeof(key) + sum(sys.getsizeof(item) for item in key)
+                + sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value))
+
+    def _check_version(self, model_version: Optional[str]) -> None:
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+                logging.info(f"Model version changed {self.model_version} -> {model_version}, "
+                             f"dropped {len(self._entries)} cached predictions")
+            self._entries.clear()
+            self._bytes = 0
+            self.model_version = model_version
+
+    def get(self, key: Tuple, model_version: Optional[str]) -> Optional[CachedPrediction]:
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at, size = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple, value: CachedPrediction, model_version: Optional[str]) -> None:
+        with self._lock:
+            if model_version != self.model_version:
+                # scored before a reload finished: keep the current model's entries and drop this one
+                self.stale_puts += 1
+                return
+            size = self._entry_size(key, value)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (value, time.monotonic(), size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def lookup(self, dataframe: DataFrame, model_version: Optional[str]
+               ) -> Tuple[List[Tuple], List[Optional[CachedPrediction]], List[int]]:
+        """
+        Method Name :   lookup
+        Description :   This method answers the cached rows of dataframe from memory
+
+        Output      :   Returns canonical keys, per row results (None for misses) and the missing row positions
+        """
+        keys = canonical_keys(dataframe)
+        results: List[Optional[CachedPrediction]] = [self.get(key, model_version) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        return keys, results, missing
+
+    def fill(self, keys: List[Tuple], results: List[Optional[CachedPrediction]], missing: List[int],
+             labels: np.ndarray, probabilities: np.ndarray, model_version: Optional[str]
+             ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Method Name :   fill
+        Description :   This method stores the scored misses returned for lookup and merges them with the hits
+
+        Output      :   Returns labels and probabilities for every looked up row
+        """
+        for j, i in enumerate(missing):
+            results[i] = (labels[j], float(probabilities[j]))
+            self.put(keys[i], results[i], model_version)
+        return (np.array([result[0] for result in results]),
+                np.array([result[1] for result in results], dtype=np.float64))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+            "model_version": self.model_version,
+        }
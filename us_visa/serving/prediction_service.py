@@ -0,0 +1,217 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from us_visa.entity.config_entity import ModelServingConfig
+from us_visa.entity.usvisa_batch import USvisaBatch, take_rows
+from us_visa.logger import logging
+from us_visa.serving.inference_executor import InferenceExecutor, InferenceTimeoutError
+from us_visa.serving.micro_batcher import MicroBatcher
+from us_visa.serving.model_holder import ModelHolder, ModelNotReadyError
+from us_visa.serving.prediction_cache import PredictionCache, canonical_keys
+from us_visa.serving.shadow import ShadowScorer
+from us_visa.serving.single_flight import SingleFlight
+from us_visa.serving.warmup import synthetic_batch
+from us_visa.utils.metrics import metrics
+
+
+def is_row_error(error: Exception) -> bool:
+    """
+    Whether a scoring error may come from the rows themselves, so scoring fewer rows can succeed.
+    A timeout or a missing model would fail every subset again
+    """
+    return not isinstance(error, (InferenceTimeoutError, ModelNotReadyError, asyncio.CancelledError))
+
+
+class PredictionService:
+    """
+    This class is the serving side prediction path: cache lookup, micro batching of single rows
+    and scoring on the inference executor, all driven from async route handlers
+    """
+
+    def __init__(self, model_holder: ModelHolder, model_serving_config: ModelServingConfig):
+        """
+        :param model_holder: Holder of the served model
+        :param model_serving_config: Configuration of cache, micro batching and executor
+        """
+        self.model_holder = model_holder
+        self.model_serving_config = model_serving_config
+
+        self.prediction_cache: Optional[PredictionCache] = None
+        if model_serving_config.cache_enabled:
+            self.prediction_cache = PredictionCache(max_entries=model_serving_config.cache_max_entries,
+                                                    max_bytes=model_serving_config.cache_max_bytes,
+                                                    ttl_seconds=model_serving_config.cache_ttl_seconds)
+
+        self.inference_executor = InferenceExecutor(model_holder=model_holder,
+                                                    kind=model_serving_config.executor_kind,
+                                                    max_workers=model_serving_config.executor_max_workers,
+                                                    timeout_seconds=model_serving_config.inference_timeout_seconds)
+
+        self.single_flight: Optional[SingleFlight] = None
+        if model_serving_config.coalesce_enabled:
+            self.single_flight = SingleFlight(split_on_error=is_row_error)
+
+        self.shadow_scorer = ShadowScorer(model_serving_config=model_serving_config)
+
+        self.micro_batcher: Optional[MicroBatcher] = None
+        if model_serving_config.micro_batch_enabled:
+            self.micro_batcher = MicroBatcher(predict_fn=self._score,
+                                              window_ms=model_serving_config.micro_batch_window_ms,
+                                              max_batch_size=model_serving_config.micro_batch_max_size,
+                                              split_on_error=is_row_error)
+
+        metrics.register_callback("inference_executor", self.inference_executor.stats)
+        metrics.register_callback("shadow", self.shadow_scorer.stats)
+        if self.micro_batcher is not None:
+            metrics.register_callback("micro_batcher", self.micro_batcher.stats)
+        if self.prediction_cache is not None:
+            metrics.register_callback("prediction_cache", self.prediction_cache.stats)
+        if self.single_flight is not None:
+            metrics.register_callback("single_flight", self.single_flight.stats)
+
+    async def start(self) -> None:
+        self.inference_executor.start()
+        if self.micro_batcher is not None:
+            await self.micro_batcher.start()
+
+    async def stop(self) -> None:
+        if self.micro_batcher is not None:
+            await self.micro_batcher.stop()
+        await self.shadow_scorer.stop()
+        self.inference_executor.shutdown()
+
+    async def warm_up(self) -> float:
+        """
+        Method Name :   warm_up
+        Description :   This method scores synthetic batches of every configured size on each executor
+                        worker, through both the columnar and the DataFrame path, then marks the model warm.
+                        The cache and micro batcher are bypassed so no synthetic rows are remembered
+
+        Output      :   Returns the warm up duration in seconds
+        On Failure  :   Raises the scoring error and leaves the model not warmed up
+        """
+        self._ensure_ready()
+        config = self.model_serving_config
+        start = time.perf_counter()
+        if config.warmup_enabled:
+            usvisa_model = self.model_holder.classifier.model
+            workers = self.inference_executor.max_workers
+            for seed, size in enumerate(config.warmup_batch_sizes):
+                batch = synthetic_batch(usvisa_model, n_rows=size, seed=seed)
+                inputs = (batch, batch.to_dataframe())
+                rows = np.arange(size)
+                for _ in range(config.warmup_rounds):
+                    # every concurrent call gets its own copy, the primary imputer fills a batch in place
+                    await asyncio.gather(*(self.inference_executor.predict_batch(take_rows(data, rows))
+                                           for data in inputs for _ in range(workers)))
+        warmup_seconds = time.perf_counter() - start
+        self.model_holder.mark_warm(warmup_seconds)
+        logging.info(f"Warmed up model version [{self.model_holder.model_version}] on batch sizes "
+                     f"{list(config.warmup_batch_sizes)} in {warmup_seconds:.3f}s")
+        return warmup_seconds
+
+    async def _score(self, dataframe: Union[DataFrame, USvisaBatch]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores on the inference executor and hands the answered batch to the shadow model
+        """
+        # checked before copying, so an overloaded shadow costs the request path nothing
+        shadow = self.shadow_scorer.wants_batch()
+        shadow_input = dataframe
+        if shadow and isinstance(dataframe, USvisaBatch):
+            # the primary imputer fills a batch in place, the shadow model must see the raw rows
+            shadow_input = dataframe.take(np.arange(len(dataframe)))
+        start = time.perf_counter()
+        labels, probabilities = await self.inference_executor.predict_batch(dataframe)
+        if shadow:
+            # primary latency includes waiting for an executor slot, as callers experience it
+            self.shadow_scorer.submit(shadow_input, labels, probabilities, time.perf_counter() - start)
+        return labels, probabilities
+
+    def _ensure_ready(self) -> None:
+        if not self.model_holder.is_ready:
+            raise ModelNotReadyError(self.model_holder.load_error or "Model is not loaded")
+
+    async def predict_one(self, dataframe: Union[DataFrame, USvisaBatch]) -> Tuple[object, float]:
+        """
+        Scores a one-row DataFrame or USvisaBatch, answering from the cache when possible and otherwise
+        joining the current micro batch
+        """
+        self._ensure_ready()
+        model_version = self.model_holder.model_version
+
+        key = None
+        if self.prediction_cache is not None or self.single_flight is not None:
+            key = canonical_keys(dataframe)[0]
+        if self.prediction_cache is not None:
+            cached = self.prediction_cache.get(key, model_version)
+            if cached is not None:
+                return cached
+
+        async def compute(positions: List[int]) -> List[Tuple[object, float]]:
+            if self.micro_batcher is not None:
+                result = await self.micro_batcher.submit(dataframe)
+            else:
+                labels, probabilities = await self._score(dataframe)
+                result = (labels[0], float(probabilities[0]))
+            if self.prediction_cache is not None:
+                self.prediction_cache.put(key, result, model_version)
+            return [result]
+
+        if self.single_flight is None:
+            return (await compute([0]))[0]
+        # identical profiles arriving together share the first one's computation
+        return (await self.single_flight.run([(model_version, key)], compute))[0]
+
+    async def predict_many(self, dataframe: Union[DataFrame, USvisaBatch]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores every row of dataframe; cached rows are answered from memory and the rest go to
+        the executor as one batch
+        """
+        self._ensure_ready()
+        model_version = self.model_holder.model_version
+
+        if self.single_flight is None:
+            if self.prediction_cache is None:
+                return await self._score(dataframe)
+            keys, results, missing = self.prediction_cache.lookup(dataframe, model_version)
+            labels, probabilities = np.array([]), np.array([])
+            if missing:
+                labels, probabilities = await self._score(take_rows(dataframe, missing))
+            return self.prediction_cache.fill(keys, results, missing, labels, probabilities, model_version)
+
+        if self.prediction_cache is not None:
+            keys, results, missing = self.prediction_cache.lookup(dataframe, model_version)
+        else:
+            keys = canonical_keys(dataframe)
+            results, missing = [None] * len(keys), list(range(len(keys)))
+
+        async def compute(positions: List[int]) -> List[Tuple[object, float]]:
+            rows = [missing[position] for position in positions]
+            labels, probabilities = await self._score(take_rows(dataframe, rows))
+            scored = [(labels[j], float(probabilities[j])) for j in range(len(rows))]
+            if self.prediction_cache is not None:
+                for row, result in zip(rows, scored):
+                    self.prediction_cache.put(keys[row], result, model_version)
+            return scored
+
+        if missing:
+            # rows equal to each other or to rows of concurrent requests are scored once
+            scored = await self.single_flight.run([(model_version, keys[row]) for row in missing], compute)
+            for row, result in zip(missing, scored):
+                results[row] = result
+        return (np.array([result[0] for result in results]),
+                np.array([result[1] for result in results], dtype=np.float64))
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_holder.status(),
+            "micro_batcher": None if self.micro_batcher is None else self.micro_batcher.stats(),
+            "prediction_cache": None if self.prediction_cache is None else self.prediction_cache.stats(),
+            "single_flight": None if self.single_flight is None else self.single_flight.stats(),
+            "inference_executor": self.inference_executor.stats(),
+            "shadow": self.shadow_scorer.stats(),
+        }
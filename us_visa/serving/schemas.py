@@ -0,0 +1,49 @@
+from typing import List, Optional
+
+from pandas import DataFrame
+from pydantic import BaseModel
+
+from us_visa.constants import MODEL_INPUT_COLUMNS
+from us_visa.entity.usvisa_batch import USvisaBatch
+
+
+class USvisaRecord(BaseModel):
+    continent: Optional[str] = None
+    education_of_employee: Optional[str] = None
+    has_job_experience: Optional[str] = None
+    requires_job_training: Optional[str] = None
+    no_of_employees: Optional[int] = None
+    region_of_employment: Optional[str] = None
+    prevailing_wage: Optional[float] = None
+    unit_of_wage: Optional[str] = None
+    full_time_position: Optional[str] = None
+    company_age: Optional[int] = None
+
+
+class BatchPredictionRequest(BaseModel):
+    records: List[USvisaRecord]
+
+    def to_dataframe(self) -> DataFrame:
+        """
+        Builds one columnar frame for all records so the model scores them in a single call
+        """
+        return DataFrame({column: [getattr(record, column) for record in self.records]
+                          for column in MODEL_INPUT_COLUMNS})
+
+    def to_batch(self) -> USvisaBatch:
+        """
+        Collects the records straight into typed columns, skipping the DataFrame
+        """
+        return USvisaBatch.from_records(self.records)
+
+
+class BatchPrediction(BaseModel):
+    prediction: int
+    label: str
+    probability: float
+
+
+class BatchPredictionResponse(BaseModel):
+    model_version: Optional[str] = None
+    count: int
+    predictions: List[BatchPrediction]
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from us_visa.entity.config_entity import ModelRegistryConfig, ModelServingConfig
+from us_visa.entity.model_registry import ModelRegistry, get_serving_path
+from us_visa.entity.usvisa_batch import USvisaBatch
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.pipline.prediction_pipeline import USvisaClassifier
+from us_visa.serving.model_holder import ModelHolder
+from us_visa.utils.metrics import metrics
+
+ShadowItem = Tuple[Union[DataFrame, USvisaBatch], np.ndarray, np.ndarray, float]
+
+
+def resolve_shadow_model_path(model_serving_config: ModelServingConfig) -> Optional[str]:
+    """
+    Explicit shadow model path, else the model behind the registry shadow pointer, else None
+    """
+    if model_serving_config.shadow_model_file_path:
+        return model_serving_config.shadow_model_file_path
+    model_registry_config = ModelRegistryConfig(registry_file_path=model_serving_config.model_registry_file_path)
+    shadow = ModelRegistry(model_registry_config).get_current(model_registry_config.shadow_pointer)
+    return None if shadow is None else get_serving_path(shadow)
+
+
+class ShadowScorer:
+    """
+    This class scores the batches the primary model already answered with a second, candidate
+    model. Batches wait on a bounded asyncio queue and are scored one at a time on a dedicated
+    thread, so the shadow never holds an inference executor slot and never delays a response;
+    when the queue is full new batches are dropped instead of queued. Label agreement, probability
+    drift and the latency of both models on the same batches are recorded for comparison
+    """
+
+    def __init__(self, model_serving_config: ModelServingConfig):
+        """
+        :param model_serving_config: Configuration holding the shadow model path and queue size
+        """
+        self.model_serving_config = model_serving_config
+        self.model_path: Optional[str] = None
+        self.model_version: Optional[str] = None
+        self.load_error: Optional[str] = None
+        self._classifier: Optional[USvisaClassifier] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.submitted = 0
+        self.dropped = 0
+        self.scored_batches = 0
+        self.scored_rows = 0
+        self.agreed_rows = 0
+        self.probability_delta_sum = 0.0
+        self.primary_seconds_sum = 0.0
+        self.shadow_seconds_sum = 0.0
+        self.errors = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._classifier is not None and self._worker is not None
+
+    def _load(self) -> None:
+        model_registry_config = ModelRegistryConfig(
+            registry_file_path=self.model_serving_config.model_registry_file_path)
+        model_path = resolve_shadow_model_path(self.model_serving_config)
+        if model_path is None:
+            logging.info("No shadow model configured")
+            return
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Shadow model file not found at {model_path}")
+        self._classifier = USvisaClassifier(model_path=model_path)
+        self.model_path = model_path
+        self.model_version = ModelHolder.get_model_version(model_path, model_registry_config)
+        logging.info(f"Loaded shadow model version [{self.model_version}] from [{model_path}]")
+
+    async def start(self) -> None:
+        """
+        Method Name :   start
+        Description :   This method loads the shadow model, if one is configured, and starts its scoring task
+
+        On Failure  :   Logs the error and leaves shadowing off, the primary model keeps serving
+        """
+        if self._worker is not None:
+            return
+        try:
+            await asyncio.to_thread(self._load)
+        except Exception as e:
+            self.load_error = str(e)
+            logging.error(f"Shadow model load failed: {e}")
+            return
+        if self._classifier is None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.model_serving_config.shadow_queue_max_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="usvisa-shadow")
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            logging.info(f"Stopped shadow scoring: {self.stats()}")
+
+    def wants_batch(self) -> bool:
+        """
+        Whether a batch would be queued right now; a full queue counts the batch as dropped, so callers
+        skip copying inputs the shadow model would never see
+        """
+        if not self.is_enabled:
+            return False
+        if self._queue.full():
+            self.dropped += 1
+            return False
+        return True
+
+    def submit(self, data: Union[DataFrame, USvisaBatch], labels: np.ndarray, probabilities: np.ndarray,
+               primary_seconds: float) -> None:
+        """
+        Queues a scored batch for the shadow model without waiting; drops it when the queue is full
+        """
+        if not self.is_enabled:
+            return
+        try:
+            self._queue.put_nowait((data, labels, probabilities, primary_seconds))
+            self.submitted += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            data, labels, probabilities, primary_seconds = await self._queue.get()
+            try:
+                start = time.perf_counter()
+                shadow_labels, shadow_probabilities = await loop.run_in_executor(
+                    self._executor, self._classifier.predict_batch, data)
+                shadow_seconds = time.perf_counter() - start
+                self._record(labels, probabilities, primary_seconds, shadow_labels, shadow_probabilities,
+                             shadow_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Shadow scoring failed: {USvisaException(e, sys)}")
+
+    def _record(self, labels: np.ndarray, probabilities: np.ndarray, primary_seconds: float,
+                shadow_labels: np.ndarray, shadow_probabilities: np.ndarray, shadow_seconds: float) -> None:
+        self.scored_batches += 1
+        self.scored_rows += len(labels)
+        self.agreed_rows += int(np.count_nonzero(np.asarray(labels) == np.asarray(shadow_labels)))
+        self.probability_delta_sum += float(np.abs(np.asarray(probabilities, dtype=np.float64)
+                                                   - np.asarray(shadow_probabilities, dtype=np.float64)).sum())
+        self.primary_seconds_sum += primary_seconds
+        self.shadow_seconds_sum += shadow_seconds
+        metrics.observe("primary", primary_seconds, name="shadow_comparison_latency_seconds")
+        metrics.observe("shadow", shadow_seconds, name="shadow_comparison_latency_seconds")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.is_enabled,
+            "model_path": self.model_path,
+            "model_version": self.model_version,
+            "error": self.load_error,
+            "queue_depth": 0 if self._queue is None else self._queue.qsize(),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "scored_batches": self.scored_batches,
+            "scored_rows": self.scored_rows,
+            "errors": self.errors,
+            "agreement_rate": self.agreed_rows / self.scored_rows if self.scored_rows else None,
+            "mean_abs_probability_delta": (self.probability_delta_sum / self.scored_rows
+                                           if self.scored_rows else None),
+            "mean_primary_batch_seconds": (self.primary_seconds_sum / self.scored_batches
+                                           if self.scored_batches else None),
+            "mean_shadow_batch_seconds": (self.shadow_seconds_sum / self.scored_batches
+                                          if self.scored_batches else None),
+        }
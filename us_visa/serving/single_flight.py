@@ -0,0 +1,124 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, List, Sequence
+
+ComputeFn = Callable[[List[int]], Awaitable[Sequence[object]]]
+
+
+class _Failure:
+    """
+    Error of one key, kept apart from the results so a failing key does not fail the keys computed with it
+    """
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _mark_retrieved(future: asyncio.Future) -> None:
+    # a key may fail with no caller left waiting on it; reading the error keeps asyncio from logging it
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """
+    This class coalesces concurrent computations of equal keys: the first caller of a key computes
+    it and every caller arriving while that computation runs awaits the same future instead of
+    computing again. A key is forgotten as soon as its result is set, so unlike the prediction
+    cache nothing is kept and no result can go stale
+    """
+
+    def __init__(self, split_on_error: Callable[[Exception], bool] = lambda e: True):
+        """
+        :param split_on_error: Whether a failed computation is retried in halves so only the failing keys fail;
+                               errors that would fail every key again (timeouts) should not be
+        """
+        self.split_on_error = split_on_error
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.computed = 0
+        self.coalesced = 0
+        self.splits = 0
+
+    async def run(self, keys: Sequence[Hashable], compute: ComputeFn) -> List[object]:
+        """
+        Method Name :   run
+        Description :   This method returns one result per key. Keys already in flight, or repeated within keys,
+                        await the running computation; the rest are computed by one compute call that receives
+                        their positions in keys and returns their results in the same order
+
+        Output      :   Returns results in the order of keys
+        On Failure  :   Raises the compute error to every caller waiting on a key it failed; keys computed
+                        with a failing key are computed again without it and still get their results
+        """
+        loop = asyncio.get_running_loop()
+        futures: List[asyncio.Future] = []
+        own_positions: List[int] = []
+        others: Dict[int, asyncio.Future] = {}
+        for position, key in enumerate(keys):
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = loop.create_future()
+                future.add_done_callback(_mark_retrieved)
+                own_positions.append(position)
+            else:
+                others[id(future)] = future
+            futures.append(future)
+        self.computed += len(own_positions)
+        self.coalesced += len(keys) - len(own_positions)
+
+        # the computation runs as its own task and is awaited through shield, so a caller that
+        # gives up (client disconnect, timeout) never cancels the result others are waiting on
+        if own_positions:
+            own_futures = [futures[position] for position in own_positions]
+            for future in own_futures:
+                others.pop(id(future), None)
+            task = asyncio.ensure_future(self._compute_isolated(compute, own_positions))
+            task.add_done_callback(partial(self._settle, [keys[position] for position in own_positions],
+                                           own_futures))
+            await asyncio.shield(task)
+        if others:
+            await asyncio.shield(asyncio.gather(*others.values()))
+        return [future.result() for future in futures]
+
+    async def _compute_isolated(self, compute: ComputeFn, positions: List[int]) -> List[object]:
+        try:
+            return list(await compute(positions))
+        except Exception as e:
+            if len(positions) == 1 or not self.split_on_error(e):
+                return [_Failure(e)] * len(positions)
+            # the keys were computed together for speed only, one bad key must not fail the others
+            self.splits += 1
+            middle = len(positions) // 2
+            first, second = await asyncio.gather(self._compute_isolated(compute, positions[:middle]),
+                                                 self._compute_isolated(compute, positions[middle:]))
+            return first + second
+
+    def _settle(self, keys: List[Hashable], futures: List[asyncio.Future], task: asyncio.Future) -> None:
+        for key, future in zip(keys, futures):
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if task.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+        for future, result in zip(futures, task.result()):
+            if isinstance(result, _Failure):
+                future.set_exception(result.error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        total = self.computed + self.coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "splits": self.splits,
+            "coalesce_rate": self.coalesced / total if total else 0.0,
+        }
@@ -0,0 +1,272 @@
+import json
+import logging as std_logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory file locks (Windows); there is no pre-fork launcher there either, so one process dispatches
+    fcntl = None
+
+from us_visa.constants import TRAINING_JOB_STAGES
+from us_visa.entity.config_entity import TrainingJobConfig
+from us_visa.exception import USvisaException
+from us_visa.logger import LOG_FORMAT, logging
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class TrainingJobNotFoundError(Exception):
+    """
+    Raised when a training job id is unknown
+    """
+
+
+def _write_status(status_file_path: str, status: dict) -> None:
+    # written to a temp file and renamed so pollers never read a half written file
+    tmp_file_path = f"{status_file_path}.tmp"
+    with open(tmp_file_path, "w") as file_obj:
+        json.dump(status, file_obj, indent=2, default=str)
+    os.replace(tmp_file_path, status_file_path)
+
+
+def _read_status(status_file_path: str) -> dict:
+    with open(status_file_path) as file_obj:
+        return json.load(file_obj)
+
+
+def _is_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ---------- training process side ----------
+def run_training_job(job_id: str, training_job_config: TrainingJobConfig) -> None:
+    """
+    Entry point of the training process: runs TrainPipeline and keeps status.json of the job
+    up to date after every stage
+    """
+    job_dir = os.path.join(training_job_config.job_dir, job_id)
+    status_file_path = os.path.join(job_dir, training_job_config.status_file_name)
+
+    job_log_handler = std_logging.FileHandler(os.path.join(job_dir, training_job_config.log_file_name))
+    job_log_handler.setFormatter(std_logging.Formatter(LOG_FORMAT))
+    std_logging.getLogger().addHandler(job_log_handler)
+
+    status = _read_status(status_file_path)
+    status.update(state=JOB_RUNNING, started_at=time.time(), pid=os.getpid())
+    _write_status(status_file_path, status)
+
+    def progress_callback(stage: str, stage_status: str, artifact) -> None:
+        stage_entry = status["stages"].setdefault(stage, {})
+        stage_entry["status"] = stage_status
+        stage_entry[f"{stage_status}_at"] = time.time()
+        if stage == "model_trainer" and artifact is not None:
+            status["trained_model_file_path"] = artifact.trained_model_file_path
+        if stage == "model_evaluation" and artifact is not None:
+            status["model_accepted"] = artifact.is_model_accepted
+        _write_status(status_file_path, status)
+
+    try:
+        logging.info(f"Training job [{job_id}] started")
+        from us_visa.pipline.training_pipeline import TrainPipeline
+
+        TrainPipeline().run_pipeline(progress_callback=progress_callback)
+        status.update(state=JOB_COMPLETED, finished_at=time.time())
+        logging.info(f"Training job [{job_id}] completed")
+    except Exception as e:
+        # a stage the pipeline could not report on, e.g. when the callback itself failed
+        for stage_entry in status["stages"].values():
+            if stage_entry.get("status") == "started":
+                stage_entry.update(status="failed", failed_at=time.time())
+        status.update(state=JOB_FAILED, finished_at=time.time(), error=str(e))
+        logging.error(f"Training job [{job_id}] failed: {e}")
+    finally:
+        _write_status(status_file_path, status)
+        job_log_handler.close()
+
+
+class TrainingJobManager:
+    """
+    This class runs TrainPipeline in a separate process per job so that training never blocks
+    the serving event loop. Jobs wait in a queue and one dispatcher thread runs them one at a
+    time; progress is shared through a status.json file per job. Every pre-forked worker has its
+    own manager, so a job only starts while its dispatcher holds the lock file of the job
+    directory and jobs of all workers run one at a time
+    """
+
+    def __init__(self, training_job_config: TrainingJobConfig = TrainingJobConfig()):
+        """
+        :param training_job_config: Configuration of the training job directory layout
+        """
+        self.training_job_config = training_job_config
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # a fresh spawned interpreter per job: no inherited event loop or model, and a new
+        # TIMESTAMP artifact directory for every run
+        self._context = multiprocessing.get_context("spawn")
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.training_job_config.job_dir, job_id)
+
+    def status_file_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), self.training_job_config.status_file_name)
+
+    def log_file_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), self.training_job_config.log_file_name)
+
+    def _ensure_dispatcher(self) -> None:
+        with self._lock:
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(target=self._dispatch, name="training-job-dispatcher",
+                                                    daemon=True)
+                self._dispatcher.start()
+
+    def submit(self) -> str:
+        """
+        Method Name :   submit
+        Description :   This method queues a new training run and returns without waiting for it
+
+        Output      :   Returns the job id
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            job_id = time.strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:8]
+            os.makedirs(self.job_dir(job_id), exist_ok=True)
+            _write_status(self.status_file_path(job_id), {
+                "job_id": job_id,
+                "state": JOB_QUEUED,
+                "submitted_at": time.time(),
+                "stages": {stage: {"status": "pending"} for stage in TRAINING_JOB_STAGES},
+                "trained_model_file_path": None,
+                "model_accepted": None,
+                "error": None,
+                "dispatcher_pid": os.getpid(),
+            })
+            self._ensure_dispatcher()
+            self._queue.put(job_id)
+            logging.info(f"Queued training job [{job_id}]")
+            return job_id
+        except Exception as e:
+            raise USvisaException(e, sys) from e
+
+    def _acquire_job_lock(self):
+        """
+        Waits for the lock file shared by the dispatchers of every worker process
+
+        :return: The open lock file, closing it releases the lock; None when stopping while waiting
+        """
+        os.makedirs(self.training_job_config.job_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.training_job_config.job_dir, self.training_job_config.lock_file_name), "a")
+        if fcntl is None:
+            return lock_file
+        while True:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except BlockingIOError:
+                # polled instead of a blocking flock so shutdown is not stuck behind another worker's job
+                if self._stopping.wait(self.training_job_config.lock_poll_seconds):
+                    lock_file.close()
+                    return None
+
+    def _dispatch(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            lock_file = self._acquire_job_lock()
+            if lock_file is None:
+                return
+            try:
+                process = self._context.Process(target=run_training_job, args=(job_id, self.training_job_config),
+                                                name=f"training-job-{job_id}")
+                self._process = process
+                process.start()
+                process.join()
+                self._process = None
+            finally:
+                lock_file.close()
+
+            status = self.status(job_id)
+            if status["state"] not in (JOB_COMPLETED, JOB_FAILED):
+                # the process died before it could record the outcome itself
+                status.update(state=JOB_FAILED, finished_at=time.time(),
+                              error=f"Training process exited with code {process.exitcode}")
+                _write_status(self.status_file_path(job_id), status)
+
+    def status(self, job_id: str) -> dict:
+        status_file_path = self.status_file_path(job_id)
+        if not os.path.exists(status_file_path):
+            raise TrainingJobNotFoundError(f"Unknown training job [{job_id}]")
+        status = _read_status(status_file_path)
+        if status["state"] == JOB_QUEUED:
+            status["queue_position"] = self._queue_position(job_id)
+        return status
+
+    def _queue_position(self, job_id: str) -> Optional[int]:
+        """
+        Position among the queued jobs of every worker, read from their status files so each worker
+        reports the same value; jobs left queued by a worker that has since exited are skipped
+        """
+        queued = []
+        job_dir = self.training_job_config.job_dir
+        for other_job_id in os.listdir(job_dir):
+            status_file_path = self.status_file_path(other_job_id)
+            try:
+                status = _read_status(status_file_path)
+            except (OSError, ValueError):
+                continue
+            if status.get("state") == JOB_QUEUED and _is_alive(status.get("dispatcher_pid")):
+                queued.append((status["submitted_at"], other_job_id))
+        queued.sort()
+        positions = [other_job_id for _, other_job_id in queued]
+        return positions.index(job_id) + 1 if job_id in positions else None
+
+    def read_logs(self, job_id: str, tail: Optional[int] = None) -> str:
+        self.status(job_id)
+        log_file_path = self.log_file_path(job_id)
+        if not os.path.exists(log_file_path):
+            return ""
+        with open(log_file_path) as file_obj:
+            lines = file_obj.readlines()
+        return "".join(lines[-tail:] if tail else lines)
+
+    def artifact_path(self, job_id: str) -> Optional[str]:
+        """
+        :return: Trained model file of a completed job whose model ModelEvaluation accepted, None while
+                 the job has not finished or when its model was rejected
+        """
+        status = self.status(job_id)
+        if status["state"] != JOB_COMPLETED or not status.get("model_accepted"):
+            return None
+        return status.get("trained_model_file_path")
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        self._queue.put(None)
+        process = self._process
+        if process is not None and process.is_alive():
+            logging.info(f"Stopping running training process [{process.name}]")
+            process.terminate()
+            process.join(timeout=10)
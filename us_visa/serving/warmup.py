@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+
+from us_visa.constants import MODEL_CATEGORICAL_INPUT_COLUMNS, MODEL_NUMERIC_INPUT_COLUMNS
+from us_visa.entity.usvisa_batch import USvisaBatch
+
+
+def _known_categories(usvisa_model) -> Dict[str, List[object]]:
+    """
+    Categories each encoder of the fitted preprocessor accepts, so synthetic rows never hit
+    an unknown category error
+    """
+    categories: Dict[str, List[object]] = {}
+    for _, transformer, columns in getattr(usvisa_model.preprocessing_object, "transformers_", []):
+        while isinstance(transformer, Pipeline):
+            transformer = transformer.steps[-1][1]
+        if isinstance(transformer, (OneHotEncoder, OrdinalEncoder)):
+            for column, values in zip(columns, transformer.categories_):
+                categories[column] = list(values)
+    return categories
+
+
+def synthetic_batch(usvisa_model, n_rows: int, seed: int = 0) -> USvisaBatch:
+    """
+    Method Name :   synthetic_batch
+    Description :   This method builds n_rows plausible applicants cycling through every known category
+
+    Output      :   Returns a USvisaBatch accepted by usvisa_model
+    """
+    rng = np.random.default_rng(seed)
+    categories = _known_categories(usvisa_model)
+    numeric = {
+        "no_of_employees": rng.lognormal(mean=7.5, sigma=1.5, size=n_rows).round(),
+        "prevailing_wage": rng.lognormal(mean=11.0, sigma=0.8, size=n_rows),
+        "company_age": rng.integers(1, 150, size=n_rows).astype(np.float64),
+    }
+    records = []
+    for row in range(n_rows):
+        record = {column: values[(row + seed) % len(values)] for column, values in categories.items()
+                  if column in MODEL_CATEGORICAL_INPUT_COLUMNS}
+        record.update({column: numeric[column][row] for column in MODEL_NUMERIC_INPUT_COLUMNS})
+        records.append(SimpleNamespace(**record))
+    return USvisaBatch.from_records(records)
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import sys
 
@@ -6,6 +7,7 @@ import dill
 import yaml
 from pandas import DataFrame
 
+from us_visa.constants import CURRENT_YEAR
 from us_visa.exception import USvisaException
 from us_visa.logger import logging
 
@@ -108,10 +110,37 @@ def drop_columns(df: DataFrame, cols: list)-> DataFrame:
     logging.info("Entered drop_columns methon of utils")
 
     try:
-        df = df.drop(columns=cols, axis=1)
+        df = df.drop(columns=cols)
 
         logging.info("Exited the drop_columns method of utils")
         
         return df
     except Exception as e:
-        raise USvisaException(e, sys) from e
\ No newline at end of file
+        raise USvisaException(e, sys) from e
+
+
+
+def add_company_age(df: DataFrame) -> DataFrame:
+    """
+    add company_age column derived from yr_of_estab, as used for training and scoring
+    df: pandas DataFrame with a yr_of_estab column
+    """
+    try:
+        df['company_age'] = CURRENT_YEAR - df['yr_of_estab']
+        return df
+    except Exception as e:
+        raise USvisaException(e, sys) from e
+
+
+def get_file_digest(file_path: str) -> str:
+    """
+    sha256 hex digest of a file, read in 1MB blocks
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file_obj:
+            for block in iter(lambda: file_obj.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    except Exception as e:
+        raise USvisaException(e, sys) from e
@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencySummary:
+    """
+    Count, sum and a bounded window of recent samples of one timed stage; quantiles are
+    computed from the window only when metrics are scraped, so recording stays O(1)
+    """
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self._samples.append(seconds)
+
+    def quantiles(self) -> Dict[float, float]:
+        return self.snapshot()[2]
+
+    def snapshot(self) -> Tuple[int, float, Dict[float, float]]:
+        """
+        :return: Count, sum and window quantiles read together, so a scrape never pairs a count with
+                 a sum that already includes a later sample
+        """
+        with self._lock:
+            count, total = self.count, self.total
+            samples = np.fromiter(self._samples, dtype=np.float64)
+        if samples.size == 0:
+            return count, total, {q: float("nan") for q in QUANTILES}
+        return count, total, dict(zip(QUANTILES, np.quantile(samples, QUANTILES).tolist()))
+
+
+class MetricsRegistry:
+    """
+    This class is a small process wide metrics registry: stage latency summaries, gauges and
+    callback gauges, rendered in the Prometheus text exposition format
+    """
+
+    def __init__(self, prefix: str = "usvisa", window: int = 2048):
+        self.prefix = prefix
+        self.window = window
+        self._summaries: Dict[Tuple[str, str], LatencySummary] = {}
+        self._gauges: Dict[str, float] = {}
+        self._gauge_callbacks: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def summary(self, name: str, stage: str) -> LatencySummary:
+        key = (name, stage)
+        summary = self._summaries.get(key)
+        if summary is None:
+            with self._lock:
+                summary = self._summaries.setdefault(key, LatencySummary(self.window))
+        return summary
+
+    def observe(self, stage: str, seconds: float, name: str = "stage_latency_seconds") -> None:
+        self.summary(name, stage).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, name: str = "stage_latency_seconds") -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.summary(name, stage).observe(time.perf_counter() - start)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def inc_gauge(self, name: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0.0) + amount
+
+    def register_callback(self, name: str, callback: Callable[[], Dict[str, float]]) -> None:
+        """
+        :param name: Metric family name, label values come from the callback keys
+        :param callback: Returns {label value: number} when metrics are rendered, non numeric values are skipped
+        """
+        with self._lock:
+            self._gauge_callbacks[name] = callback
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        # request threads add summaries and gauges while a scrape iterates them
+        with self._lock:
+            summaries = sorted(self._summaries.items())
+            gauges = sorted(self._gauges.items())
+            gauge_callbacks = sorted(self._gauge_callbacks.items())
+
+        names = sorted({name for (name, _), _ in summaries})
+        for name in names:
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} summary")
+            for (summary_name, stage), summary in summaries:
+                if summary_name != name:
+                    continue
+                count, total, quantiles = summary.snapshot()
+                for q, value in quantiles.items():
+                    lines.append(f'{metric}{{stage="{stage}",quantile="{q}"}} {format_value(value)}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {format_value(total)}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {count}')
+
+        for name, value in gauges:
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {format_value(value)}")
+
+        for name, callback in gauge_callbacks:
+            metric = f"{self.prefix}_{name}"
+            try:
+                values = callback()
+            except Exception:
+                continue
+            lines.append(f"# TYPE {metric} gauge")
+            for key, value in sorted(numeric_items(values).items()):
+                lines.append(f'{metric}{{key="{key}"}} {format_value(value)}')
+
+        return "\n".join(lines) + "\n"
+
+
+metrics: MetricsRegistry = MetricsRegistry()
+
+
+def format_value(value: float) -> str:
+    """
+    Writes a sample value the way the Prometheus text format spells NaN and infinities
+    """
+    value = float(value)
+    if np.isnan(value):
+        return "NaN"
+    if np.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def numeric_items(values: Optional[dict]) -> Dict[str, float]:
+    """
+    Keeps only the numeric entries of a stats dict so it can be exported as gauges
+    """
+    if not values:
+        return {}
+    return {key: float(value) for key, value in values.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
@@ -0,0 +1,194 @@
+"""
+Model bundle format: a directory holding a small dill pickle of the object graph and every
+large numeric array as its own .npy file, loaded back with np.load(mmap_mode=...).
+
+    model.bundle/
+        manifest.json     format version, array list with dtype / shape / sha256
+        object.pkl        the object graph, large arrays replaced by persistent ids
+        arrays/000000.npy
+
+Loading only unpickles the small object graph and maps the arrays, so load time does not
+grow with model size, and every process mapping the same bundle shares the page cache
+instead of holding its own copy.
+
+    python -m us_visa.utils.model_bundle model.pkl model.bundle
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from typing import Optional
+
+import dill
+import numpy as np
+
+from us_visa.constants import (MODEL_BUNDLE_ARRAY_DIR, MODEL_BUNDLE_FORMAT_VERSION, MODEL_BUNDLE_MANIFEST_FILE_NAME,
+                               MODEL_BUNDLE_MIN_ARRAY_BYTES, MODEL_BUNDLE_MMAP_MODE, MODEL_BUNDLE_OBJECT_FILE_NAME)
+from us_visa.exception import USvisaException
+from us_visa.logger import logging
+from us_visa.utils.main_utils import load_object
+
+
+class _BundlePickler(dill.Pickler):
+    """
+    Writes large plain numeric arrays to array_dir and pickles a reference to them instead
+    """
+
+    def __init__(self, file_obj, array_dir: str, min_array_bytes: int):
+        super().__init__(file_obj, protocol=dill.HIGHEST_PROTOCOL)
+        self.array_dir = array_dir
+        self.min_array_bytes = min_array_bytes
+        self.arrays = []
+        # same array object referenced twice is written once; kept alive so ids are not reused
+        self._saved = {}
+
+    def persistent_id(self, obj):
+        if (not isinstance(obj, np.ndarray) or obj.dtype.hasobject
+                or obj.nbytes < self.min_array_bytes):
+            return None
+        key = id(obj)
+        if key not in self._saved:
+            index = len(self.arrays)
+            file_name = f"{index:06d}.npy"
+            array = np.ascontiguousarray(obj)
+            np.save(os.path.join(self.array_dir, file_name), array, allow_pickle=False)
+            self.arrays.append({
+                "file": file_name,
+                "dtype": array.dtype.str if array.dtype.fields is None else str(array.dtype.descr),
+                "shape": list(array.shape),
+                "sha256": hashlib.sha256(array.data).hexdigest(),
+            })
+            self._saved[key] = (index, obj)
+        return ("npy", self._saved[key][0])
+
+
+class _BundleUnpickler(dill.Unpickler):
+
+    def __init__(self, file_obj, array_dir: str, arrays: list, mmap_mode: Optional[str]):
+        super().__init__(file_obj)
+        self.array_dir = array_dir
+        self.arrays = arrays
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid):
+        kind, index = pid
+        if kind != "npy":
+            raise dill.UnpicklingError(f"Unknown persistent id kind [{kind}]")
+        return np.load(os.path.join(self.array_dir, self.arrays[index]["file"]),
+                       mmap_mode=self.mmap_mode, allow_pickle=False)
+
+
+def is_model_bundle(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MODEL_BUNDLE_MANIFEST_FILE_NAME))
+
+
+def read_bundle_manifest(bundle_path: str) -> dict:
+    with open(os.path.join(bundle_path, MODEL_BUNDLE_MANIFEST_FILE_NAME)) as file_obj:
+        return json.load(file_obj)
+
+
+def save_model_bundle(bundle_path: str, obj: object, min_array_bytes: int = MODEL_BUNDLE_MIN_ARRAY_BYTES) -> dict:
+    """
+    Method Name :   save_model_bundle
+    Description :   This method writes obj as a model bundle directory, replacing any existing bundle at bundle_path
+
+    Output      :   Returns the bundle manifest
+    On Failure  :   Write an exception log and then raise an exception
+    """
+    logging.info("Entered the save_model_bundle method of utils")
+    try:
+        # built next to the target and renamed, so a reader never maps a half written bundle
+        tmp_path = f"{bundle_path.rstrip(os.sep)}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        array_dir = os.path.join(tmp_path, MODEL_BUNDLE_ARRAY_DIR)
+        os.makedirs(array_dir)
+
+        with open(os.path.join(tmp_path, MODEL_BUNDLE_OBJECT_FILE_NAME), "wb") as file_obj:
+            pickler = _BundlePickler(file_obj, array_dir, min_array_bytes)
+            pickler.dump(obj)
+
+        object_digest = hashlib.sha256()
+        with open(os.path.join(tmp_path, MODEL_BUNDLE_OBJECT_FILE_NAME), "rb") as file_obj:
+            object_digest.update(file_obj.read())
+
+        manifest = {
+            "format_version": MODEL_BUNDLE_FORMAT_VERSION,
+            "object_file": MODEL_BUNDLE_OBJECT_FILE_NAME,
+            "object_sha256": object_digest.hexdigest(),
+            "arrays": pickler.arrays,
+        }
+        with open(os.path.join(tmp_path, MODEL_BUNDLE_MANIFEST_FILE_NAME), "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+
+        shutil.rmtree(bundle_path, ignore_errors=True)
+        os.replace(tmp_path, bundle_path)
+        logging.info(f"Saved model bundle to [{bundle_path}] with {len(pickler.arrays)} mapped arrays")
+        return manifest
+
+    except Exception as e:
+        raise USvisaException(e, sys) from e
+
+
+def load_model_bundle(bundle_path: str, mmap_mode: Optional[str] = MODEL_BUNDLE_MMAP_MODE) -> object:
+    """
+    Method Name :   load_model_bundle
+    Description :   This method loads a model bundle, memory mapping its arrays with mmap_mode
+
+    Output      :   Returns the saved object
+    On Failure  :   Write an exception log and then raise an exception
+    """
+    logging.info("Entered the load_model_bundle method of utils")
+    try:
+        manifest = read_bundle_manifest(bundle_path)
+        if manifest["format_version"] != MODEL_BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model bundle format version [{manifest['format_version']}], "
+                             f"convert the model pickle again")
+
+        array_dir = os.path.join(bundle_path, MODEL_BUNDLE_ARRAY_DIR)
+        with open(os.path.join(bundle_path, manifest["object_file"]), "rb") as file_obj:
+            obj = _BundleUnpickler(file_obj, array_dir, manifest["arrays"], mmap_mode).load()
+
+        logging.info("Exited the load_model_bundle method of utils")
+        return obj
+
+    except Exception as e:
+        raise USvisaException(e, sys) from e
+
+
+def get_model_bundle_version(bundle_path: str) -> str:
+    """
+    Content version of a bundle from its manifest, which already holds the digest of every
+    array, so no array data is read
+    """
+    with open(os.path.join(bundle_path, MODEL_BUNDLE_MANIFEST_FILE_NAME), "rb") as file_obj:
+        return hashlib.sha256(file_obj.read()).hexdigest()[:12]
+
+
+def load_model_file(model_path: str) -> object:
+    """
+    Loads either a model bundle directory or a single pickle file
+    """
+    if is_model_bundle(model_path):
+        return load_model_bundle(model_path)
+    return load_object(model_path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Convert a pickled model file into a memory mapped model bundle")
+    parser.add_argument("model_path", help="Pickled model file, e.g. model.pkl")
+    parser.add_argument("bundle_path", help="Bundle directory to write, e.g. model.bundle")
+    parser.add_argument("--min-array-bytes", type=int, default=MODEL_BUNDLE_MIN_ARRAY_BYTES,
+                        help="Arrays smaller than this stay inside the object pickle")
+    args = parser.parse_args(argv)
+
+    manifest = save_model_bundle(args.bundle_path, load_object(args.model_path), args.min_array_bytes)
+    total_bytes = sum(os.path.getsize(os.path.join(args.bundle_path, MODEL_BUNDLE_ARRAY_DIR, array["file"]))
+                      for array in manifest["arrays"])
+    print(f"Wrote {args.bundle_path}: {len(manifest['arrays'])} arrays, {total_bytes / 1e6:.1f}MB mapped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())